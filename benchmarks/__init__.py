@@ -0,0 +1,7 @@
+"""
+Reproducible benchmarks of schema parsing, code generation, schema comparison and message encoding and decoding.
+
+Run from the repository root:
+
+    python -m benchmarks [--quick] [--filter NAME] [--output results.json]
+"""
@@ -0,0 +1,35 @@
+from .cases import all_cases
+from .harness import run
+import argparse
+import json
+import sys
+import tempfile
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Runs sbe2 benchmarks and reports results as JSON.')
+    parser.add_argument('--quick', action='store_true', help='use small inputs and short timings')
+    parser.add_argument('--filter', default=None, help='run only cases containing the given text')
+    parser.add_argument('--repeat', type=int, default=None, help='number of timed repetitions of every case')
+    parser.add_argument('--output', default='-', help="path of the JSON report, '-' for standard output")
+    args = parser.parse_args(argv)
+
+    repeat = args.repeat or (2 if args.quick else 5)
+    min_time = 0.01 if args.quick else 0.2
+    with tempfile.TemporaryDirectory(prefix='sbe2-bench-') as work_dir:
+        cases = all_cases(args.quick, work_dir)
+        if args.filter:
+            cases = [case for case in cases if args.filter in case.name]
+        report = run(cases, repeat, min_time, log=lambda line: print(line, file=sys.stderr))
+
+    text = json.dumps(report, indent=2)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w') as file:
+            file.write(text + '\n')
+    return 1 if any('error' in result and 'known_failure' not in result for result in report['results']) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
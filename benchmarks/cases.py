@@ -0,0 +1,230 @@
+from .harness import Case
+from .synthetic import synthetic_schema
+from sbe2.xmlparser import parse_schema, parse_schema_cached, SchemaSession
+from sbe2.pygen import generate
+from sbe2.schema import to_snapshot, from_snapshot
+from sbe2.pygen.render import render_schema
+from sbe2.backcheck.compare import compare
+from sbe2 import pyruntime
+from os import path
+
+EXAMPLE_DIR = path.join(path.dirname(path.dirname(path.abspath(__file__))), 'tests', 'test_xmlparser', 'example_schema')
+EXAMPLE_SCHEMAS = ('example-schema.xml', 'example-extension-schema.xml', 'complete.xml')
+
+CAR = {
+    'serialNumber': 1234,
+    'modelYear': 2013,
+    'available': 'T',
+    'code': 'A',
+    'someNumbers': [0, 1, 2, 3],
+    'vehicleCode': 'abcdef',
+    'extras': 6,
+    'engine': {
+        'capacity': 2000,
+        'numCylinders': 4,
+        'manufacturerCode': b'VTI',
+        'efficiency': 35,
+        'boosterEnabled': 'T',
+        'booster': {'BoostType': 'KERS', 'horsePower': 200},
+    },
+    'fuelFigures': [
+        {'speed': 30, 'mpg': 35.5, 'usageDescription': 'Urban Cycle'},
+        {'speed': 55, 'mpg': 49.0, 'usageDescription': 'Combined Cycle'},
+        {'speed': 75, 'mpg': 40.0, 'usageDescription': 'Highway Cycle'},
+    ],
+    'performanceFigures': [
+        {'octaneRating': 95, 'acceleration': [{'mph': 30, 'seconds': 4.0}, {'mph': 60, 'seconds': 7.5}, {'mph': 100, 'seconds': 12.2}]},
+        {'octaneRating': 99, 'acceleration': [{'mph': 30, 'seconds': 3.8}, {'mph': 60, 'seconds': 7.1}, {'mph': 100, 'seconds': 11.8}]},
+    ],
+    'manufacturer': 'Honda',
+    'model': 'Civic VTi',
+    'activationCode': 'abcdef',
+}
+
+# A fixed size message, which can be decoded in batches
+QUOTE_SCHEMA = """<sbe:messageSchema xmlns:sbe="http://fixprotocol.io/2016/sbe" package="quotes" id="2" version="0" byteOrder="littleEndian">
+    <types>
+        <composite name="messageHeader">
+            <type name="blockLength" primitiveType="uint16"/>
+            <type name="templateId" primitiveType="uint16"/>
+            <type name="schemaId" primitiveType="uint16"/>
+            <type name="version" primitiveType="uint16"/>
+        </composite>
+        <type name="Symbol" primitiveType="char" length="8"/>
+    </types>
+    <sbe:message name="Quote" id="1">
+        <field name="symbol" id="1" type="Symbol"/>
+        <field name="bid" id="2" type="int64"/>
+        <field name="ask" id="3" type="int64"/>
+        <field name="bidSize" id="4" type="uint32"/>
+        <field name="askSize" id="5" type="uint32"/>
+    </sbe:message>
+</sbe:messageSchema>
+"""
+
+
+def example_path(name: str) -> str:
+    return path.join(EXAMPLE_DIR, name)
+
+
+# Reason why `compare` cases fail, reported without failing the run
+COMPARE_FAILURE = "backcheck compare puts unhashable composites into a set"
+
+
+def schema_cases(quick: bool, work_dir: str) -> list[Case]:
+    """
+    Cases of parsing, code generation and comparison of example and synthetic schemas.
+    Files are written into `work_dir`, which has to exist until the cases are run.
+    """
+    num_types, num_messages = (200, 100) if quick else (2000, 1000)
+    synthetic = synthetic_schema(num_types, num_messages)
+    synthetic_v1 = synthetic_schema(num_types, num_messages, version=1)
+    synthetic_name = f'synthetic-{num_types}x{num_messages}'
+    synthetic_path = path.join(work_dir, f'{synthetic_name}.xml')
+    with open(synthetic_path, 'w') as file:
+        file.write(synthetic)
+
+    cases = []
+    schemas = {}
+    for name in EXAMPLE_SCHEMAS:
+        file_path = example_path(name)
+        schemas[name] = parse_schema(file_path)
+        cases.append(Case(f'parse_schema/{name}', lambda file_path=file_path: parse_schema(file_path)))
+    schemas[synthetic_name] = parse_schema(text=synthetic)
+    cases.append(Case(f'parse_schema/{synthetic_name}', lambda: parse_schema(text=synthetic), nbytes=len(synthetic)))
+    cases.append(Case(f'parse_schema/lazy/{synthetic_name}', lambda: parse_schema(text=synthetic, lazy=True), nbytes=len(synthetic)))
+    cases.append(Case(f'parse_schema/streaming/{synthetic_name}', lambda: parse_schema(synthetic_path, streaming=True), nbytes=len(synthetic)))
+    session = SchemaSession()
+    session.parse(text=synthetic)
+    cases.append(Case(f'parse_schema/session/{synthetic_name}', lambda: session.parse(text=synthetic), nbytes=len(synthetic)))
+    parse_schema_cached(synthetic_path, work_dir)
+    cases.append(Case(f'parse_schema_cached/{synthetic_name}', lambda: parse_schema_cached(synthetic_path, work_dir)))
+    snapshot = to_snapshot(schemas[synthetic_name])
+    cases.append(Case(f'from_snapshot/{synthetic_name}', lambda: from_snapshot(snapshot), nbytes=len(snapshot)))
+
+    for name, schema in schemas.items():
+        cases.append(Case(f'render_schema/{name}', lambda schema=schema: render_schema(schema)))
+    synthetic_schema_v0 = schemas[synthetic_name]
+    cases.append(Case(f'compile/{synthetic_name}', lambda: pyruntime.compile(synthetic_schema_v0), items=num_messages))
+
+    base = schemas['example-schema.xml']
+    extension = schemas['example-extension-schema.xml']
+    cases.append(Case(
+        'compare/example-schema.xml->example-extension-schema.xml',
+        lambda: compare(base, extension),
+        known_failure=COMPARE_FAILURE,
+    ))
+    synthetic_schema_v1 = parse_schema(text=synthetic_v1)
+    cases.append(Case(
+        f'compare/{synthetic_name}',
+        lambda: compare(synthetic_schema_v0, synthetic_schema_v1),
+        known_failure=COMPARE_FAILURE,
+    ))
+    return cases
+
+
+def codec_cases(quick: bool) -> list[Case]:
+    """
+    Cases of encoding and decoding messages using the runtime and the generated code.
+    """
+    schema = parse_schema(example_path('example-schema.xml'))
+    compiled = pyruntime.compile(schema)
+    buf = bytearray(1024)
+    size = compiled.encode_into('Car', CAR, buf)
+    car = bytes(buf[:size])
+    header_size = compiled.header.size
+
+    dispatcher = pyruntime.Dispatcher(compiled)
+    view = compiled.view('Car')
+    car_view = memoryview(car)
+
+    def read_view():
+        view.sbe_wrap(car_view, header_size)
+        return view.serialNumber, view.modelYear, view.engine
+
+    namespace = {}
+    exec(compile(generate(schema), '<generated>', 'exec'), namespace)
+    generated_car, _ = namespace['decode_message'](car)
+    decode_message = namespace['decode_message']
+    encode_message = namespace['encode_message']
+
+    count = 100 if quick else 10000
+    stream = car * count
+
+    cases = [
+        Case('decode/pyruntime/Car', lambda: compiled.decode(car), nbytes=size),
+        Case('encode/pyruntime/Car', lambda: compiled.encode_into('Car', CAR, buf), nbytes=size),
+        Case('view/pyruntime/Car', read_view, nbytes=size),
+        Case('dispatch/pyruntime/Car', lambda: dispatcher.dispatch(car), nbytes=size),
+        Case('decode/pygen/Car', lambda: decode_message(car), nbytes=size),
+        Case('encode/pygen/Car', lambda: encode_message(generated_car, buf), nbytes=size),
+        Case('frame/MessageReader/Car', lambda: sum(1 for _ in pyruntime.MessageReader(compiled, stream)), items=count, nbytes=len(stream)),
+    ]
+
+    # a single group of many fixed size entries
+    big_car = dict(CAR, performanceFigures=[
+        {'octaneRating': 95, 'acceleration': [{'mph': n % 200, 'seconds': n / 10} for n in range(count)]},
+    ])
+    big_buf = bytearray(size + count * 8)
+    big_size = compiled.encode_into('Car', big_car, big_buf)
+    big = memoryview(bytes(big_buf[:big_size]))
+    group_view = compiled.view('Car')
+
+    def acceleration():
+        return next(iter(group_view.sbe_wrap(big, header_size).performanceFigures)).acceleration
+
+    cases.append(Case(
+        'group/view/acceleration',
+        lambda: sum(entry.mph for entry in acceleration()),
+        items=count,
+        nbytes=big_size,
+    ))
+
+    try:
+        from sbe2.pyruntime.batch import decode_batch
+    except ImportError:
+        return cases  # numpy is not installed
+    quotes = parse_schema(text=QUOTE_SCHEMA)
+    quote_compiled = pyruntime.compile(quotes)
+    quote = bytearray(64)
+    quote_size = quote_compiled.encode_into('Quote', {'symbol': 'AAPL', 'bid': 100, 'ask': 101, 'bidSize': 5, 'askSize': 7}, quote)
+    quote_stream = bytes(quote[:quote_size]) * count
+    layout = quotes.layout['Quote']
+    cases.append(Case(
+        'decode_batch/numpy/Quote',
+        lambda: decode_batch(quote_stream, layout, quotes.byte_order, quotes.header_type),
+        items=count,
+        nbytes=len(quote_stream),
+    ))
+    cases.append(Case(
+        'decode_group_batch/numpy/acceleration',
+        lambda: int(acceleration().sbe_to_array()['mph'].sum()),
+        items=count,
+        nbytes=big_size,
+    ))
+
+    try:
+        from sbe2.pyruntime.frames import to_dataframes
+    except ImportError:
+        return cases  # pandas is not installed
+    cases.append(Case(
+        'to_dataframes/pandas/Quote',
+        lambda: to_dataframes(quote_stream, quote_compiled),
+        items=count,
+        nbytes=len(quote_stream),
+    ))
+    return cases
+
+
+def all_cases(quick: bool, work_dir: str) -> list[Case]:
+    """
+    Returns all benchmark cases.
+
+    Args:
+        quick (bool): Use smaller inputs, for smoke testing the benchmarks.
+        work_dir (str): Existing directory for files used by the cases, e.g. a `tempfile.TemporaryDirectory`.
+
+    Returns:
+        list[Case]: The cases.
+    """
+    return schema_cases(quick, work_dir) + codec_cases(quick)
@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+from typing import Any, Callable
+import datetime
+import gc
+import importlib.metadata
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+
+@dataclass
+class Case:
+    """
+    A single benchmarked operation.
+    """
+    name: str
+    func: Callable[[], Any]
+    items: int = 1  # Number of processed items (messages, schemas) per call
+    nbytes: int = 0  # Number of processed bytes per call, 0 if not applicable
+    known_failure: str | None = None  # Reason why the case is expected to fail, its error does not fail the run
+
+
+def calibrate(func: Callable[[], Any], min_time: float) -> int:
+    """
+    Returns the number of calls that take at least `min_time` seconds.
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return loops
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+
+def measure_allocations(func: Callable[[], Any]) -> tuple[int, int]:
+    """
+    Returns the peak size of memory allocated during a single call
+    and the number of memory blocks the call left allocated.
+    """
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    gc.collect()
+    return peak, sys.getallocatedblocks() - blocks
+
+
+def measure(case: Case, repeat: int, min_time: float) -> dict[str, Any]:
+    """
+    Measures timing and allocations of a case. Timing is measured without tracing allocations.
+
+    Args:
+        case (Case): The case to measure.
+        repeat (int): Number of timed repetitions.
+        min_time (float): Minimal duration of a single repetition in seconds.
+
+    Returns:
+        dict[str, Any]: Machine readable results, or the error if the case failed.
+    """
+    try:
+        func = case.func
+        loops = calibrate(func, min_time)
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(loops):
+                func()
+            times.append((time.perf_counter() - start) / loops)
+        peak, blocks = measure_allocations(func)
+    except Exception as e:
+        result = {'name': case.name, 'error': f'{type(e).__name__}: {e}'}
+        if case.known_failure is not None:
+            result['known_failure'] = case.known_failure
+        return result
+    best = min(times)
+    result = {
+        'name': case.name,
+        'loops': loops,
+        'repeat': repeat,
+        'best_s': best,
+        'median_s': statistics.median(times),
+        'items': case.items,
+        'items_per_s': case.items / best if best else None,
+        'peak_alloc_bytes': peak,
+        'retained_blocks': blocks,
+    }
+    if case.nbytes:
+        result['bytes_per_s'] = case.nbytes / best if best else None
+    return result
+
+
+def environment() -> dict[str, Any]:
+    """
+    Returns a description of the environment, stored with the results to make them comparable.
+    """
+    try:
+        version = importlib.metadata.version('sbe2')
+    except importlib.metadata.PackageNotFoundError:
+        version = None
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'sbe2': version,
+    }
+
+
+def run(cases: list[Case], repeat: int = 5, min_time: float = 0.2, log: Callable[[str], Any] | None = None) -> dict[str, Any]:
+    """
+    Runs all cases.
+
+    Args:
+        cases (list[Case]): The cases to run.
+        repeat (int): Number of timed repetitions of every case.
+        min_time (float): Minimal duration of a single repetition in seconds.
+        log (Callable[[str], Any] | None): Optional progress callback.
+
+    Returns:
+        dict[str, Any]: The report, ready to be serialized to JSON.
+    """
+    results = []
+    for case in cases:
+        result = measure(case, repeat, min_time)
+        if log is not None:
+            if 'known_failure' in result:
+                log(f"{case.name}: {result['error']} (known failure: {result['known_failure']})")
+            elif 'error' in result:
+                log(f"{case.name}: {result['error']}")
+            else:
+                log(f"{case.name}: {result['best_s'] * 1e6:.1f} us, {result['items_per_s']:.0f} items/s")
+        results.append(result)
+    return {'format': 1, 'environment': environment(), 'results': results}
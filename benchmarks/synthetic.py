@@ -0,0 +1,85 @@
+from xml.sax.saxutils import quoteattr
+
+COMMON_TYPES = """
+        <composite name="messageHeader">
+            <type name="blockLength" primitiveType="uint16"/>
+            <type name="templateId" primitiveType="uint16"/>
+            <type name="schemaId" primitiveType="uint16"/>
+            <type name="version" primitiveType="uint16"/>
+        </composite>
+        <composite name="groupSizeEncoding">
+            <type name="blockLength" primitiveType="uint16"/>
+            <type name="numInGroup" primitiveType="uint16"/>
+        </composite>
+        <composite name="varStringEncoding">
+            <type name="length" primitiveType="uint32" maxValue="1073741824"/>
+            <type name="varData" primitiveType="uint8" length="0" characterEncoding="UTF-8"/>
+        </composite>"""
+
+
+def synthetic_type(i: int) -> str:
+    """
+    Returns XML of the i-th synthetic type. Types cycle through all kinds of types.
+    """
+    match i % 4:
+        case 0:
+            return f'<type name="Type{i}" primitiveType="uint32" minValue="0" maxValue="1000000"/>'
+        case 1:
+            values = ''.join(f'<validValue name="V{v}">{v}</validValue>' for v in range(4))
+            return f'<enum name="Type{i}" encodingType="uint8">{values}</enum>'
+        case 2:
+            choices = ''.join(f'<choice name="C{c}">{c}</choice>' for c in range(4))
+            return f'<set name="Type{i}" encodingType="uint16">{choices}</set>'
+        case _:
+            return (
+                f'<composite name="Type{i}">'
+                '<type name="mantissa" primitiveType="int64"/>'
+                '<type name="exponent" primitiveType="int8"/>'
+                '<type name="code" primitiveType="char" length="4"/>'
+                '</composite>'
+            )
+
+
+def synthetic_message(i: int, num_types: int) -> str:
+    """
+    Returns XML of the i-th synthetic message, with fields of several types, a group and variable length data.
+    """
+    fields = ''.join(
+        f'<field name="field{f}" id="{f + 1}" type="Type{(i + f) % num_types}"/>'
+        for f in range(8)
+    )
+    return (
+        f'<sbe:message name="Message{i}" id="{i + 1}" description={quoteattr(f"Synthetic message {i}")}>'
+        f'{fields}'
+        '<group name="entries" id="100" dimensionType="groupSizeEncoding">'
+        '<field name="price" id="101" type="int64"/>'
+        '<field name="size" id="102" type="uint32"/>'
+        '</group>'
+        '<data name="text" id="200" type="varStringEncoding"/>'
+        '</sbe:message>'
+    )
+
+
+def synthetic_schema(num_types: int, num_messages: int, version: int = 0) -> str:
+    """
+    Generates a large schema, used to measure scaling of schema processing.
+
+    Args:
+        num_types (int): Number of user defined types.
+        num_messages (int): Number of messages.
+        version (int): Version of the schema.
+
+    Returns:
+        str: XML of the schema.
+    """
+    types = '\n        '.join(synthetic_type(i) for i in range(num_types))
+    messages = '\n    '.join(synthetic_message(i, num_types) for i in range(num_messages))
+    # no XML declaration, so the schema can be parsed from a string
+    return f"""<sbe:messageSchema xmlns:sbe="http://fixprotocol.io/2016/sbe" package="synthetic" id="1"
+                   version="{version}" semanticVersion="1.{version}" byteOrder="littleEndian">
+    <types>{COMMON_TYPES}
+        {types}
+    </types>
+    {messages}
+</sbe:messageSchema>
+"""
@@ -1,7 +1,7 @@
 from ..schema import MessageSchema
-from .render import render_enum
+from .render import render_schema
 
-def generate(schema: MessageSchema):
+def generate(schema: MessageSchema) -> str:
     """
     Generate Python code from the provided schema.
     
@@ -11,3 +11,4 @@ def generate(schema: MessageSchema):
     Returns:
         str: The generated Python code as a string.
     """
+    return render_schema(schema)
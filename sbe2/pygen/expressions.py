@@ -0,0 +1,124 @@
+from ..schema import FixedLengthElement, Type, Enum, Set, Composite, Ref, Presence
+from ..pyruntime.formats import element_format, STRUCT_CODES
+
+
+def literal(value) -> str:
+    """
+    Returns a Python literal of the value.
+    Infinite and NaN floats do not have literals, so they are rendered as `float(...)` calls.
+
+    Args:
+        value: The value to render.
+
+    Returns:
+        str: Python expression evaluating to the value.
+    """
+    if isinstance(value, float) and (value != value or value in (float('inf'), float('-inf'))):
+        return f"float({str(value)!r})"
+    return repr(value)
+
+
+def class_name(*parts: str) -> str:
+    """
+    Joins names of nested elements into a single class name, e.g. 'Car', 'fuelFigures' -> 'CarFuelFigures'.
+
+    Args:
+        parts (str): Names of nested elements, starting from the outermost one.
+
+    Returns:
+        str: The class name.
+    """
+    return parts[0] + ''.join(part[:1].upper() + part[1:] for part in parts[1:])
+
+
+def is_text(type_: Type) -> bool:
+    """
+    Returns True if the type is encoded as bytes but decoded into a string.
+    """
+    return STRUCT_CODES[type_.primitive_type.name] == 's' and type_.length == 1 or bool(type_.character_encoding)
+
+
+def decode_expr(element: FixedLengthElement, index: int) -> str:
+    """
+    Returns an expression decoding the element from the tuple `v` of unpacked values.
+
+    Args:
+        element (FixedLengthElement): The element to decode.
+        index (int): Index of the first unpacked value of the element.
+
+    Returns:
+        str: The Python expression.
+    """
+    if isinstance(element, Ref):
+        return decode_expr(element.type_, index)
+    if isinstance(element, Type):
+        if element.presence is Presence.CONSTANT:
+            return literal(element.const_val)
+        if element.length == 0:
+            return 'None'
+        value = f"v[{index}]"
+        pt = element.primitive_type
+        if STRUCT_CODES[pt.name] == 's' or (pt.is_byte and element.length > 1):
+            if is_text(element):
+                return f"{value}.rstrip(b'\\x00').decode({(element.character_encoding or 'ascii')!r})"
+            return value
+        if element.length > 1:
+            return f"list(v[{index}:{index + element.length}])"
+        if element.presence is Presence.OPTIONAL:
+            null = element.effective_null_value
+            if null != null:  # NaN
+                return f"None if {value} != {value} else {value}"
+            return f"None if {value} == {literal(null)} else {value}"
+        return value
+    if isinstance(element, Enum):
+        # unknown values of newer schema versions are returned as they are
+        return f"_enum({element.name}, v[{index}])"
+    if isinstance(element, Set):
+        # unknown choices of newer schema versions are dropped
+        mask = sum(2**choice.value for choice in element.choices)
+        return f"{element.name}(v[{index}] & {mask})"
+    if isinstance(element, Composite):
+        args = []
+        for child in element.elements:
+            args.append(f"{child.name}={decode_expr(child, index)}")
+            index += element_format(child).count
+        return f"{element.name}({', '.join(args)})"
+    raise TypeError(f"Unsupported element type: {type(element)}")  # pragma: no cover
+
+
+def encode_exprs(element: FixedLengthElement, expr: str) -> list[str]:
+    """
+    Returns expressions of values to pack for the given element.
+
+    Args:
+        element (FixedLengthElement): The element to encode.
+        expr (str): Expression evaluating to the Python value of the element.
+
+    Returns:
+        list[str]: Arguments of the `pack_into` call.
+    """
+    if isinstance(element, Ref):
+        return encode_exprs(element.type_, expr)
+    if isinstance(element, Type):
+        if element.presence is Presence.CONSTANT or element.length == 0:
+            return []
+        pt = element.primitive_type
+        if STRUCT_CODES[pt.name] == 's' or (pt.is_byte and element.length > 1):
+            if is_text(element):
+                return [f"{expr}.encode({(element.character_encoding or 'ascii')!r})"]
+            return [expr]
+        if element.length > 1:
+            return [f"*{expr}"]
+        if element.presence is Presence.OPTIONAL:
+            return [f"({literal(element.effective_null_value)} if {expr} is None else {expr})"]
+        return [expr]
+    if isinstance(element, Enum):
+        return [f"getattr({expr}, 'value', {expr})"]
+    if isinstance(element, Set):
+        return [f"{expr}.value"]
+    if isinstance(element, Composite):
+        result = []
+        for child in element.elements:
+            result.extend(encode_exprs(child, f"{expr}.{child.name}"))
+        return result
+    raise TypeError(f"Unsupported element type: {type(element)}")  # pragma: no cover
@@ -1,8 +1,21 @@
 from .templates import enum as enum_template, set_ as set_template, composite as composite_template, header as header_template
+from .templates import message as message_template, dispatch as dispatch_template
+from .expressions import literal, class_name, decode_expr, encode_exprs
 from ..schema import Enum, Set, Type, Composite, FixedLengthElement, TypeKind, Ref, Types, ByteOrder, MessageSchema, Messages, Message, Field, Group, Data
+from ..schema import Presence, FieldLayout, GroupLayout, MessageLayout
+from ..pyruntime.formats import byte_order_prefix, block_fmt, block_formats, composite_format, composite_indexes
+from ..pyruntime.encoder import HeaderEncoder
 from dataclasses import dataclass
 import datetime
 
+# Names defined by the header and the dispatch functions of the generated module
+MODULE_NAMES = frozenset({
+    'dataclass', 'Any', 'ClassVar', 'enum', 'struct', 'SBE_VERSION', 'SBE_SEMANTIC_VERSION', 'SBE_BYTE_ORDER',
+    'SBE_SCHEMA_FILE', 'DecodingError', '_enum', 'MESSAGE_HEADER', 'MESSAGES', 'decode_message', 'encode_message',
+})
+# Members generated in classes of messages and group entries
+BLOCK_MEMBERS = frozenset({'decode', 'encode_into', 'decode_group', 'encode_group', 'TEMPLATE_ID', 'HEADER', 'BLOCK_LENGTH'})
+
 def render_enum(e: Enum) -> str:
     """
     Render an Enum to a string using the enum template.
@@ -87,9 +100,56 @@ def render_composite(c: Composite) -> str:
     return composite_template.render(name=c.name, elements=elements, description=repr(c.description) if c.description else None)
 
 
+def nested_types(element: FixedLengthElement) -> list[FixedLengthElement]:
+    """
+    Get enums, sets and composites defined inline in a composite, including the composite itself.
+    Nested types are returned before the types containing them.
+
+    Args:
+        element (FixedLengthElement): The element to get nested types of.
+
+    Returns:
+        list[FixedLengthElement]: The nested types.
+    """
+    if isinstance(element, Composite):
+        result = []
+        for child in element.elements:
+            result.extend(nested_types(child))
+        result.append(element)
+        return result
+    if isinstance(element, (Enum, Set)):
+        return [element]
+    return []
+
+
+def type_classes(types: Types) -> dict[str, FixedLengthElement]:
+    """
+    Get enums, sets and composites rendered as classes, including those defined inline in composites.
+    Nested types are returned before the types containing them.
+
+    Args:
+        types (Types): The types of the schema.
+
+    Returns:
+        dict[str, FixedLengthElement]: The types by their class names.
+    """
+    result: dict[str, FixedLengthElement] = {}
+    for type_ in types:
+        if isinstance(type_, Type):
+            continue  # Types are not rendered directly, they are used in composites or other structures
+        if not isinstance(type_, (Enum, Set, Composite)):
+            raise ValueError(f"Unsupported type kind: {type(type_)}")
+        for nested in nested_types(type_):
+            defined = result.setdefault(nested.name, nested)
+            if defined is not nested:
+                raise ValueError(f"Type '{nested.name}' is defined more than once")
+    return result
+
+
 def render_types(types: Types) -> str:
     """
     Render a collection of types to a string.
+    Enums, sets and composites defined inline in composites are rendered as well.
     
     Args:
         types (Types): The Types object to render.
@@ -98,19 +158,13 @@ def render_types(types: Types) -> str:
         str: The rendered types as a string.
     """
     rendered_types = []
-    for type_ in types:
+    for type_ in type_classes(types).values():
         if isinstance(type_, Enum):
             rendered_types.append(render_enum(type_))
-            continue
         elif isinstance(type_, Set):
             rendered_types.append(render_set(type_))
-            continue
-        elif isinstance(type_, Composite):
+        else:
             rendered_types.append(render_composite(type_))
-            continue
-        elif isinstance(type_, Type):
-            continue  # Types are not rendered directly, they are used in composites or other structures
-        raise ValueError(f"Unsupported type kind: {type(type_)}")
     
     return '\n\n'.join(rendered_types)
 
@@ -131,37 +185,313 @@ def render_header(description: str, version:int, semantic_version: str, byte_ord
     return header_template.render(description=description, version=version, semantic_version=semantic_version, byte_order=bo, timestamp=ts, schema_file=schema_file)
 
 
-def render_message(message: MessageSchema) -> str:
+@dataclass
+class StructConstant:
+    name: str
+    fmt: str
+
+
+@dataclass
+class ClassVariable:
+    name: str
+    type_name: str
+    value: str
+
+
+@dataclass
+class ClassField:
+    name: str
+    type_name: str
+
+
+def field_constant(field: Field) -> str:
+    """
+    Get the expression of a constant value of a field.
+
+    Args:
+        field (Field): The constant field.
+
+    Returns:
+        str: The Python expression.
+    """
+    if field.presence is Presence.CONSTANT:
+        value = literal(field.constant_value)
+        if isinstance(field.type, Enum):
+            return f"{field.type.name}({value})"
+        return value
+    return decode_expr(field.type, 0)
+
+
+def data_lines(data: Data, struct_name: str, byte_order: ByteOrder, var: str) -> tuple[StructConstant, list[str], list[str], str]:
     """
-    Render a single message to a string.
+    Get the code decoding and encoding variable length data.
+
+    Args:
+        data (Data): The data to render.
+        struct_name (str): Name of the module level `struct.Struct` of the data length.
+        byte_order (ByteOrder): The byte order of the schema.
+        var (str): Name of the local variable holding the decoded data.
+
+    Returns:
+        tuple[StructConstant, list[str], list[str], str]: The struct constant, decoding lines, encoding lines and the type name.
+    """
+    composite = data.type_
+    fmt = composite_format(composite)
+    indexes = composite_indexes(composite)
+    if 'length' not in indexes:
+        raise ValueError(f"Data type '{composite.name}' does not contain 'length' element")
+    var_data = next((e for e in composite.elements if e.name == 'varData'), None)
+    encoding = getattr(var_data, 'character_encoding', None)
+    args = ['0'] * fmt.count
+    args[indexes['length']] = f'len({var})'
+    decode = [
+        f"n = {struct_name}.unpack_from(buf, pos)[{indexes['length']}]",
+        f"pos += {fmt.size}",
+        "if pos + n > len(buf):",
+        f"    raise DecodingError(f\"Data '{data.name}' of length {{n}} exceeds the buffer\")",
+        f"{var} = bytes(buf[pos:pos + n]){f'.decode({encoding!r})' if encoding else ''}",
+        "pos += n",
+    ]
+    encode = [
+        f"{var} = self.{data.name}{f'.encode({encoding!r})' if encoding else ''}",
+        f"{struct_name}.pack_into(buf, pos, {', '.join(args)})",
+        f"pos += {fmt.size}",
+        f"buf[pos:pos + len({var})] = {var}",
+        f"pos += len({var})",
+    ]
+    constant = StructConstant(name=struct_name, fmt=byte_order_prefix(byte_order) + fmt.fmt)
+    return constant, decode, encode, 'str' if encoding else 'bytes'
+
+
+def render_block_class(
+    name: str,
+    description: str,
+    fields: tuple[FieldLayout, ...],
+    block_length: int,
+    groups: tuple[GroupLayout, ...],
+    datas: list[Data],
+    byte_order: ByteOrder,
+    class_vars: list[ClassVariable],
+    group: Group | None = None,
+) -> str:
+    """
+    Render a class of a message or a group entry.
+    The fixed size block is decoded and encoded with a single `struct` call, with field conversions inlined.
+
+    Args:
+        name (str): Name of the class.
+        description (str): Description of the message or group.
+        fields (tuple[FieldLayout, ...]): Layouts of fields of the block.
+        block_length (int): Length of the block.
+        groups (tuple[GroupLayout, ...]): Layouts of the nested groups.
+        datas (list[Data]): Variable length data.
+        byte_order (ByteOrder): The byte order of the schema.
+        class_vars (list[ClassVariable]): Additional class variables.
+        group (Group | None): The group, if rendering a group entry.
+
+    Returns:
+        str: The rendered classes of nested groups followed by the class.
+    """
+    members = [field_layout.name for field_layout in fields] + [group.name for group in groups] + [data.name for data in datas]
+    for member in members:
+        if member in BLOCK_MEMBERS:
+            raise ValueError(f"Element '{member}' of '{name}' clashes with a generated member, names {', '.join(sorted(BLOCK_MEMBERS))} are reserved")
+    prefix = byte_order_prefix(byte_order)
+    formats = block_formats(fields)
+    block_struct = f"_{name}_BLOCK"
+    structs = [StructConstant(name=block_struct, fmt=prefix + block_fmt(formats, block_length))]
+    class_vars = class_vars + [ClassVariable(name='BLOCK_LENGTH', type_name='int', value=str(block_length))]
+    class_fields = []
+    decode_args = []
+    encode_args = ['buf', 'offset']
+    decode_lines = []
+    encode_lines = []
+    index = 0
+    for field_layout, element_fmt in formats:
+        field = field_layout.field
+        type_name = base_type_name(field.type)
+        if not element_fmt.count:
+            class_vars.append(ClassVariable(name=field.name, type_name=type_name, value=field_constant(field)))
+            continue
+        if field.presence is Presence.OPTIONAL or getattr(field.type, 'presence', None) is Presence.OPTIONAL:
+            type_name = f'{type_name} | None'
+        class_fields.append(ClassField(name=field.name, type_name=type_name))
+        decode_args.append(decode_expr(field.type, index))
+        encode_args.extend(encode_exprs(field.type, f"self.{field.name}"))
+        index += element_fmt.count
+
+    nested = []
+    for i, group_layout in enumerate(groups):
+        group_class = class_name(name, group_layout.name)
+        nested.append(render_group(group_layout, group_class, byte_order))
+        var = f"g{i}"
+        class_fields.append(ClassField(name=group_layout.name, type_name=f"list[{group_class}]"))
+        decode_lines.append(f"{var}, pos = {group_class}.decode_group(buf, pos)")
+        decode_args.append(var)
+        encode_lines.append(f"pos += {group_class}.encode_group(buf, pos, self.{group_layout.name})")
+
+    for i, data in enumerate(datas):
+        var = f"d{i}"
+        constant, decode, encode, type_name = data_lines(data, f"_{name}_{data.name.upper()}_LENGTH", byte_order, var)
+        structs.append(constant)
+        class_fields.append(ClassField(name=data.name, type_name=type_name))
+        decode_lines.extend(decode)
+        decode_args.append(var)
+        encode_lines.extend(encode)
+
+    params = dict(
+        name=name,
+        description=repr(description) if description else None,
+        structs=structs,
+        class_vars=class_vars,
+        fields=class_fields,
+        block_length=block_length,
+        block_struct=block_struct,
+        decode_lines=decode_lines,
+        decode_args=decode_args,
+        encode_args=encode_args,
+        encode_lines=encode_lines,
+    )
+    if group is not None:
+        dimension = group.dimension_type
+        dimension_fmt = composite_format(dimension)
+        indexes = composite_indexes(dimension)
+        for element in ('blockLength', 'numInGroup'):
+            if element not in indexes:
+                raise ValueError(f"Dimension type '{dimension.name}' does not contain '{element}' element")
+        dimension_args = ['buf', 'offset'] + ['0'] * dimension_fmt.count
+        dimension_args[2 + indexes['blockLength']] = str(block_length)
+        dimension_args[2 + indexes['numInGroup']] = 'len(entries)'
+        dimension_struct = f"_{name}_DIMENSION"
+        structs.append(StructConstant(name=dimension_struct, fmt=prefix + dimension_fmt.fmt))
+        params.update(
+            dimension_struct=dimension_struct,
+            dimension_size=dimension_fmt.size,
+            dimension_args=dimension_args,
+            block_length_index=indexes['blockLength'],
+            num_in_group_index=indexes['numInGroup'],
+        )
+    nested.append(message_template.render(**params))
+    return '\n\n'.join(nested)
+
+
+def render_group(layout: GroupLayout, name: str, byte_order: ByteOrder) -> str:
+    """
+    Render classes of a repeating group entry and its nested groups.
+
+    Args:
+        layout (GroupLayout): The layout of the group.
+        name (str): Name of the class.
+        byte_order (ByteOrder): The byte order of the schema.
+
+    Returns:
+        str: The rendered classes as a string.
+    """
+    group = layout.group
+    return render_block_class(name, group.description, layout.fields, layout.block_length, layout.groups, group.datas, byte_order, [], group)
+
+
+def render_message(layout: MessageLayout, schema: MessageSchema) -> str:
+    """
+    Render classes of a single message and its groups.
     
     Args:
-        message (MessageSchema): The MessageSchema object to render.
+        layout (MessageLayout): The layout of the message.
+        schema (MessageSchema): The schema of the message.
         
     Returns:
         str: The rendered message as a string.
     """
-    
-    return f"# TODO: message {message.name} with ID {message.id} not implemented yet\n" 
+    message = layout.message
+    class_vars = [
+        ClassVariable(name='TEMPLATE_ID', type_name='int', value=str(message.id)),
+    ]
+    if schema.header_type is not None:
+        header = HeaderEncoder(schema.header_type, schema.byte_order)
+        values = header.values(
+            blockLength=layout.block_length,
+            templateId=message.id,
+            schemaId=schema.id,
+            version=schema.version,
+            numGroups=len(message.groups),
+            numVarDataFields=len(message.datas),
+        )
+        class_vars.append(ClassVariable(name='HEADER', type_name='tuple', value=literal(values)))
+    return render_block_class(message.name, message.description, layout.fields, layout.block_length, layout.groups, message.datas, schema.byte_order, class_vars)
 
 
-
-def render_messages(messages: Messages) -> str:
+def render_messages(schema: MessageSchema) -> str:
     """
-    Render a collection of messages to a string.
+    Render all messages of the schema to a string.
+    If the schema defines the message header, functions dispatching messages by their template ID are rendered as well.
     
     Args:
-        messages (Messages): The Messages object to render.
+        schema (MessageSchema): The schema to render messages of.
         
     Returns:
         str: The rendered messages as a string.
     """
     rendered_messages = []
-    for message in messages:
-        rendered_messages.append(render_message(message))
+    for layout in schema.layout:
+        rendered_messages.append(render_message(layout, schema))
+    if schema.header_type is not None:
+        header_fmt = composite_format(schema.header_type)
+        indexes = composite_indexes(schema.header_type)
+        rendered_messages.append(dispatch_template.render(
+            header_fmt=byte_order_prefix(schema.byte_order) + header_fmt.fmt,
+            header_size=header_fmt.size,
+            messages=schema.messages,
+            template_id_index=indexes['templateId'],
+            block_length_index=indexes['blockLength'],
+        ))
     
     return '\n\n'.join(rendered_messages)
 
+
+def group_class_names(name: str, groups: tuple[GroupLayout, ...]) -> list[str]:
+    """
+    Get class names of entries of the groups and their nested groups.
+
+    Args:
+        name (str): Class name of the message or group entry containing the groups.
+        groups (tuple[GroupLayout, ...]): Layouts of the groups.
+
+    Returns:
+        list[str]: The class names.
+    """
+    result = []
+    for group_layout in groups:
+        group_class = class_name(name, group_layout.name)
+        result.append(group_class)
+        result.extend(group_class_names(group_class, group_layout.groups))
+    return result
+
+
+def check_class_names(schema: MessageSchema):
+    """
+    Check that classes of types, messages and group entries do not shadow each other or names of the generated module.
+
+    Args:
+        schema (MessageSchema): The schema to check.
+
+    Raises:
+        ValueError: If two classes, or a class and a module level name, share a name.
+    """
+    defined = {name: 'a name of the generated module' for name in MODULE_NAMES}
+
+    def define(name: str, kind: str):
+        if name in defined:
+            raise ValueError(f"Class of {kind} '{name}' clashes with {defined[name]}")
+        defined[name] = f"{kind} '{name}'"
+
+    for name in type_classes(schema.types):
+        define(name, 'type')
+    for layout in schema.layout:
+        define(layout.message.name, 'message')
+        for group_class in group_class_names(layout.message.name, layout.groups):
+            define(group_class, 'group')
+
+
 def render_schema(schema: MessageSchema) -> str:
     """
     Render the entire schema to a string.
@@ -173,8 +503,9 @@ def render_schema(schema: MessageSchema) -> str:
         str: The rendered schema as a string.
     """
     # TODO: add schema file handling
+    check_class_names(schema)
     header = render_header(schema.description, schema.version, schema.semantic_version, schema.byte_order, datetime.datetime.now(), schema_file=None)
     types = render_types(schema.types)
-    messages = render_messages(schema.messages)
+    messages = render_messages(schema)
     
-    return f"{header}\n\n{types}\n\n{messages}"
\ No newline at end of file
+    return f"{header}\n\n\n{types.rstrip()}\n\n\n{messages}"
@@ -8,4 +8,6 @@ env.filters['repr'] = repr
 enum = env.get_template('enum.py.j2')
 set_ = env.get_template('set.py.j2')
 composite = env.get_template('composite.py.j2')
-header = env.get_template('header.py.j2')
\ No newline at end of file
+header = env.get_template('header.py.j2')
+message = env.get_template('message.py.j2')
+dispatch = env.get_template('dispatch.py.j2')
\ No newline at end of file
@@ -0,0 +1,9 @@
+from .errors import DecodingError, EncodingError
+from .decoder import MessageHeader, HeaderDecoder, BlockDecoder, DataDecoder, DimensionDecoder, GroupDecoder, MessageDecoder
+from .encoder import HeaderEncoder, BlockEncoder, DataEncoder, DimensionEncoder, GroupEncoder, MessageEncoder
+from .view import BlockView, MessageView, GroupEntryView, GroupView, view_class, group_view_class
+from .compiler import compile, CompiledSchema
+from .stream import MessageReader, find_frame
+from .capture import CaptureFile, CaptureIndex
+from .dispatch import Dispatcher
+from .parallel import decode_file_parallel
@@ -0,0 +1,261 @@
+from ..schema import MessageSchema
+from .compiler import CompiledSchema, compile
+from .errors import DecodingError
+from .stream import find_frame
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable
+import asyncio
+import inspect
+
+# Receives every delivered message, may be a coroutine function
+Callback = Callable[[Any], Awaitable[Any] | Any]
+
+
+class MessageQueue:
+    """
+    Queue of batches of messages, consumed by an async iterator or an async callback.
+    Messages framed by a single `data_received` or `datagram_received` call are delivered as a single batch.
+
+    Messages are delivered as `(Message, dict)` pairs if `decode` is set, as flyweight `MessageView`s
+    if `views` is set, and as `(template_id, memoryview)` pairs including the message header otherwise.
+    Views and memoryviews of a batch share a single immutable copy of the received data.
+
+    The queue has a single consumer: either the callback, or one iterator at a time.
+    If the callback raises, the transport is closed and the exception is raised by `join`.
+    """
+
+    def __init__(self, schema: MessageSchema | CompiledSchema, decode: bool = True, callback: Callback | None = None, views: bool = False):
+        self.compiled = schema if isinstance(schema, CompiledSchema) else compile(schema)
+        self.decode = decode and not views
+        self.views = views
+        self.callback = callback
+        self.transport: asyncio.BaseTransport | None = None
+        self.queued = 0  # Number of messages waiting in the queue
+        self._batches: deque[list] = deque()
+        self._waiter: asyncio.Future | None = None
+        self._closed = False
+        self._error: Exception | None = None
+        self._consumer: asyncio.Task | None = None
+
+    def _message(self, buf, start: int, end: int, template_id: int):
+        """
+        Returns the delivered form of a framed message. The buffer must not change unless decoding.
+        """
+        if self.decode:
+            return self.compiled.decode(buf, start)
+        if self.views:
+            header = self.compiled.header
+            return self.compiled.view(template_id).sbe_wrap(buf, start + header.size, header.decode(buf, start).block_length)
+        return template_id, buf[start:end]
+
+    def _put(self, batch: list):
+        if not batch:
+            return
+        self._batches.append(batch)
+        self.queued += len(batch)
+        self._wake()
+
+    def _close(self, error: Exception | None = None):
+        self._closed = True
+        self._error = error
+        self._wake()
+
+    def _wake(self):
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def _consumed(self):
+        """
+        Called after a batch is taken from the queue.
+        """
+
+    def _start_consumer(self):
+        if self.callback is not None and self._consumer is None:
+            self._consumer = asyncio.get_running_loop().create_task(self._consume())
+
+    async def _consume(self):
+        callback = self.callback
+        try:
+            async for message in self:
+                result = callback(message)
+                if inspect.isawaitable(result):
+                    await result
+        except Exception:
+            # stop receiving messages nobody consumes
+            if self.transport is not None:
+                self.transport.close()
+            raise
+
+    async def join(self):
+        """
+        Waits until the callback consumes all messages and the connection is closed.
+        Raises the exception raised by the callback, if any.
+        """
+        if self._consumer is not None:
+            await self._consumer
+
+    async def batches(self) -> AsyncIterator[list]:
+        """
+        Returns an async iterator over batches of messages. Ends when the connection is closed.
+        Raises DecodingError if the connection ends with a truncated message, the error raised while
+        decoding a message which closed the connection, and RuntimeError if another consumer is already waiting for messages.
+        """
+        while True:
+            if self._batches:
+                batch = self._batches.popleft()
+                self.queued -= len(batch)
+                self._consumed()
+                yield batch
+                continue
+            if self._closed:
+                if self._error is not None:
+                    raise self._error
+                return
+            if self._waiter is not None:
+                raise RuntimeError("Messages are already awaited by another consumer")
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        """
+        Returns an async iterator over single messages.
+        """
+        async for batch in self.batches():
+            for message in batch:
+                yield message
+
+
+class MessageProtocol(MessageQueue, asyncio.Protocol):
+    """
+    Stream protocol (e.g. TCP) framing incoming data into messages using the message header.
+
+    Reading from the transport is paused when more than `high_water` messages wait in the queue,
+    and resumed when the consumer drains the queue to `low_water` messages.
+    """
+
+    def __init__(
+        self,
+        schema: MessageSchema | CompiledSchema,
+        decode: bool = True,
+        callback: Callback | None = None,
+        high_water: int = 10000,
+        low_water: int | None = None,
+        views: bool = False,
+    ):
+        super().__init__(schema, decode, callback, views)
+        self.high_water = high_water
+        self.low_water = high_water // 4 if low_water is None else low_water
+        self.transport: asyncio.Transport | None = None
+        self._buffer = bytearray()
+        self._paused = False
+
+    def connection_made(self, transport: asyncio.Transport):
+        self.transport = transport
+        self._start_consumer()
+
+    def data_received(self, data: bytes):
+        buf = self._buffer
+        buf += data
+        compiled = self.compiled
+        frames = []
+        start = 0
+        error = None
+        try:
+            while True:
+                frame = find_frame(compiled, buf, start)
+                if frame is None:
+                    break
+                template_id, end = frame
+                frames.append((template_id, start, end))
+                start = end
+        except DecodingError as e:
+            error = e
+        # undecoded messages refer to a copy, as the buffer is reused
+        source = buf if self.decode else memoryview(bytes(buf[:start]))
+        batch = []
+        try:
+            for template_id, begin, end in frames:
+                batch.append(self._message(source, begin, end, template_id))
+        except Exception as e:
+            # messages preceding the one which cannot be decoded are still delivered
+            error = e
+        self._put(batch)
+        if error is not None:
+            self._close(error)
+            self.transport.close()
+            return
+        del buf[:start]
+        if not self._paused and self.queued > self.high_water:
+            self._paused = True
+            self.transport.pause_reading()
+
+    def _consumed(self):
+        if self._paused and self.queued <= self.low_water:
+            self._paused = False
+            self.transport.resume_reading()
+
+    def eof_received(self) -> bool:
+        return False  # close the transport
+
+    def connection_lost(self, exc: Exception | None):
+        if exc is None and self._buffer:
+            exc = DecodingError(f"Connection closed with a truncated message of {len(self._buffer)} bytes")
+        if self._error is not None:
+            exc = self._error
+        self._close(exc)
+
+
+class DatagramMessageProtocol(MessageQueue, asyncio.DatagramProtocol):
+    """
+    Datagram protocol (e.g. UDP) framing every datagram into one or more messages.
+
+    Delivered messages are `(message, addr)` pairs. Datagrams which cannot be framed or decoded are dropped,
+    and so are datagrams received while more than `max_queued` messages wait in the queue,
+    because reading from a datagram transport cannot be paused.
+    """
+
+    def __init__(
+        self,
+        schema: MessageSchema | CompiledSchema,
+        decode: bool = True,
+        callback: Callback | None = None,
+        max_queued: int = 10000,
+        views: bool = False,
+    ):
+        super().__init__(schema, decode, callback, views)
+        self.max_queued = max_queued
+        self.transport: asyncio.DatagramTransport | None = None
+        self.dropped = 0  # Number of dropped datagrams
+
+    def connection_made(self, transport: asyncio.DatagramTransport):
+        self.transport = transport
+        self._start_consumer()
+
+    def datagram_received(self, data: bytes, addr):
+        if self.queued >= self.max_queued:
+            self.dropped += 1
+            return
+        compiled = self.compiled
+        batch = []
+        start = 0
+        if not self.decode:
+            data = memoryview(data)
+        try:
+            while start < len(data):
+                frame = find_frame(compiled, data, start)
+                if frame is None:
+                    raise DecodingError("Truncated message")
+                template_id, end = frame
+                batch.append((self._message(data, start, end, template_id), addr))
+                start = end
+        except Exception:
+            self.dropped += 1
+            return
+        self._put(batch)
+
+    def connection_lost(self, exc: Exception | None):
+        self._close(exc)
@@ -0,0 +1,459 @@
+from ..schema import Composite, Data, Enum, FixedLengthElement, Field, GroupLayout, Message, MessageLayout, MessageSchema, Presence, Ref, Set, Type
+from ..schema.layout import resolve_message
+from .compiler import CompiledSchema, compile
+from .decoder import GroupDecoder, MessageDecoder
+from .errors import DecodingError
+from .formats import block_formats, element_format, field_format
+from .stream import MessageReader
+from dataclasses import dataclass, field as dataclass_field, replace
+from operator import itemgetter
+from os import path as os_path
+from typing import Any, Callable, Iterator
+import os
+import struct
+import pyarrow as pa  # optional dependency, install `sbe2[arrow]`
+import pyarrow.parquet as pq
+
+# Arrow types of SBE primitive types, indexed by primitive type name
+ARROW_TYPES: dict[str, pa.DataType] = {
+    'char': pa.string(),
+    'int8': pa.int8(),
+    'uint8': pa.uint8(),
+    'int16': pa.int16(),
+    'uint16': pa.uint16(),
+    'int': pa.int32(),
+    'int32': pa.int32(),
+    'uint32': pa.uint32(),
+    'int64': pa.int64(),
+    'uint64': pa.uint64(),
+    'float': pa.float32(),
+    'double': pa.float64(),
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Column:
+    """
+    Column of an Arrow schema, filled from a single value of decoded messages.
+    """
+    field: pa.Field
+    get: Callable[[dict[str, Any]], Any]  # Extracts the value of the column from a decoded message or group entry
+    dictionary: tuple[str, ...] | None = None  # Valid value names of enum columns
+    null: Any = None  # Raw null value of enum columns
+    read: Callable[[tuple], Any] | None = None  # Extracts the value from the unpacked block, None for groups and data
+    entries: tuple['Column', ...] = dataclass_field(default=(), repr=False)  # Columns of group entries
+
+    @property
+    def name(self) -> str:
+        return self.field.name
+
+    def array(self, values: list) -> pa.Array:
+        """
+        Converts extracted values into an Arrow array.
+        Enum columns share a dictionary of all valid value names, so that the dictionary does not change between batches.
+        Null values of enums become nulls, other values which are not valid raise DecodingError.
+        """
+        if self.dictionary is None:
+            return pa.array(values, type=self.field.type)
+        index = {name: n for n, name in enumerate(self.dictionary)}
+        indices = [index.get(value) for value in values]
+        if None in indices:
+            for value, n in zip(values, indices):
+                if n is None and value is not None and value != self.null:
+                    raise DecodingError(f"Unknown value {value!r} of enum column '{self.name}'")
+        indices = pa.array(indices, type=self.field.type.index_type)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(self.dictionary, type=pa.string()))
+
+
+def dictionary_type(enum: Enum) -> pa.DataType:
+    """
+    Returns the Arrow dictionary type of an enum, with the smallest index type fitting all valid values.
+    """
+    count = len(enum.valid_values)
+    index_type = pa.int8() if count < 1 << 7 else pa.int16() if count < 1 << 15 else pa.int32()
+    return pa.dictionary(index_type, pa.string())
+
+
+def element_type(element: FixedLengthElement) -> pa.DataType | None:
+    """
+    Returns the Arrow type of a non-composite element, matching values decoded by the runtime:
+    strings for characters and encoded text, fixed size binaries for other byte arrays,
+    fixed size lists for other arrays, dictionaries of valid value names for enums and bit masks for sets.
+
+    Args:
+        element (FixedLengthElement): The element to get the type of.
+
+    Returns:
+        pa.DataType | None: The Arrow type, None for elements which are not decoded.
+    """
+    if isinstance(element, Ref):
+        return element_type(element.type_)
+    if isinstance(element, Type):
+        pt = element.primitive_type
+        if element.presence is Presence.CONSTANT:
+            return ARROW_TYPES[pt.name]
+        length = element.length
+        if length == 0:
+            return None
+        if pt.name == 'char' or (pt.is_byte and length > 1):
+            if length == 1 or element.character_encoding:
+                return pa.string()
+            return pa.binary(length)
+        if length > 1:
+            return pa.list_(ARROW_TYPES[pt.name], length)
+        return ARROW_TYPES[pt.name]
+    if isinstance(element, Enum):
+        return dictionary_type(element)
+    if isinstance(element, Set):
+        return ARROW_TYPES[element.encoding_type.primitive_type.name]
+    raise TypeError(f"Unsupported element type: {type(element)}")
+
+
+def path_getter(path: tuple[str, ...]) -> Callable[[dict[str, Any]], Any]:
+    """
+    Returns a function extracting a value nested in decoded composites.
+    """
+    if len(path) == 1:
+        return itemgetter(path[0])
+
+    def get(values: dict[str, Any]) -> Any:
+        for key in path:
+            values = values[key]
+        return values
+
+    return get
+
+
+def value_reader(decode, index: int) -> Callable[[tuple], Any]:
+    """
+    Returns a function extracting a value from unpacked values of a block, using the decode function of its format.
+    """
+    if decode is None:
+        return itemgetter(index)
+    return lambda values: decode(values, index)
+
+
+def enum_null(enum: Enum) -> Any:
+    """
+    Returns the raw value decoded from null values of the enum, as unpacked by `struct`.
+    """
+    encoding = enum.encoding_type
+    null = encoding.null_value if encoding.null_value is not None else encoding.primitive_type.default_null_value
+    if encoding.primitive_type.name == 'char' and isinstance(null, int):
+        return bytes((null,))
+    return null
+
+
+def element_columns(path: tuple[str, ...], element: FixedLengthElement, index: int = 0) -> list[Column]:
+    """
+    Returns columns of an element. Composites are flattened into one column per nested element,
+    named by joining names of enclosing elements with dots.
+
+    Args:
+        path (tuple[str, ...]): Names of the field and of enclosing composites of the element.
+        element (FixedLengthElement): The element.
+        index (int): Index of the first value of the element in the unpacked block.
+
+    Returns:
+        list[Column]: Columns of the element, empty for elements which are not decoded.
+    """
+    if isinstance(element, Ref):
+        element = element.type_
+    if isinstance(element, Composite):
+        columns = []
+        for child in element.elements:
+            columns += element_columns(path + (child.name,), child, index)
+            index += element_format(child).count
+        return columns
+    arrow_type = element_type(element)
+    if arrow_type is None:
+        return []
+    read = value_reader(element_format(element).decode, index)
+    if isinstance(element, Enum):
+        dictionary = tuple(vv.name for vv in element.valid_values)
+        return [Column(pa.field('.'.join(path), arrow_type), path_getter(path), dictionary, enum_null(element), read)]
+    return [Column(pa.field('.'.join(path), arrow_type), path_getter(path), read=read)]
+
+
+def field_columns(field: Field, index: int = 0) -> list[Column]:
+    """
+    Returns columns of a message or group field, whose first value has the given index in the unpacked block.
+    """
+    if field.presence is Presence.CONSTANT:
+        # constants take no space in the block, their value comes from the schema
+        read = value_reader(field_format(field).decode, index)
+        if isinstance(field.type, Type) and field.type.primitive_type.name == 'char':
+            return [Column(pa.field(field.name, pa.string()), itemgetter(field.name), read=read)]
+        return [replace(column, read=read) for column in element_columns((field.name,), field.type, index)]
+    return element_columns((field.name,), field.type, index)
+
+
+def data_column(data: Data) -> Column:
+    """
+    Returns the column of variable length data: strings if the data has a character encoding, binaries otherwise.
+    """
+    var_data = next((e for e in data.type_.elements if e.name == 'varData'), None)
+    arrow_type = pa.string() if getattr(var_data, 'character_encoding', None) else pa.binary()
+    return Column(pa.field(data.name, arrow_type), itemgetter(data.name))
+
+
+def group_column(layout: GroupLayout) -> Column:
+    """
+    Returns the column of a repeating group: a list of structs with flattened entry columns.
+    Entries are converted into tuples of column values in the order of struct fields.
+    """
+    columns = block_columns(layout.fields, layout.groups, layout.group.datas)
+    entry_type = pa.struct([column.field for column in columns])
+    getters = [column.get for column in columns]
+    get_group = itemgetter(layout.name)
+
+    def get(values: dict[str, Any]) -> list[tuple]:
+        return [tuple([get_value(entry) for get_value in getters]) for entry in get_group(values)]
+
+    return Column(pa.field(layout.name, pa.list_(entry_type)), get, entries=tuple(columns))
+
+
+def block_columns(fields, groups, datas) -> list[Column]:
+    """
+    Returns columns of fields, groups and variable length data of a message or group entry.
+    """
+    columns = []
+    index = 0
+    for field_layout, element_fmt in block_formats(fields):
+        columns += field_columns(field_layout.field, index)
+        index += element_fmt.count
+    columns += [group_column(group) for group in groups]
+    columns += [data_column(data) for data in datas]
+    return columns
+
+
+def message_columns(message: Message | MessageLayout) -> list[Column]:
+    """
+    Returns columns of a message.
+
+    Args:
+        message (Message | MessageLayout): The message or its resolved layout.
+
+    Returns:
+        list[Column]: Columns in the order of fields, groups and variable length data.
+    """
+    layout = message if isinstance(message, MessageLayout) else resolve_message(message)
+    return block_columns(layout.fields, layout.groups, layout.message.datas)
+
+
+def arrow_schema(message: Message | MessageLayout) -> pa.Schema:
+    """
+    Returns the Arrow schema of decoded messages.
+
+    Composites are flattened into one column per element, enums are dictionary encoded strings,
+    sets are integer bit masks and repeating groups are lists of structs.
+
+    Args:
+        message (Message | MessageLayout): The message or its resolved layout.
+
+    Returns:
+        pa.Schema: The schema, with the message name and template ID in its metadata.
+    """
+    layout = message if isinstance(message, MessageLayout) else resolve_message(message)
+    return pa.schema(
+        [column.field for column in message_columns(layout)],
+        metadata={'sbe.message': layout.name, 'sbe.template_id': str(layout.message.id)},
+    )
+
+
+class BlockReader:
+    """
+    Reads column values of a message or group entry straight from the buffer,
+    without decoding it into dictionaries first. Fields are unpacked using a single `unpack_from` call
+    and entries of groups are read into tuples of their column values.
+    """
+
+    def __init__(self, columns: list[Column], decoder: MessageDecoder | GroupDecoder):
+        self._unpack = decoder.block.struct.unpack_from
+        self._reads = [column.read for column in columns if column.read is not None]
+        groups = [column for column in columns if column.entries]
+        self._groups = [(BlockReader(list(column.entries), group), group.dimension) for column, group in zip(groups, decoder.groups)]
+        self._datas = [data.decode_from for data in decoder.datas]
+
+    def append(self, columns_values: list[list], buf, offset: int, block_length: int) -> int:
+        """
+        Appends column values of the block at the offset, followed by its groups and data, to the column lists.
+
+        Returns:
+            int: The offset just after the data of the block.
+        """
+        values = self._unpack(buf, offset)
+        for read, column_values in zip(self._reads, columns_values):
+            column_values.append(read(values))
+        pos = offset + block_length
+        column = len(self._reads)
+        for reader, dimension in self._groups:
+            entries, pos = reader.read_group(dimension, buf, pos)
+            columns_values[column].append(entries)
+            column += 1
+        for decode_from in self._datas:
+            value, pos = decode_from(buf, pos)
+            columns_values[column].append(value)
+            column += 1
+        return pos
+
+    def read_entry(self, buf, offset: int, block_length: int) -> tuple[tuple, int]:
+        """
+        Reads column values of a group entry.
+
+        Returns:
+            tuple[tuple, int]: Values of the entry and the offset just after the entry.
+        """
+        values = self._unpack(buf, offset)
+        row = [read(values) for read in self._reads]
+        pos = offset + block_length
+        for reader, dimension in self._groups:
+            entries, pos = reader.read_group(dimension, buf, pos)
+            row.append(entries)
+        for decode_from in self._datas:
+            value, pos = decode_from(buf, pos)
+            row.append(value)
+        return tuple(row), pos
+
+    def read_group(self, dimension, buf, offset: int) -> tuple[list[tuple], int]:
+        """
+        Reads all entries of a group whose dimension starts at the offset.
+        """
+        block_length, num_in_group = dimension.decode(buf, offset)
+        pos = offset + dimension.size
+        entries = []
+        read_entry = self.read_entry
+        for _ in range(num_in_group):
+            entry, pos = read_entry(buf, pos, block_length)
+            entries.append(entry)
+        return entries, pos
+
+
+class RecordBatchBuilder:
+    """
+    Accumulates decoded messages of a single template column by column and converts them into Arrow record batches.
+    """
+
+    def __init__(self, message: Message | MessageLayout, decoder: MessageDecoder | None = None):
+        """
+        Args:
+            message (Message | MessageLayout): The message or its resolved layout.
+            decoder (MessageDecoder | None): The compiled decoder of the message, required by `append_encoded`.
+        """
+        layout = message if isinstance(message, MessageLayout) else resolve_message(message)
+        self.schema = arrow_schema(layout)
+        self.columns = message_columns(layout)
+        self._getters = [column.get for column in self.columns]
+        self._values: list[list] = [[] for _ in self.columns]
+        self._reader = BlockReader(self.columns, decoder) if decoder is not None else None
+        self._name = layout.name
+
+    def __len__(self) -> int:
+        """
+        Returns the number of accumulated messages.
+        """
+        return len(self._values[0]) if self._values else 0
+
+    def append(self, values: dict[str, Any]):
+        """
+        Appends a decoded message.
+
+        Args:
+            values (dict[str, Any]): The message decoded by the runtime.
+        """
+        for get, column_values in zip(self._getters, self._values):
+            column_values.append(get(values))
+
+    def append_encoded(self, buf, offset: int, block_length: int):
+        """
+        Appends an encoded message, reading column values straight from the buffer.
+
+        Args:
+            buf: Buffer containing the encoded message.
+            offset (int): Offset of the root block in the buffer.
+            block_length (int): Block length read from the message header.
+        """
+        try:
+            self._reader.append(self._values, buf, offset, block_length)
+        except struct.error as e:
+            raise DecodingError(f"Could not decode message '{self._name}': {e}") from e
+
+    def flush(self) -> pa.RecordBatch:
+        """
+        Converts accumulated messages into a record batch and clears the builder.
+
+        Returns:
+            pa.RecordBatch: The batch of all messages appended since the previous flush.
+        """
+        arrays = [column.array(values) for column, values in zip(self.columns, self._values)]
+        self._values = [[] for _ in self.columns]
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+
+def record_batches(schema: MessageSchema | CompiledSchema, source, batch_size: int = 65536) -> Iterator[tuple[int, pa.RecordBatch]]:
+    """
+    Decodes a stream of messages, each preceded by the message header, into Arrow record batches.
+    At most `batch_size` messages of every template are held in memory at a time.
+
+    Args:
+        schema (MessageSchema | CompiledSchema): The schema of messages.
+        source: Source of messages, anything accepted by `MessageReader`.
+        batch_size (int): Maximum number of messages in a batch.
+
+    Returns:
+        Iterator[tuple[int, pa.RecordBatch]]: Template IDs and batches of messages of that template.
+    Raises:
+        DecodingError: If a message cannot be decoded or contains an unknown enum value.
+    """
+    compiled = schema if isinstance(schema, CompiledSchema) else compile(schema)
+    layouts = compiled.schema.layout
+    header = compiled.header
+    builders: dict[int, RecordBatchBuilder] = {}
+    for template_id, message in MessageReader(compiled, source):
+        builder = builders.get(template_id)
+        if builder is None:
+            builder = builders[template_id] = RecordBatchBuilder(layouts[template_id], compiled[template_id])
+        builder.append_encoded(message, header.size, header.decode(message).block_length)
+        if len(builder) >= batch_size:
+            yield template_id, builder.flush()
+    for template_id, builder in builders.items():
+        if len(builder):
+            yield template_id, builder.flush()
+
+
+def write_parquet(
+    schema: MessageSchema | CompiledSchema,
+    source,
+    out_dir: str,
+    batch_size: int = 65536,
+    **options,
+) -> dict[int, str]:
+    """
+    Streams messages into Parquet files, one file per message named after the message.
+    Memory usage is bounded by `batch_size` messages of every template.
+
+    Args:
+        schema (MessageSchema | CompiledSchema): The schema of messages.
+        source: Source of messages, anything accepted by `MessageReader`, e.g. a binary file.
+        out_dir (str): Output directory, created if it does not exist.
+        batch_size (int): Maximum number of messages in a record batch.
+        **options: Options passed to `pyarrow.parquet.ParquetWriter`, e.g. `compression`.
+
+    Returns:
+        dict[int, str]: Paths of written files by template ID.
+    """
+    compiled = schema if isinstance(schema, CompiledSchema) else compile(schema)
+    os.makedirs(out_dir, exist_ok=True)
+    writers: dict[int, pq.ParquetWriter] = {}
+    paths = {}
+    try:
+        for template_id, batch in record_batches(compiled, source, batch_size):
+            writer = writers.get(template_id)
+            if writer is None:
+                paths[template_id] = os_path.join(out_dir, f'{compiled[template_id].message.name}.parquet')
+                writer = writers[template_id] = pq.ParquetWriter(paths[template_id], batch.schema, **options)
+            writer.write_batch(batch)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return paths
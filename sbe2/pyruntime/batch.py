@@ -0,0 +1,217 @@
+from ..schema import ByteOrder, Composite, FixedLengthElement, Type, Enum, Set, Ref, Presence, Message, FieldLayout, GroupLayout, MessageLayout
+from ..schema.layout import resolve_message
+from .decoder import DimensionDecoder
+from .formats import byte_order_prefix
+from .errors import DecodingError
+import struct
+import numpy as np  # optional dependency, install `sbe2[numpy]`
+
+# NumPy type codes of SBE primitive types, indexed by primitive type name
+NUMPY_CODES: dict[str, str] = {
+    'char': 'S1',
+    'int8': 'i1',
+    'uint8': 'u1',
+    'int16': 'i2',
+    'uint16': 'u2',
+    'int': 'i4',
+    'int32': 'i4',
+    'uint32': 'u4',
+    'int64': 'i8',
+    'uint64': 'u8',
+    'float': 'f4',
+    'double': 'f8',
+}
+
+
+def element_dtype(element: FixedLengthElement, byte_order: ByteOrder) -> np.dtype | None:
+    """
+    Returns the NumPy dtype of a fixed length element.
+    Character arrays are represented as byte strings, other arrays as sub-arrays,
+    enums and sets as their encoding types and composites as nested structured dtypes.
+
+    Args:
+        element (FixedLengthElement): The element to get the dtype of.
+        byte_order (ByteOrder): The byte order of the schema.
+
+    Returns:
+        np.dtype | None: The dtype, None for elements which do not take any space in the buffer.
+    """
+    prefix = byte_order_prefix(byte_order)
+    if isinstance(element, Ref):
+        return element_dtype(element.type_, byte_order)
+    if isinstance(element, Type):
+        if element.presence is Presence.CONSTANT or element.length == 0:
+            return None
+        code = NUMPY_CODES[element.primitive_type.name]
+        if code == 'S1':
+            return np.dtype(f'S{element.length}')
+        if element.length > 1:
+            return np.dtype((prefix + code, (element.length,)))
+        return np.dtype(prefix + code)
+    if isinstance(element, (Enum, Set)):
+        return element_dtype(element.encoding_type, byte_order)
+    if isinstance(element, Composite):
+        names, formats, offsets = [], [], []
+        pos = 0
+        for child in element.elements:
+            if getattr(child, 'offset', None) is not None:
+                pos = child.offset
+            dtype = element_dtype(child, byte_order)
+            if dtype is not None:
+                names.append(child.name)
+                formats.append(dtype)
+                offsets.append(pos)
+                pos += dtype.itemsize
+        return np.dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': element.total_length})
+    raise TypeError(f"Unsupported element type: {type(element)}")
+
+
+def block_dtype(fields: tuple[FieldLayout, ...], block_length: int, byte_order: ByteOrder, truncate: bool = False) -> np.dtype:
+    """
+    Returns the NumPy structured dtype of a fixed size block. Padding between fields
+    and at the end of the block is preserved, so the item size equals the block length.
+
+    Args:
+        fields (tuple[FieldLayout, ...]): Layouts of fields of the block.
+        block_length (int): The length of the block.
+        byte_order (ByteOrder): The byte order of the schema.
+        truncate (bool): If True, fields which do not fit in the block are omitted,
+            e.g. fields added by a newer schema version than the one the block was encoded with.
+
+    Returns:
+        np.dtype: The structured dtype, constant fields are omitted.
+    """
+    names, formats, offsets = [], [], []
+    for field_layout in fields:
+        if not field_layout.length or field_layout.field.presence is Presence.CONSTANT:
+            continue
+        if truncate and field_layout.offset + field_layout.length > block_length:
+            continue
+        dtype = element_dtype(field_layout.field.type, byte_order)
+        if dtype is None:
+            continue
+        if dtype.itemsize != field_layout.length:
+            raise ValueError(f"Field '{field_layout.name}' is {dtype.itemsize} bytes long, but its layout expects {field_layout.length}")
+        names.append(field_layout.name)
+        formats.append(dtype)
+        offsets.append(field_layout.offset)
+    return np.dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': block_length})
+
+
+def message_dtype(message: Message | MessageLayout, byte_order: ByteOrder, header: Composite | None = None) -> np.dtype:
+    """
+    Returns the NumPy structured dtype of the root block of a message.
+
+    Args:
+        message (Message | MessageLayout): The message or its resolved layout.
+        byte_order (ByteOrder): The byte order of the schema.
+        header (Composite | None): The message header type. If given, every item starts with the header,
+            available as a nested field named after the header type.
+
+    Returns:
+        np.dtype: The structured dtype.
+    """
+    layout = message if isinstance(message, MessageLayout) else resolve_message(message)
+    block = block_dtype(layout.fields, layout.block_length, byte_order)
+    if header is None:
+        return block
+    header_dtype = element_dtype(header, byte_order)
+    if header.name in block.names:
+        raise ValueError(f"Field '{header.name}' of message '{layout.name}' clashes with the message header")
+    names = [header.name, *block.names]
+    formats = [header_dtype, *(block.fields[name][0] for name in block.names)]
+    offsets = [0, *(block.fields[name][1] + header_dtype.itemsize for name in block.names)]
+    return np.dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': header_dtype.itemsize + block.itemsize})
+
+
+def decode_batch(
+    buffer,
+    message: Message | MessageLayout,
+    byte_order: ByteOrder = ByteOrder.LITTLE_ENDIAN,
+    header: Composite | None = None,
+    offset: int = 0,
+    count: int = -1,
+) -> np.ndarray:
+    """
+    Decodes back-to-back fixed size messages with a single `np.frombuffer` call.
+    The returned array is a view of the buffer, no data is copied.
+
+    Args:
+        buffer: Buffer containing the encoded messages.
+        message (Message | MessageLayout): The message definition or its resolved layout.
+            The message must not contain any groups or variable length data.
+        byte_order (ByteOrder): The byte order of the schema.
+        header (Composite | None): The message header type, if every message is preceded by the header.
+            Template IDs and block lengths of all headers are verified.
+        offset (int): Offset of the first message in the buffer.
+        count (int): Number of messages to decode, -1 to decode the whole buffer.
+
+    Returns:
+        np.ndarray: Structured array of decoded messages.
+    """
+    layout = message if isinstance(message, MessageLayout) else resolve_message(message)
+    if layout.groups or layout.message.datas:
+        raise ValueError(f"Message '{layout.name}' is not fixed size, batch decoding is not possible")
+    dtype = message_dtype(layout, byte_order, header)
+    if count < 0 and (memoryview(buffer).nbytes - offset) % dtype.itemsize:
+        raise DecodingError(f"Buffer does not contain a whole number of '{layout.name}' messages of {dtype.itemsize} bytes")
+    try:
+        result = np.frombuffer(buffer, dtype=dtype, count=count, offset=offset)
+    except ValueError as e:
+        raise DecodingError(f"Could not decode '{layout.name}' messages: {e}") from e
+    if header is not None and len(result):
+        headers = result[header.name]
+        names = headers.dtype.names
+        if 'templateId' in names and np.any(headers['templateId'] != layout.message.id):
+            raise DecodingError(f"Buffer contains messages other than '{layout.name}'")
+        if 'blockLength' in names and np.any(headers['blockLength'] != layout.block_length):
+            raise DecodingError(f"Buffer contains '{layout.name}' messages of unexpected block length")
+    return result
+
+
+def decode_group_batch(
+    buffer,
+    group: GroupLayout,
+    byte_order: ByteOrder = ByteOrder.LITTLE_ENDIAN,
+    offset: int = 0,
+) -> tuple[np.ndarray, int]:
+    """
+    Decodes all entries of a repeating group with a single `np.frombuffer` call.
+    The returned array is a view of the buffer, no data is copied.
+
+    Entries are strided by the block length read from the group dimension, so entries extended
+    by a newer schema version are decoded as well. Fields which do not fit in shorter entries
+    encoded with an older schema version are omitted from the array.
+
+    Args:
+        buffer: Buffer containing the encoded group.
+        group (GroupLayout): The resolved layout of the group.
+            Entries of the group must not contain any nested groups or variable length data.
+        byte_order (ByteOrder): The byte order of the schema.
+        offset (int): Offset of the group dimension in the buffer.
+
+    Returns:
+        tuple[np.ndarray, int]: Structured array of decoded entries and the offset just after the group.
+    """
+    if group.groups or group.group.datas:
+        raise ValueError(f"Group '{group.name}' is not fixed size, batch decoding is not possible")
+    dimension = DimensionDecoder(group.group.dimension_type, byte_order)
+    try:
+        block_length, num_in_group = dimension.decode(buffer, offset)
+    except struct.error as e:
+        raise DecodingError(f"Could not decode dimension of group '{group.name}': {e}") from e
+    truncate = block_length < group.block_length
+    dtype = block_dtype(group.fields, block_length if truncate else group.block_length, byte_order, truncate)
+    if block_length != dtype.itemsize:
+        dtype = np.dtype({
+            'names': dtype.names,
+            'formats': [dtype.fields[name][0] for name in dtype.names],
+            'offsets': [dtype.fields[name][1] for name in dtype.names],
+            'itemsize': block_length,
+        })
+    start = offset + dimension.size
+    try:
+        result = np.frombuffer(buffer, dtype=dtype, count=num_in_group, offset=start)
+    except ValueError as e:
+        raise DecodingError(f"Could not decode group '{group.name}': {e}") from e
+    return result, start + num_in_group * block_length
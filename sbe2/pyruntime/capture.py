@@ -0,0 +1,303 @@
+from ..schema import MessageSchema, Message
+from .compiler import CompiledSchema, compile
+from .errors import DecodingError
+from .stream import find_frame
+from array import array
+from typing import Any, Iterator
+import hashlib
+import mmap
+import os
+import struct
+
+# magic, size and modification time of the indexed capture file, schema ID and version,
+# digest of the leading chunk of the capture file, number of indexed messages, number of distinct templates
+INDEX_HEADER = struct.Struct('<8sQqHH16sQQ')
+INDEX_MAGIC = b'SBE2IDX3'
+# Number of leading bytes of the capture file hashed to detect a replaced file
+INDEX_CHUNK = 1 << 16
+
+
+def leading_digest(buf, file_size: int) -> bytes:
+    """
+    Returns the digest of the leading chunk of a capture file of the given size.
+    """
+    return hashlib.blake2b(buf[:min(file_size, INDEX_CHUNK)], digest_size=16).digest()
+
+
+class CaptureIndex:
+    """
+    Offsets and template IDs of all messages of a capture file.
+    Offsets contain one more entry than template IDs: the end of the last message.
+    Positions of messages of every template are indexed too, in the order of the file.
+    The index records the size, modification time and digest of the leading chunk of the indexed file,
+    and the ID and version of the schema, so that a stale index is detected.
+    """
+
+    def __init__(
+        self,
+        offsets: array | None = None,
+        template_ids: array | None = None,
+        file_size: int = 0,
+        mtime_ns: int = 0,
+        schema_id: int = 0,
+        version: int = 0,
+        digest: bytes = b'',
+        positions: dict[int, array] | None = None,
+    ):
+        self.offsets = offsets if offsets is not None else array('Q', [0])
+        self.template_ids = template_ids if template_ids is not None else array('I')
+        self.positions = positions if positions is not None else {}
+        self.file_size = file_size
+        self.mtime_ns = mtime_ns
+        self.schema_id = schema_id
+        self.version = version
+        self.digest = digest
+
+    def __len__(self) -> int:
+        return len(self.template_ids)
+
+    @property
+    def end(self) -> int:
+        """
+        Returns the offset just after the last indexed message.
+        """
+        return self.offsets[-1]
+
+    def save(self, path: str):
+        """
+        Writes the index to a file. The file is replaced atomically.
+
+        Args:
+            path (str): Path of the index file.
+        """
+        # processes indexing the same file concurrently do not share the temporary file
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as file:
+                file.write(INDEX_HEADER.pack(
+                    INDEX_MAGIC, self.file_size, self.mtime_ns, self.schema_id, self.version, self.digest,
+                    len(self), len(self.positions),
+                ))
+                self.offsets.tofile(file)
+                self.template_ids.tofile(file)
+                array('I', self.positions).tofile(file)
+                array('Q', (len(positions) for positions in self.positions.values())).tofile(file)
+                for positions in self.positions.values():
+                    positions.tofile(file)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> 'CaptureIndex | None':
+        """
+        Reads the index from a file.
+
+        Args:
+            path (str): Path of the index file.
+
+        Returns:
+            CaptureIndex | None: The index, None if the file does not exist or is not a valid index.
+        """
+        try:
+            with open(path, 'rb') as file:
+                header = INDEX_HEADER.unpack(file.read(INDEX_HEADER.size))
+                magic, file_size, mtime_ns, schema_id, version, digest, count, num_templates = header
+                if magic != INDEX_MAGIC:
+                    return None
+                offsets = array('Q')
+                offsets.fromfile(file, count + 1)
+                template_ids = array('I')
+                template_ids.fromfile(file, count)
+                templates = array('I')
+                templates.fromfile(file, num_templates)
+                counts = array('Q')
+                counts.fromfile(file, num_templates)
+                if sum(counts) != count:
+                    return None
+                positions = {}
+                for template_id, template_count in zip(templates, counts):
+                    positions[template_id] = array('Q')
+                    positions[template_id].fromfile(file, template_count)
+        except (OSError, EOFError, struct.error):
+            return None
+        return cls(offsets, template_ids, file_size, mtime_ns, schema_id, version, digest, positions)
+
+
+class CaptureFile:
+    """
+    Memory mapped file of back-to-back messages, each preceded by the message header.
+
+    Offsets of all messages and positions of messages of every template are indexed once and persisted
+    in a sidecar index file, so that accessing the n-th message is O(1) and iterating messages of a single
+    template does not rescan the file.
+    The index is rebuilt when it was written for another schema ID or version, when the leading chunk of the file
+    changed, or when the modification time changed while the size did not. When the capture file grows, only
+    the new messages are indexed, provided the last indexed message is still intact. Messages are returned as
+    zero-copy memoryview slices of the mapping, which must be released before the file is closed.
+    """
+
+    def __init__(self, schema: MessageSchema | CompiledSchema, path: str, index_path: str | None = None, save_index: bool = True):
+        self.compiled = schema if isinstance(schema, CompiledSchema) else compile(schema)
+        self.path = path
+        self.index_path = index_path if index_path is not None else f'{path}.idx'
+        self._file = open(path, 'rb')
+        self._mmap = None
+        self._view = memoryview(b'')
+        try:
+            self._open(save_index)
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self, save_index: bool):
+        """
+        Maps the file and loads, extends or builds its index.
+        """
+        stat = os.fstat(self._file.fileno())
+        size = stat.st_size
+        # empty files cannot be mapped
+        if size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap)
+        index = CaptureIndex.load(self.index_path)
+        if index is None or not self._is_valid(index, size, stat.st_mtime_ns):
+            schema = self.compiled.schema
+            index = CaptureIndex(schema_id=schema.id, version=schema.version)
+        if index.file_size != size or index.mtime_ns != stat.st_mtime_ns:
+            self._extend(index, size)
+            index.mtime_ns = stat.st_mtime_ns
+            index.digest = leading_digest(self._view, size)
+            if save_index:
+                index.save(self.index_path)
+        self.index = index
+
+    def _is_valid(self, index: CaptureIndex, size: int, mtime_ns: int) -> bool:
+        """
+        Returns True if the index can be used as it is or extended with messages appended to the file.
+        """
+        schema = self.compiled.schema
+        if index.schema_id != schema.id or index.version != schema.version:
+            return False
+        if index.file_size > size or index.end > size:
+            return False
+        if index.file_size == size and index.mtime_ns != mtime_ns:
+            return False  # rewritten in place
+        if index.digest != leading_digest(self._view, index.file_size):
+            return False
+        if len(index) and index.mtime_ns != mtime_ns:
+            # the file grew, the last indexed message has to end where the index says
+            try:
+                frame = find_frame(self.compiled, self._view, index.offsets[-2])
+            except DecodingError:
+                return False
+            if frame is None or frame != (index.template_ids[-1], index.end):
+                return False
+        return True
+
+    def _extend(self, index: CaptureIndex, size: int):
+        """
+        Indexes messages following the last indexed message. An incomplete message at the end of the file is not indexed.
+        """
+        view = self._view
+        offsets = index.offsets
+        template_ids = index.template_ids
+        positions = index.positions
+        offset = index.end
+        while True:
+            frame = find_frame(self.compiled, view, offset)
+            if frame is None:
+                break
+            template_id, offset = frame
+            template_positions = positions.get(template_id)
+            if template_positions is None:
+                template_positions = positions[template_id] = array('Q')
+            template_positions.append(len(template_ids))
+            template_ids.append(template_id)
+            offsets.append(offset)
+        index.file_size = size
+
+    def __len__(self) -> int:
+        """
+        Returns the number of indexed messages.
+        """
+        return len(self.index)
+
+    def __getitem__(self, n: int) -> tuple[int, memoryview]:
+        """
+        Returns the n-th message.
+
+        Args:
+            n (int): Position of the message in the file, negative positions count from the end.
+
+        Returns:
+            tuple[int, memoryview]: Template ID and the message including its header.
+        """
+        index = self.index
+        if n < 0:
+            n += len(index)
+        if not 0 <= n < len(index):
+            raise IndexError(f"Message {n} out of range")
+        return index.template_ids[n], self._view[index.offsets[n]:index.offsets[n + 1]]
+
+    def __iter__(self) -> Iterator[tuple[int, memoryview]]:
+        """
+        Returns an iterator over `(template_id, message)` pairs of all messages.
+        """
+        view = self._view
+        offsets = self.index.offsets
+        for n, template_id in enumerate(self.index.template_ids):
+            yield template_id, view[offsets[n]:offsets[n + 1]]
+
+    def positions(self, template_id: int) -> array:
+        """
+        Returns positions of all messages of the given template.
+
+        Args:
+            template_id (int): The template ID.
+
+        Returns:
+            array: Positions of the messages, in the order of the file.
+        """
+        return self.index.positions.get(template_id, array('Q'))
+
+    def iter_template(self, template_id: int) -> Iterator[memoryview]:
+        """
+        Returns an iterator over messages of a single template, without scanning other messages.
+
+        Args:
+            template_id (int): The template ID.
+
+        Returns:
+            Iterator[memoryview]: Messages including their headers.
+        """
+        view = self._view
+        offsets = self.index.offsets
+        for n in self.positions(template_id):
+            yield view[offsets[n]:offsets[n + 1]]
+
+    def decode(self, n: int) -> tuple[Message, dict[str, Any]]:
+        """
+        Decodes the n-th message.
+
+        Returns:
+            tuple[Message, dict[str, Any]]: The message definition and the decoded message.
+        """
+        return self.compiled.decode(self[n][1])
+
+    def close(self):
+        """
+        Closes the mapping and the file. Raises BufferError if any returned memoryview is still in use.
+        """
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> 'CaptureFile':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,182 @@
+from ..schema import MessageSchema, Message
+from .decoder import HeaderDecoder, MessageDecoder, MessageHeader
+from .encoder import HeaderEncoder, MessageEncoder
+from .errors import DecodingError
+from .view import MessageView, view_class
+from typing import Any
+
+
+class CompiledSchema:
+    """
+    Decoders and encoders of all messages of a schema, precompiled once by `compile`.
+    """
+
+    def __init__(self, schema: MessageSchema):
+        self.schema = schema
+        self.header = HeaderDecoder(schema.header_type, schema.byte_order)
+        self._by_id: dict[int, MessageDecoder] = {}
+        self._by_name: dict[str, MessageDecoder] = {}
+        self._views: dict[int, type[MessageView]] = {}
+        self._encoders: dict[int, MessageEncoder] = {}
+        header_encoder = HeaderEncoder(schema.header_type, schema.byte_order)
+        for layout in schema.layout:
+            message = layout.message
+            decoder = MessageDecoder(layout, schema.byte_order)
+            self._by_id[message.id] = decoder
+            self._by_name[message.name] = decoder
+            self._views[message.id] = view_class(layout, schema.byte_order)
+            header_values = header_encoder.values(
+                blockLength=decoder.block_length,
+                templateId=message.id,
+                schemaId=schema.id,
+                version=schema.version,
+                numGroups=len(message.groups),
+                numVarDataFields=len(message.datas),
+            )
+            self._encoders[message.id] = MessageEncoder(layout, schema.byte_order, header_encoder.fmt, header_values)
+
+    def __getitem__(self, key: int | str) -> MessageDecoder:
+        """
+        Returns MessageDecoder by message ID or name.
+        Raises KeyError if not found.
+        """
+        if isinstance(key, str):
+            return self._by_name[key]
+        if isinstance(key, int):
+            return self._by_id[key]
+        key_type = type(key)
+        raise KeyError(f"Unrecognized message key type: '{key_type}'")
+
+    def get(self, key: int | str) -> MessageDecoder | None:
+        """
+        Returns MessageDecoder by message ID or name.
+        """
+        if isinstance(key, str):
+            return self._by_name.get(key)
+        if isinstance(key, int):
+            return self._by_id.get(key)
+
+    def __iter__(self):
+        """
+        Returns an iterator over the message decoders.
+        """
+        return iter(self._by_id.values())
+
+    def __len__(self) -> int:
+        """
+        Returns the number of compiled messages.
+        """
+        return len(self._by_id)
+
+    def view(self, key: int | str) -> MessageView:
+        """
+        Creates a flyweight view of the message. The view can be re-wrapped over any number of messages.
+
+        Args:
+            key (int | str): Message ID or name.
+
+        Returns:
+            MessageView: A view that is not wrapped over any buffer yet.
+        """
+        return self._views[self[key].message.id]()
+
+    def encoder(self, key: int | str) -> MessageEncoder:
+        """
+        Returns the encoder of the message, which writes the message header followed by the message.
+
+        Args:
+            key (int | str): Message ID or name.
+
+        Returns:
+            MessageEncoder: The message encoder.
+        """
+        return self._encoders[self[key].message.id]
+
+    def encode_into(self, key: int | str, values: dict[str, Any], buf, offset: int = 0) -> int:
+        """
+        Encodes the message header and the message into a caller supplied buffer, without allocating a new one.
+
+        Args:
+            key (int | str): Message ID or name.
+            values (dict[str, Any]): The message, in the same form as returned by `decode`.
+            buf: Writable buffer, such as `bytearray` or `memoryview`.
+            offset (int): Offset of the message header in the buffer.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        return self.encoder(key).encode_into(buf, offset, values)
+
+    def decode_batch(self, key: int | str, buf, offset: int = 0, count: int = -1, header: bool = True):
+        """
+        Decodes back-to-back fixed size messages into a NumPy structured array with a single `np.frombuffer` call.
+        Requires the optional `numpy` dependency.
+
+        Args:
+            key (int | str): Message ID or name.
+            buf: Buffer containing the encoded messages.
+            offset (int): Offset of the first message in the buffer.
+            count (int): Number of messages to decode, -1 to decode the whole buffer.
+            header (bool): True if every message is preceded by the message header.
+
+        Returns:
+            np.ndarray: Structured array of decoded messages.
+        """
+        from .batch import decode_batch
+        layout = self.schema.layout[self[key].message.id]
+        return decode_batch(buf, layout, self.schema.byte_order, self.schema.header_type if header else None, offset, count)
+
+    def decode_header(self, buf, offset: int = 0) -> MessageHeader:
+        """
+        Decodes the message header.
+
+        Args:
+            buf: Buffer containing the encoded message.
+            offset (int): Offset of the message header in the buffer.
+
+        Returns:
+            MessageHeader: The decoded header.
+        """
+        return self.header.decode(buf, offset)
+
+    def decode(self, buf, offset: int = 0) -> tuple[Message, dict[str, Any]]:
+        """
+        Decodes a message preceded by the message header.
+
+        Args:
+            buf: Buffer containing the encoded message.
+            offset (int): Offset of the message header in the buffer.
+
+        Returns:
+            tuple[Message, dict[str, Any]]: The message definition and the decoded message.
+        """
+        message, result, _ = self.decode_from(buf, offset)
+        return message, result
+
+    def decode_from(self, buf, offset: int = 0) -> tuple[Message, dict[str, Any], int]:
+        """
+        Decodes a message preceded by the message header.
+
+        Returns:
+            tuple[Message, dict[str, Any], int]: The message definition, the decoded message and the offset just after the message.
+        """
+        header = self.header.decode(buf, offset)
+        decoder = self._by_id.get(header.template_id)
+        if decoder is None:
+            raise DecodingError(f"Unknown template ID: {header.template_id}")
+        result, end = decoder.decode_from(buf, offset + self.header.size, header.block_length)
+        return decoder.message, result, end
+
+
+def compile(schema: MessageSchema) -> CompiledSchema:
+    """
+    Compiles decoders and encoders of all messages of the schema.
+    `struct` formats are built once from the schema layout, so decoding costs a single `unpack_from` per fixed size block.
+
+    Args:
+        schema (MessageSchema): The schema to compile.
+
+    Returns:
+        CompiledSchema: Decoders of all messages of the schema.
+    """
+    return CompiledSchema(schema)
@@ -0,0 +1,388 @@
+from ..schema import ByteOrder, Composite, Data, FieldLayout, GroupLayout, MessageLayout
+from .formats import byte_order_prefix, block_fmt, block_formats, composite_format, composite_indexes
+from .errors import DecodingError
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+import struct
+
+if TYPE_CHECKING:
+    from .compiler import CompiledSchema
+
+
+class BlockDecoder:
+    """
+    Decodes a fixed size block of fields using a single `unpack_from` call.
+    """
+
+    def __init__(self, fields: tuple[FieldLayout, ...], block_length: int, byte_order: ByteOrder):
+        formats = block_formats(fields)
+        self.size = block_length
+        self._layouts = fields
+        self._byte_order = byte_order
+        self._shorter: dict[int, Callable[[Any, int], dict[str, Any]]] = {}
+        self.struct = struct.Struct(byte_order_prefix(byte_order) + block_fmt(formats, block_length))
+        self._fields: list[tuple[str, int, Any]] = []
+        count = 0
+        for field_layout, element_fmt in formats:
+            self._fields.append((field_layout.name, count, element_fmt.decode))
+            count += element_fmt.count
+        # fast path, every field is a single value used as it is
+        self._plain = count == len(self._fields) and all(dec is None for _, _, dec in self._fields)
+        self._names = tuple(name for name, _, _ in self._fields)
+
+    def decode(self, buf, offset: int = 0) -> dict[str, Any]:
+        """
+        Decodes the block.
+
+        Args:
+            buf: Buffer containing the encoded block.
+            offset (int): Offset of the block in the buffer.
+
+        Returns:
+            dict[str, Any]: Field values by field name.
+        """
+        values = self.struct.unpack_from(buf, offset)
+        if self._plain:
+            return dict(zip(self._names, values))
+        return {
+            name: values[index] if dec is None else dec(values, index)
+            for name, index, dec in self._fields
+        }
+
+    def decoder(self, block_length: int) -> Callable[[Any, int], dict[str, Any]]:
+        """
+        Returns a function decoding blocks of the given length.
+        Blocks shorter than the schema block, e.g. encoded by an older schema version, are decoded
+        only up to their end, fields past the end are decoded as None.
+
+        Args:
+            block_length (int): Block length read from the message header or the group dimension.
+
+        Returns:
+            Callable[[Any, int], dict[str, Any]]: Function decoding a block at the given offset of the buffer.
+        """
+        if block_length >= self.size:
+            return self.decode
+        decode = self._shorter.get(block_length)
+        if decode is None:
+            fields = tuple(
+                field_layout for field_layout in self._layouts
+                if field_layout.length == 0 or field_layout.offset + field_layout.length <= block_length
+            )
+            short = BlockDecoder(fields, block_length, self._byte_order)
+            names = self._names
+
+            def decode(buf, offset: int = 0) -> dict[str, Any]:
+                values = short.decode(buf, offset)
+                return {name: values.get(name) for name in names}
+
+            self._shorter[block_length] = decode
+        return decode
+
+
+class DataDecoder:
+    """
+    Decodes variable length data.
+    """
+
+    def __init__(self, data: Data, byte_order: ByteOrder):
+        self.name = data.name
+        composite = data.type_
+        header = composite_format(composite)
+        self.struct = struct.Struct(byte_order_prefix(byte_order) + header.fmt)
+        indexes = composite_indexes(composite)
+        if 'length' not in indexes:
+            raise ValueError(f"Data type '{composite.name}' does not contain 'length' element")
+        self._length_index = indexes['length']
+        var_data = next((e for e in composite.elements if e.name == 'varData'), None)
+        self._encoding = getattr(var_data, 'character_encoding', None)
+
+    def decode_from(self, buf, offset: int) -> tuple[bytes | str, int]:
+        """
+        Decodes the data.
+
+        Args:
+            buf: Buffer containing the encoded data.
+            offset (int): Offset of the data in the buffer.
+
+        Returns:
+            tuple[bytes | str, int]: The decoded value and the offset just after the data.
+        """
+        length = self.struct.unpack_from(buf, offset)[self._length_index]
+        start = offset + self.struct.size
+        end = start + length
+        if end > len(buf):
+            raise DecodingError(f"Data '{self.name}' of length {length} exceeds the buffer")
+        value = bytes(buf[start:end])
+        if self._encoding:
+            value = value.decode(self._encoding)
+        return value, end
+
+    def skip(self, buf, offset: int) -> int:
+        """
+        Skips the data without decoding or copying it.
+        The data itself is not bounds checked, the caller should compare the result with the buffer length.
+
+        Returns:
+            int: The offset just after the data.
+        """
+        return offset + self.struct.size + self.struct.unpack_from(buf, offset)[self._length_index]
+
+
+class DimensionDecoder:
+    """
+    Decodes the dimension of a repeating group: block length and number of entries.
+    """
+
+    def __init__(self, composite: Composite, byte_order: ByteOrder):
+        fmt = composite_format(composite)
+        self.struct = struct.Struct(byte_order_prefix(byte_order) + fmt.fmt)
+        self.size = self.struct.size
+        indexes = composite_indexes(composite)
+        for name in ('blockLength', 'numInGroup'):
+            if name not in indexes:
+                raise ValueError(f"Dimension type '{composite.name}' does not contain '{name}' element")
+        self._getter = itemgetter(indexes['blockLength'], indexes['numInGroup'])
+
+    def decode(self, buf, offset: int) -> tuple[int, int]:
+        """
+        Returns:
+            tuple[int, int]: Block length and number of entries in the group.
+        """
+        return self._getter(self.struct.unpack_from(buf, offset))
+
+
+class GroupDecoder:
+    """
+    Decodes a repeating group into a list of dictionaries.
+    """
+
+    def __init__(self, layout: GroupLayout, byte_order: ByteOrder):
+        group = layout.group
+        self.name = group.name
+        self.dimension = DimensionDecoder(group.dimension_type, byte_order)
+        self.block = BlockDecoder(layout.fields, layout.block_length, byte_order)
+        self.groups = [GroupDecoder(g, byte_order) for g in layout.groups]
+        self.datas = [DataDecoder(d, byte_order) for d in group.datas]
+
+    def decode_from(self, buf, offset: int) -> tuple[list[dict[str, Any]], int]:
+        """
+        Decodes the group.
+
+        Args:
+            buf: Buffer containing the encoded group.
+            offset (int): Offset of the group dimension in the buffer.
+
+        Returns:
+            tuple[list[dict[str, Any]], int]: Decoded entries and the offset just after the group.
+        """
+        block_length, num_in_group = self.dimension.decode(buf, offset)
+        pos = offset + self.dimension.size
+        decode_block = self.block.decoder(block_length)
+        entries = []
+        if not self.groups and not self.datas:
+            for _ in range(num_in_group):
+                entries.append(decode_block(buf, pos))
+                pos += block_length
+            return entries, pos
+        for _ in range(num_in_group):
+            entry = decode_block(buf, pos)
+            pos += block_length
+            for group in self.groups:
+                entry[group.name], pos = group.decode_from(buf, pos)
+            for data in self.datas:
+                entry[data.name], pos = data.decode_from(buf, pos)
+            entries.append(entry)
+        return entries, pos
+
+    def skip(self, buf, offset: int) -> int:
+        """
+        Skips the group, reading only dimensions of nested groups and lengths of variable length data.
+
+        Returns:
+            int: The offset just after the group.
+        """
+        block_length, num_in_group = self.dimension.decode(buf, offset)
+        pos = offset + self.dimension.size
+        if not self.groups and not self.datas:
+            return pos + block_length * num_in_group
+        for _ in range(num_in_group):
+            pos += block_length
+            for group in self.groups:
+                pos = group.skip(buf, pos)
+            for data in self.datas:
+                pos = data.skip(buf, pos)
+        return pos
+
+
+class MessageDecoder:
+    """
+    Decodes a message body (root block, groups and variable length data) into a dictionary.
+    """
+
+    def __init__(self, layout: MessageLayout, byte_order: ByteOrder):
+        message = layout.message
+        self.message = message
+        self.block = BlockDecoder(layout.fields, layout.block_length, byte_order)
+        self.groups = [GroupDecoder(g, byte_order) for g in layout.groups]
+        self.datas = [DataDecoder(d, byte_order) for d in message.datas]
+
+    @property
+    def block_length(self) -> int:
+        """
+        Returns the length of the root block in bytes.
+        """
+        return self.block.size
+
+    def decode(self, buf, offset: int = 0, block_length: int | None = None) -> dict[str, Any]:
+        """
+        Decodes the message body.
+
+        Args:
+            buf: Buffer containing the encoded message.
+            offset (int): Offset of the root block in the buffer.
+            block_length (int | None): Block length read from the message header. Defaults to the schema block length.
+
+        Returns:
+            dict[str, Any]: Decoded message.
+        """
+        return self.decode_from(buf, offset, block_length)[0]
+
+    def decode_from(self, buf, offset: int = 0, block_length: int | None = None) -> tuple[dict[str, Any], int]:
+        """
+        Decodes the message body.
+
+        Returns:
+            tuple[dict[str, Any], int]: Decoded message and the offset just after the message.
+        """
+        try:
+            if block_length is None:
+                result = self.block.decode(buf, offset)
+                pos = offset + self.block.size
+            else:
+                result = self.block.decoder(block_length)(buf, offset)
+                pos = offset + block_length
+            for group in self.groups:
+                result[group.name], pos = group.decode_from(buf, pos)
+            for data in self.datas:
+                result[data.name], pos = data.decode_from(buf, pos)
+        except struct.error as e:
+            raise DecodingError(f"Could not decode message '{self.message.name}': {e}") from e
+        return result, pos
+
+    def skip(self, buf, offset: int = 0, block_length: int | None = None) -> int:
+        """
+        Finds the end of the message body without decoding its fields.
+        The last variable length data is not bounds checked, the caller should compare the result with the buffer length.
+
+        Args:
+            buf: Buffer containing the encoded message.
+            offset (int): Offset of the root block in the buffer.
+            block_length (int | None): Block length read from the message header. Defaults to the schema block length.
+
+        Returns:
+            int: The offset just after the message.
+        """
+        pos = offset + (self.block.size if block_length is None else block_length)
+        try:
+            for group in self.groups:
+                pos = group.skip(buf, pos)
+            for data in self.datas:
+                pos = data.skip(buf, pos)
+        except struct.error as e:
+            raise DecodingError(f"Could not decode message '{self.message.name}': {e}") from e
+        return pos
+
+
+class MessageHeader(NamedTuple):
+    """
+    Standard fields of the message header.
+    """
+    block_length: int
+    template_id: int
+    schema_id: int
+    version: int
+
+
+class HeaderDecoder:
+    """
+    Decodes the message header.
+    """
+
+    def __init__(self, composite: Composite, byte_order: ByteOrder):
+        fmt = composite_format(composite)
+        self.struct = struct.Struct(byte_order_prefix(byte_order) + fmt.fmt)
+        self.size = self.struct.size
+        indexes = composite_indexes(composite)
+        names = ('blockLength', 'templateId', 'schemaId', 'version')
+        for name in names:
+            if name not in indexes:
+                raise ValueError(f"Header type '{composite.name}' does not contain '{name}' element")
+        self._getter = itemgetter(*(indexes[name] for name in names))
+
+    def decode(self, buf, offset: int = 0) -> MessageHeader:
+        """
+        Decodes the message header.
+
+        Args:
+            buf: Buffer containing the encoded header.
+            offset (int): Offset of the header in the buffer.
+
+        Returns:
+            MessageHeader: The decoded header.
+        """
+        try:
+            return MessageHeader(*self._getter(self.struct.unpack_from(buf, offset)))
+        except struct.error as e:
+            raise DecodingError(f"Could not decode message header: {e}") from e
+
+
+def _root_blocks(compiled: 'CompiledSchema', buf, start: int, end: int | None) -> tuple[dict[int, bytes], int]:
+    header = compiled.header
+    header_size = header.size
+    size = len(buf)
+    end = size if end is None else end
+    blocks: dict[int, bytearray] = {}
+    # decoder, schema block length and output of every template seen so far
+    templates: dict[int, tuple] = {}
+    pos = start
+    while pos < end:
+        if size - pos < header_size:
+            raise DecodingError(f"Truncated message at offset {pos}")
+        wire_block_length, template_id, _, _ = header.decode(buf, pos)
+        template = templates.get(template_id)
+        if template is None:
+            decoder = compiled.get(template_id)
+            if decoder is None:
+                raise DecodingError(f"Unknown template ID: {template_id}")
+            template = templates[template_id] = (decoder, decoder.block_length, blocks.setdefault(template_id, bytearray()))
+        decoder, block_length, out = template
+        block_start = pos + header_size
+        stop = decoder.skip(buf, block_start, wire_block_length)
+        if stop > size:
+            raise DecodingError(f"Truncated message at offset {pos}")
+        if wire_block_length >= block_length:
+            out += buf[block_start:block_start + block_length]
+        else:
+            out += buf[block_start:block_start + wire_block_length]
+            out += bytes(block_length - wire_block_length)
+        pos = stop
+    return {template_id: bytes(out) for template_id, out in blocks.items()}, pos
+
+
+def root_blocks(compiled: 'CompiledSchema', buf, start: int = 0, end: int | None = None) -> dict[int, bytes]:
+    """
+    Copies root blocks of all messages in the given range of the buffer, grouped by template ID.
+    Blocks of messages encoded with a different block length are truncated or zero padded to the schema block length,
+    so that the blocks of every template can be decoded with a single `np.frombuffer` call.
+
+    Args:
+        compiled (CompiledSchema): The compiled schema.
+        buf: Buffer of back-to-back messages, each preceded by the message header.
+        start (int): Offset of the first message.
+        end (int | None): Offset just after the last message, defaults to the end of the buffer.
+
+    Returns:
+        dict[int, bytes]: Concatenated root blocks by template ID.
+    """
+    return _root_blocks(compiled, buf, start, end)[0]
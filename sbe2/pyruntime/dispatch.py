@@ -0,0 +1,118 @@
+from ..schema import MessageSchema
+from .compiler import CompiledSchema, compile
+from .decoder import MessageHeader
+from .errors import DecodingError
+from .formats import composite_indexes
+from typing import Any, Callable, Iterator
+import struct
+
+# Handles a decoded message
+Handler = Callable[[dict[str, Any]], Any]
+# Handles a message with an unknown template ID. Receives the header, the buffer and the offset of the header,
+# returns the result and the offset just after the message.
+Fallback = Callable[[MessageHeader, Any, int], tuple[Any, int]]
+
+
+def unknown_template(header: MessageHeader, buf, offset: int) -> tuple[Any, int]:
+    raise DecodingError(f"Unknown template ID: {header.template_id}")
+
+
+class Dispatcher:
+    """
+    Decodes messages of mixed types and passes them to handlers registered per message.
+
+    Decoders and handlers are stored in a list indexed directly by the template ID read from the header,
+    so dispatching a message costs a single list access. Schemas with sparse template IDs use a dictionary instead.
+    """
+
+    def __init__(self, schema: MessageSchema | CompiledSchema, fallback: Fallback = unknown_template):
+        self.compiled = schema if isinstance(schema, CompiledSchema) else compile(schema)
+        self.fallback = fallback
+        header = self.compiled.header
+        self._header_struct = header.struct
+        self._header_size = header.size
+        indexes = composite_indexes(self.compiled.schema.header_type)
+        self._template_id_index = indexes['templateId']
+        self._block_length_index = indexes['blockLength']
+        messages = self.compiled.schema.messages
+        dense = messages.dense_table()
+        self._dense = dense is not None
+        self._table: list[tuple[Callable, Handler | None] | None] | dict[int, tuple[Callable, Handler | None]]
+        if dense is not None:
+            self._table = [None if message is None else (self.compiled[message.id].decode_from, None) for message in dense]
+        else:
+            self._table = {message.id: (self.compiled[message.id].decode_from, None) for message in messages}
+
+    def register(self, key: int | str, handler: Handler | None = None):
+        """
+        Registers the handler of a message. Messages without a handler are dispatched as decoded dictionaries.
+        Can be used as a decorator: `@dispatcher.register('Car')`.
+
+        Args:
+            key (int | str): Message ID or name.
+            handler (Handler | None): Function called with the decoded message, its result is returned by `dispatch`.
+        """
+        if handler is None:
+            def decorator(func: Handler) -> Handler:
+                self.register(key, func)
+                return func
+            return decorator
+        decoder = self.compiled[key]
+        self._table[decoder.message.id] = (decoder.decode_from, handler)
+        return handler
+
+    def unregister(self, key: int | str):
+        """
+        Removes the handler of a message.
+
+        Args:
+            key (int | str): Message ID or name.
+        """
+        decoder = self.compiled[key]
+        self._table[decoder.message.id] = (decoder.decode_from, None)
+
+    def dispatch(self, buf, offset: int = 0) -> tuple[Any, int]:
+        """
+        Decodes a message preceded by the message header and passes it to its handler.
+
+        Args:
+            buf: Buffer containing the encoded message.
+            offset (int): Offset of the message header in the buffer.
+
+        Returns:
+            tuple[Any, int]: Result of the handler (the decoded message if there is no handler) and the offset just after the message.
+        """
+        try:
+            values = self._header_struct.unpack_from(buf, offset)
+        except struct.error as e:
+            raise DecodingError(f"Could not decode message header: {e}") from e
+        template_id = values[self._template_id_index]
+        table = self._table
+        if self._dense:
+            entry = table[template_id] if template_id < len(table) else None
+        else:
+            entry = table.get(template_id)
+        if entry is None:
+            return self.fallback(self.compiled.header.decode(buf, offset), buf, offset)
+        decode_from, handler = entry
+        result, end = decode_from(buf, offset + self._header_size, values[self._block_length_index])
+        if handler is not None:
+            result = handler(result)
+        return result, end
+
+    def dispatch_all(self, buf, offset: int = 0) -> Iterator[Any]:
+        """
+        Dispatches back-to-back messages until the end of the buffer.
+
+        Args:
+            buf: Buffer containing the encoded messages.
+            offset (int): Offset of the first message header in the buffer.
+
+        Returns:
+            Iterator[Any]: Results of handlers.
+        """
+        dispatch = self.dispatch
+        size = len(buf)
+        while offset < size:
+            result, offset = dispatch(buf, offset)
+            yield result
@@ -0,0 +1,243 @@
+from ..schema import ByteOrder, Composite, Data, FieldLayout, GroupLayout, MessageLayout
+from .formats import byte_order_prefix, block_fmt, block_formats, composite_format, composite_indexes
+from .errors import EncodingError
+from typing import Any
+import struct
+
+
+class BlockEncoder:
+    """
+    Encodes a fixed size block of fields using a single `pack_into` call.
+    Optionally the block is preceded by a constant prefix, such as the message header.
+    """
+
+    def __init__(self, fields: tuple[FieldLayout, ...], block_length: int, byte_order: ByteOrder, prefix_fmt: str = '', prefix_values: tuple = ()):
+        formats = block_formats(fields)
+        self.block_length = block_length
+        self.struct = struct.Struct(byte_order_prefix(byte_order) + prefix_fmt + block_fmt(formats, block_length))
+        self.size = self.struct.size
+        self._prefix = list(prefix_values)
+        # constant fields do not take any space in the buffer
+        self._fields = [(field_layout.name, element_fmt.encode) for field_layout, element_fmt in formats if element_fmt.count]
+        self._plain = all(enc is None for _, enc in self._fields)
+        self._names = tuple(name for name, _ in self._fields)
+
+    def encode_into(self, buf, offset: int, values: dict[str, Any]) -> int:
+        """
+        Encodes the block.
+
+        Args:
+            buf: Writable buffer, such as `bytearray` or `memoryview`.
+            offset (int): Offset of the block in the buffer.
+            values (dict[str, Any]): Field values by field name.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        if self._plain:
+            raw = self._prefix + [values[name] for name in self._names]
+        else:
+            raw = self._prefix.copy()
+            for name, enc in self._fields:
+                if enc is None:
+                    raw.append(values[name])
+                else:
+                    raw.extend(enc(values[name]))
+        self.struct.pack_into(buf, offset, *raw)
+        return self.size
+
+
+class DataEncoder:
+    """
+    Encodes variable length data.
+    """
+
+    def __init__(self, data: Data, byte_order: ByteOrder):
+        self.name = data.name
+        composite = data.type_
+        header = composite_format(composite)
+        self.struct = struct.Struct(byte_order_prefix(byte_order) + header.fmt)
+        indexes = composite_indexes(composite)
+        if 'length' not in indexes:
+            raise ValueError(f"Data type '{composite.name}' does not contain 'length' element")
+        self._length_index = indexes['length']
+        self._template = list(self.struct.unpack(bytes(self.struct.size)))
+        var_data = next((e for e in composite.elements if e.name == 'varData'), None)
+        self._encoding = getattr(var_data, 'character_encoding', None)
+
+    def encode_into(self, buf, offset: int, value: bytes | str) -> int:
+        """
+        Encodes the data.
+
+        Args:
+            buf: Writable buffer.
+            offset (int): Offset of the data in the buffer.
+            value (bytes | str): The data to encode. Strings are encoded using the character encoding of the data type.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        if isinstance(value, str):
+            value = value.encode(self._encoding or 'utf-8')
+        raw = self._template.copy()
+        raw[self._length_index] = len(value)
+        self.struct.pack_into(buf, offset, *raw)
+        start = offset + self.struct.size
+        end = start + len(value)
+        if end > len(buf):
+            raise EncodingError(f"Data '{self.name}' of length {len(value)} exceeds the buffer")
+        buf[start:end] = value
+        return end - offset
+
+
+class DimensionEncoder:
+    """
+    Encodes the dimension of a repeating group: block length and number of entries.
+    """
+
+    def __init__(self, composite: Composite, byte_order: ByteOrder):
+        fmt = composite_format(composite)
+        self.struct = struct.Struct(byte_order_prefix(byte_order) + fmt.fmt)
+        self.size = self.struct.size
+        indexes = composite_indexes(composite)
+        for name in ('blockLength', 'numInGroup'):
+            if name not in indexes:
+                raise ValueError(f"Dimension type '{composite.name}' does not contain '{name}' element")
+        self._block_length_index = indexes['blockLength']
+        self._num_in_group_index = indexes['numInGroup']
+        self._template = list(self.struct.unpack(bytes(self.size)))
+
+    def encode_into(self, buf, offset: int, block_length: int, num_in_group: int) -> int:
+        """
+        Encodes the dimension.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        raw = self._template.copy()
+        raw[self._block_length_index] = block_length
+        raw[self._num_in_group_index] = num_in_group
+        self.struct.pack_into(buf, offset, *raw)
+        return self.size
+
+
+class GroupEncoder:
+    """
+    Encodes a repeating group from a list of dictionaries.
+    """
+
+    def __init__(self, layout: GroupLayout, byte_order: ByteOrder):
+        group = layout.group
+        self.name = group.name
+        self.dimension = DimensionEncoder(group.dimension_type, byte_order)
+        self.block = BlockEncoder(layout.fields, layout.block_length, byte_order)
+        self.groups = [GroupEncoder(g, byte_order) for g in layout.groups]
+        self.datas = [DataEncoder(d, byte_order) for d in group.datas]
+
+    def encode_into(self, buf, offset: int, entries: list[dict[str, Any]]) -> int:
+        """
+        Encodes the group.
+
+        Args:
+            buf: Writable buffer.
+            offset (int): Offset of the group dimension in the buffer.
+            entries (list[dict[str, Any]]): Entries of the group.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        pos = offset + self.dimension.encode_into(buf, offset, self.block.block_length, len(entries))
+        encode_block = self.block.encode_into
+        for entry in entries:
+            pos += encode_block(buf, pos, entry)
+            for group in self.groups:
+                pos += group.encode_into(buf, pos, entry[group.name])
+            for data in self.datas:
+                pos += data.encode_into(buf, pos, entry[data.name])
+        return pos - offset
+
+
+class MessageEncoder:
+    """
+    Encodes a message (optionally the message header, root block, groups and variable length data)
+    directly into a caller supplied buffer.
+    """
+
+    def __init__(self, layout: MessageLayout, byte_order: ByteOrder, header_fmt: str = '', header_values: tuple = ()):
+        message = layout.message
+        self.message = message
+        self.block = BlockEncoder(layout.fields, layout.block_length, byte_order, header_fmt, header_values)
+        self.groups = [GroupEncoder(g, byte_order) for g in layout.groups]
+        self.datas = [DataEncoder(d, byte_order) for d in message.datas]
+
+    @property
+    def block_length(self) -> int:
+        """
+        Returns the length of the root block in bytes.
+        """
+        return self.block.block_length
+
+    def encode_into(self, buf, offset: int, values: dict[str, Any]) -> int:
+        """
+        Encodes the message.
+
+        Args:
+            buf: Writable buffer, such as `bytearray` or `memoryview`.
+            offset (int): Offset of the message in the buffer.
+            values (dict[str, Any]): The message, in the same form as returned by the decoder.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        try:
+            pos = offset + self.block.encode_into(buf, offset, values)
+            for group in self.groups:
+                pos += group.encode_into(buf, pos, values[group.name])
+            for data in self.datas:
+                pos += data.encode_into(buf, pos, values[data.name])
+        except KeyError as e:
+            raise EncodingError(f"Missing value {e} of message '{self.message.name}'") from e
+        except (struct.error, TypeError, AttributeError) as e:
+            raise EncodingError(f"Could not encode message '{self.message.name}': {e}") from e
+        return pos - offset
+
+
+class HeaderEncoder:
+    """
+    Encodes the message header.
+    """
+
+    def __init__(self, composite: Composite, byte_order: ByteOrder):
+        fmt = composite_format(composite)
+        self.fmt = fmt.fmt
+        self.struct = struct.Struct(byte_order_prefix(byte_order) + fmt.fmt)
+        self.size = self.struct.size
+        self._indexes = composite_indexes(composite)
+        self._template = self.struct.unpack(bytes(self.size))
+
+    def values(self, **elements: int) -> tuple:
+        """
+        Returns the values to pack for the given header elements. Remaining elements are zeroed.
+
+        Args:
+            elements (int): Values of header elements by element name, unknown elements are ignored.
+
+        Returns:
+            tuple: The values to pack using the header format.
+        """
+        raw = list(self._template)
+        for name, value in elements.items():
+            index = self._indexes.get(name)
+            if index is not None:
+                raw[index] = value
+        return tuple(raw)
+
+    def encode_into(self, buf, offset: int = 0, **elements: int) -> int:
+        """
+        Encodes the message header.
+
+        Returns:
+            int: Number of bytes written.
+        """
+        self.struct.pack_into(buf, offset, *self.values(**elements))
+        return self.size
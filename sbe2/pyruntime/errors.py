@@ -0,0 +1,6 @@
+class DecodingError(Exception):
+    """Raised when a buffer cannot be decoded using the compiled schema."""
+
+
+class EncodingError(Exception):
+    """Raised when a message cannot be encoded using the compiled schema."""
@@ -0,0 +1,301 @@
+from ..schema import ByteOrder, FixedLengthElement, Type, Enum, Set, Composite, Ref, Presence, Field, FieldLayout
+from dataclasses import dataclass
+from typing import Any, Callable
+
+# `struct` codes of SBE primitive types, indexed by primitive type name
+STRUCT_CODES: dict[str, str] = {
+    'char': 's',
+    'int8': 'b',
+    'uint8': 'B',
+    'int16': 'h',
+    'uint16': 'H',
+    'int': 'i',
+    'int32': 'i',
+    'uint32': 'I',
+    'int64': 'q',
+    'uint64': 'Q',
+    'float': 'f',
+    'double': 'd',
+}
+
+
+def byte_order_prefix(byte_order: ByteOrder) -> str:
+    """
+    Returns the `struct` format prefix matching the schema byte order.
+
+    Args:
+        byte_order (ByteOrder): The byte order of the schema.
+
+    Returns:
+        str: '<' for little endian and '>' for big endian.
+    """
+    return '>' if byte_order is ByteOrder.BIG_ENDIAN else '<'
+
+
+# Builds a Python value from the unpacked values, starting at the given index
+Decode = Callable[[tuple, int], Any]
+# Converts a Python value into the values to pack
+Encode = Callable[[Any], tuple | list]
+
+
+@dataclass
+class ElementFormat:
+    """
+    Represents a `struct` format fragment of a single fixed length element.
+    """
+    fmt: str  # struct format fragment, without the byte order prefix
+    count: int  # Number of values unpacked by the fragment
+    size: int  # Size of the fragment in bytes
+    decode: Decode | None = None  # None if the single unpacked value is used as it is
+    encode: Encode | None = None  # None if the value is packed as it is
+
+
+def constant_format(value: Any) -> ElementFormat:
+    """
+    Returns a format of a constant element, which does not take any space in the buffer.
+
+    Args:
+        value (Any): The constant value.
+
+    Returns:
+        ElementFormat: Format that always decodes to the given value.
+    """
+    return ElementFormat(fmt='', count=0, size=0, decode=lambda values, index: value, encode=lambda value: ())
+
+
+def type_format(type_: Type) -> ElementFormat:
+    """
+    Returns a format of a Type element.
+
+    Single values are decoded into their Python base types, single characters and character arrays
+    with a `characterEncoding` into strings stripped of trailing NULs, other character and byte arrays
+    into bytes as they are, and other arrays into lists.
+
+    Args:
+        type_ (Type): The type to get the format of.
+
+    Returns:
+        ElementFormat: The format of the type.
+    """
+    if type_.presence is Presence.CONSTANT:
+        return constant_format(type_.const_val)
+    pt = type_.primitive_type
+    length = type_.length
+    code = STRUCT_CODES[pt.name]
+    if length == 0:
+        # variable length data, handled by the data decoder
+        return constant_format(None)
+    if code == 's' or (pt.is_byte and length > 1):
+        encoding = type_.character_encoding or 'ascii'
+        fmt = ElementFormat(
+            fmt=f'{length}s',
+            count=1,
+            size=length,
+            encode=lambda value: (value.encode(encoding) if isinstance(value, str) else value,),
+        )
+        if length == 1 or type_.character_encoding:
+            fmt.decode = lambda values, index: values[index].rstrip(b'\0').decode(encoding)
+        return fmt
+    if length > 1:
+        return ElementFormat(
+            fmt=f'{length}{code}',
+            count=length,
+            size=length * pt.length,
+            decode=lambda values, index: list(values[index:index + length]),
+            encode=tuple,
+        )
+    fmt = ElementFormat(fmt=code, count=1, size=pt.length)
+    if type_.presence is Presence.OPTIONAL:
+        null = type_.effective_null_value
+        if null != null:  # NaN
+            fmt.decode = lambda values, index: None if values[index] != values[index] else values[index]
+        else:
+            fmt.decode = lambda values, index: None if values[index] == null else values[index]
+        fmt.encode = lambda value: (null if value is None else value,)
+    return fmt
+
+
+def enum_format(enum: Enum) -> ElementFormat:
+    """
+    Returns a format of an Enum element. Known values are decoded into valid value names,
+    unknown values are returned as they are.
+
+    Args:
+        enum (Enum): The enum to get the format of.
+
+    Returns:
+        ElementFormat: The format of the enum.
+    """
+    encoding = enum.encoding_type
+    code = STRUCT_CODES[encoding.primitive_type.name]
+    names = {vv.value: vv.name for vv in enum.valid_values}
+    values = {vv.name: vv.value for vv in enum.valid_values}
+    return ElementFormat(
+        fmt='1s' if code == 's' else code,
+        count=1,
+        size=encoding.primitive_type.length,
+        decode=lambda raw, index: names.get(raw[index], raw[index]),
+        encode=lambda value: (values.get(value, value),),
+    )
+
+
+def set_format(set_: Set) -> ElementFormat:
+    """
+    Returns a format of a Set element. Sets are decoded into integer bit masks.
+
+    Args:
+        set_ (Set): The set to get the format of.
+
+    Returns:
+        ElementFormat: The format of the set.
+    """
+    pt = set_.encoding_type.primitive_type
+    return ElementFormat(fmt=STRUCT_CODES[pt.name], count=1, size=pt.length)
+
+
+def composite_format(composite: Composite) -> ElementFormat:
+    """
+    Returns a format of a Composite element. Composites are decoded into dictionaries.
+
+    Args:
+        composite (Composite): The composite to get the format of.
+
+    Returns:
+        ElementFormat: The format of the composite.
+    """
+    fmt = []
+    parts = []
+    count = 0
+    size = 0
+    for element in composite.elements:
+        offset = getattr(element, 'offset', None)
+        if offset is not None:
+            if offset < size:
+                raise ValueError(f"Element '{element.name}' of composite '{composite.name}' overlaps the previous element")
+            fmt.append('x' * (offset - size))
+            size = offset
+        element_fmt = element_format(element)
+        fmt.append(element_fmt.fmt)
+        parts.append((element.name, count, element_fmt))
+        count += element_fmt.count
+        size += element_fmt.size
+    encoded = [(name, element_fmt.encode) for name, _, element_fmt in parts if element_fmt.count]
+
+    def decode(values: tuple, index: int) -> dict[str, Any]:
+        return {
+            name: values[index + start] if element_fmt.decode is None else element_fmt.decode(values, index + start)
+            for name, start, element_fmt in parts
+        }
+
+    def encode(value: dict[str, Any]) -> list:
+        result = []
+        for name, enc in encoded:
+            if enc is None:
+                result.append(value[name])
+            else:
+                result.extend(enc(value[name]))
+        return result
+
+    return ElementFormat(fmt=''.join(fmt), count=count, size=size, decode=decode, encode=encode)
+
+
+def element_format(element: FixedLengthElement) -> ElementFormat:
+    """
+    Returns a format of any fixed length element.
+
+    Args:
+        element (FixedLengthElement): The element to get the format of.
+
+    Returns:
+        ElementFormat: The format of the element.
+    """
+    if isinstance(element, Ref):
+        return element_format(element.type_)
+    if isinstance(element, Type):
+        return type_format(element)
+    if isinstance(element, Enum):
+        return enum_format(element)
+    if isinstance(element, Set):
+        return set_format(element)
+    if isinstance(element, Composite):
+        return composite_format(element)
+    raise TypeError(f"Unsupported element type: {type(element)}")
+
+
+def composite_indexes(composite: Composite) -> dict[str, int]:
+    """
+    Returns indexes of the unpacked values of the composite's scalar elements.
+    This is used to quickly access fields of headers and dimensions without building dictionaries.
+
+    Args:
+        composite (Composite): The composite to index.
+
+    Returns:
+        dict[str, int]: Mapping of element names to indexes of their unpacked values.
+    """
+    result = {}
+    count = 0
+    for element in composite.elements:
+        element_fmt = element_format(element)
+        if element_fmt.count == 1:
+            result[element.name] = count
+        count += element_fmt.count
+    return result
+
+
+def field_format(field: Field) -> ElementFormat:
+    """
+    Returns a format of a message or group field.
+
+    Args:
+        field (Field): The field to get the format of.
+
+    Returns:
+        ElementFormat: The format of the field.
+    """
+    if field.presence is Presence.CONSTANT:
+        value = field.constant_value
+        if isinstance(field.type, Enum):
+            value = next((vv.name for vv in field.type.valid_values if vv.value == value), value)
+        return constant_format(value)
+    return element_format(field.type)
+
+
+def block_formats(fields: tuple[FieldLayout, ...]) -> list[tuple[FieldLayout, ElementFormat]]:
+    """
+    Returns formats of fields of a fixed size block.
+
+    Args:
+        fields (tuple[FieldLayout, ...]): Layouts of fields of the block.
+
+    Returns:
+        list[tuple[FieldLayout, ElementFormat]]: Field layouts with their formats.
+    """
+    result = []
+    for field_layout in fields:
+        element_fmt = field_format(field_layout.field)
+        if element_fmt.size != field_layout.length:
+            raise ValueError(f"Field '{field_layout.name}' is {element_fmt.size} bytes long, but its layout expects {field_layout.length}")
+        result.append((field_layout, element_fmt))
+    return result
+
+
+def block_fmt(formats: list[tuple[FieldLayout, ElementFormat]], block_length: int) -> str:
+    """
+    Returns the `struct` format of a whole block, with padding between fields.
+
+    Args:
+        formats (list[tuple[FieldLayout, ElementFormat]]): Field layouts with their formats.
+        block_length (int): The length of the block.
+
+    Returns:
+        str: The format, without the byte order prefix.
+    """
+    fmt = []
+    pos = 0
+    for field_layout, element_fmt in formats:
+        fmt.append('x' * (field_layout.offset - pos))
+        fmt.append(element_fmt.fmt)
+        pos = field_layout.offset + element_fmt.size
+    fmt.append('x' * (block_length - pos))
+    return ''.join(fmt)
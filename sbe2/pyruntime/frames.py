@@ -0,0 +1,174 @@
+from ..schema import Composite, Enum, FixedLengthElement, MessageLayout, MessageSchema, Presence, Ref, Set, Type
+from .batch import block_dtype
+from .compiler import CompiledSchema, compile
+from .decoder import root_blocks
+from typing import Iterator
+import mmap
+import os
+import numpy as np
+import pandas as pd  # optional dependency, install `sbe2[pandas]`
+
+
+def is_decimal(composite: Composite) -> bool:
+    """
+    Returns True if the composite is a decimal, i.e. it contains `mantissa` and `exponent` elements.
+    """
+    names = {element.name for element in composite.elements}
+    return 'mantissa' in names and 'exponent' in names
+
+
+def null_mask(element: Type, values: np.ndarray) -> np.ndarray | None:
+    """
+    Returns the mask of null values of an optional type, None if the type is not optional.
+    """
+    if element.presence is not Presence.OPTIONAL:
+        return None
+    null = element.effective_null_value
+    if null != null:  # NaN
+        return np.isnan(values)
+    return values == null
+
+
+def decimal_column(composite: Composite, values: np.ndarray) -> np.ndarray:
+    """
+    Converts decimals from mantissa and exponent into floats. Null mantissas are converted into NaN.
+    """
+    elements = {element.name: element.type_ if isinstance(element, Ref) else element for element in composite.elements}
+    mantissa_type = elements['mantissa']
+    exponent_type = elements['exponent']
+    mantissa = values['mantissa'].astype(np.float64)
+    if exponent_type.presence is Presence.CONSTANT:
+        exponent = float(exponent_type.const_val)
+    else:
+        exponent = values['exponent'].astype(np.float64)
+    result = mantissa * np.power(10.0, exponent)
+    mask = null_mask(mantissa_type, values['mantissa'])
+    if mask is not None:
+        result[mask] = np.nan
+    return result
+
+
+def enum_column(enum: Enum, values: np.ndarray) -> pd.Categorical:
+    """
+    Converts raw enum values into a categorical of valid value names. Unknown values are converted into NaN.
+    """
+    codes = np.full(len(values), -1, dtype=np.int32)
+    for code, valid_value in enumerate(enum.valid_values):
+        codes[values == valid_value.value] = code
+    return pd.Categorical.from_codes(codes, categories=[vv.name for vv in enum.valid_values])
+
+
+def type_column(element: Type, values: np.ndarray):
+    """
+    Converts raw values of a Type element: text into strings, optional integers into nullable integers
+    and arrays into one NumPy array per row.
+    """
+    if values.dtype.kind == 'S':
+        if element.length == 1 or element.character_encoding:
+            return np.char.decode(values, element.character_encoding or 'ascii').astype(object)
+        return values.astype(object)
+    values = native(values)
+    if values.ndim > 1:
+        return list(values)
+    mask = null_mask(element, values)
+    if mask is not None and values.dtype.kind in 'iu':
+        return pd.arrays.IntegerArray(values, mask)
+    return values
+
+
+def native(values: np.ndarray) -> np.ndarray:
+    """
+    Converts numbers into the native byte order, which pandas requires.
+    """
+    return values if values.dtype.isnative else values.astype(values.dtype.newbyteorder('='))
+
+
+def element_columns(name: str, element: FixedLengthElement, values: np.ndarray, decimals: bool) -> Iterator[tuple[str, object]]:
+    """
+    Yields columns of an element decoded from raw values of its NumPy dtype.
+    Composites are flattened into one column per element, named by joining names of enclosing elements with dots.
+
+    Args:
+        name (str): Name of the column.
+        element (FixedLengthElement): The element.
+        values (np.ndarray): Raw values of the element.
+        decimals (bool): If True, decimal composites are converted into floats.
+
+    Returns:
+        Iterator[tuple[str, object]]: Column names and values.
+    """
+    if isinstance(element, Ref):
+        element = element.type_
+    if isinstance(element, Composite):
+        if decimals and is_decimal(element):
+            yield name, decimal_column(element, values)
+            return
+        for child in element.elements:
+            if child.name in values.dtype.names:
+                yield from element_columns(f'{name}.{child.name}', child, values[child.name], decimals)
+    elif isinstance(element, Enum):
+        yield name, enum_column(element, values)
+    elif isinstance(element, Set):
+        yield name, native(values)
+    elif isinstance(element, Type):
+        yield name, type_column(element, values)
+    else:
+        raise TypeError(f"Unsupported element type: {type(element)}")
+
+
+def message_frame(layout: MessageLayout, blocks: bytes, byte_order, decimals: bool = False) -> pd.DataFrame:
+    """
+    Decodes concatenated root blocks of a single message into a DataFrame with a single `np.frombuffer` call.
+
+    Args:
+        layout (MessageLayout): The resolved layout of the message.
+        blocks (bytes): Root blocks of messages, each exactly `layout.block_length` bytes long.
+        byte_order (ByteOrder): The byte order of the schema.
+        decimals (bool): If True, decimal composites are converted from mantissa and exponent into floats.
+
+    Returns:
+        pd.DataFrame: One row per message and one column per non-constant field, with composites flattened.
+    """
+    dtype = block_dtype(layout.fields, layout.block_length, byte_order)
+    array = np.frombuffer(blocks, dtype=dtype)
+    columns = {}
+    for field_layout in layout.fields:
+        if field_layout.name in dtype.names:
+            columns.update(element_columns(field_layout.name, field_layout.field.type, array[field_layout.name], decimals))
+    return pd.DataFrame(columns, index=pd.RangeIndex(len(array)))
+
+
+def to_dataframes(source, schema: MessageSchema | CompiledSchema, decimals: bool = False) -> dict[int, pd.DataFrame]:
+    """
+    Decodes back-to-back messages, each preceded by the message header, into one DataFrame per template.
+    Only root blocks are decoded, groups and variable length data are skipped.
+
+    Enum columns are categoricals of valid value names, optional integers are nullable integers
+    and decimal composites are optionally converted into floats.
+
+    Args:
+        source: Buffer of messages, or a path to a capture file which is memory mapped.
+        schema (MessageSchema | CompiledSchema): The schema of messages.
+        decimals (bool): If True, decimal composites (with `mantissa` and `exponent`) are converted into floats.
+
+    Returns:
+        dict[int, pd.DataFrame]: DataFrames by template ID, rows in the order of messages.
+    """
+    compiled = schema if isinstance(schema, CompiledSchema) else compile(schema)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return {}
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+                view = memoryview(mapping)
+                try:
+                    blocks = root_blocks(compiled, view)
+                finally:
+                    view.release()
+    else:
+        blocks = root_blocks(compiled, memoryview(source).cast('B'))
+    message_schema = compiled.schema
+    return {
+        template_id: message_frame(message_schema.layout[template_id], data, message_schema.byte_order, decimals)
+        for template_id, data in sorted(blocks.items())
+    }
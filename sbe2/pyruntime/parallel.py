@@ -0,0 +1,235 @@
+from ..schema import MessageSchema
+from .compiler import CompiledSchema, compile
+from .decoder import _root_blocks
+from .errors import DecodingError
+from .stream import find_frame
+from concurrent.futures import ProcessPoolExecutor
+import mmap
+import os
+import shutil
+
+# Codec of the worker process, compiled once by the pool initializer
+_compiled: CompiledSchema | None = None
+
+
+def _init_worker(schema: MessageSchema):
+    global _compiled
+    _compiled = compile(schema)
+
+
+def _frames(view, start: int, end: int):
+    """
+    Yields `(template_id, message_start, message_end)` of messages starting in the range.
+    """
+    compiled = _compiled
+    pos = start
+    while pos < end:
+        frame = find_frame(compiled, view, pos)
+        if frame is None:
+            raise DecodingError(f"Truncated message at offset {pos}")
+        template_id, stop = frame
+        yield template_id, pos, stop
+        pos = stop
+
+
+def is_boundary(compiled: CompiledSchema, buf, offset: int, confirm: int = 4) -> bool:
+    """
+    Returns True if a message starts at the offset. Headers of the message and of up to `confirm` following messages
+    have to carry the schema ID and known template IDs, and their boundaries have to chain up exactly.
+
+    Args:
+        compiled (CompiledSchema): The compiled schema.
+        buf: Buffer of back-to-back messages, each preceded by the message header.
+        offset (int): The candidate offset.
+        confirm (int): Number of following messages which have to be valid too.
+
+    Returns:
+        bool: True if the offset is very likely a message boundary.
+    """
+    header = compiled.header
+    schema_id = compiled.schema.id
+    size = len(buf)
+    for _ in range(confirm + 1):
+        if offset == size:
+            return True
+        if size - offset < header.size:
+            return False
+        _, template_id, message_schema_id, _ = header.decode(buf, offset)
+        if message_schema_id != schema_id or compiled.get(template_id) is None:
+            return False
+        frame = find_frame(compiled, buf, offset)
+        if frame is None:
+            return False
+        offset = frame[1]
+    return True
+
+
+def resync(compiled: CompiledSchema, buf, start: int, end: int) -> int | None:
+    """
+    Finds the first message boundary in the range, see `is_boundary`.
+
+    Returns:
+        int | None: Offset of the boundary, None if no message starts in the range.
+    """
+    for offset in range(start, end):
+        if is_boundary(compiled, buf, offset):
+            return offset
+    return None
+
+
+def _chunk(path: str, start: int, end: int, exact: bool, process):
+    """
+    Processes messages starting in the byte range of the file, using `process(view, first, end)`.
+    Unless `exact`, the range is first resynchronised to the first message boundary.
+
+    Returns:
+        tuple: Offset of the first message (None if no message starts in the range),
+        offset just after the last message and the result of `process`.
+    """
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+        view = memoryview(mapping)
+        try:
+            first = start if exact else resync(_compiled, view, start, end)
+            if first is None:
+                return None, end, None
+            result, stop = process(view, first, end)
+            return first, stop, result
+        finally:
+            view.release()
+
+
+def _decode_blocks(path: str, start: int, end: int, exact: bool, chunk: int, out_dir: str | None = None):
+    """
+    Copies root blocks of all messages of the chunk, grouped by template ID.
+    """
+    return _chunk(path, start, end, exact, lambda view, first, end: _root_blocks(_compiled, view, first, end))
+
+
+def _split_templates(path: str, start: int, end: int, exact: bool, chunk: int, out_dir: str | None = None):
+    """
+    Copies messages of the chunk into separate files per template ID.
+    """
+    def split(view, first, end):
+        files = {}
+        paths = {}
+        stop = first
+        try:
+            for template_id, pos, stop in _frames(view, first, end):
+                out = files.get(template_id)
+                if out is None:
+                    paths[template_id] = os.path.join(out_dir, f'.{template_id}.{chunk:08d}.part')
+                    out = files[template_id] = open(paths[template_id], 'wb')
+                out.write(view[pos:stop])
+        finally:
+            for out in files.values():
+                out.close()
+        return paths, stop
+    return _chunk(path, start, end, exact, split)
+
+
+def _discard_parts(paths: dict[int, str] | None):
+    for part in (paths or {}).values():
+        os.remove(part)
+
+
+def _run_chunks(executor, task, path: str, size: int, chunk_size: int, out_dir: str | None = None, discard=None):
+    """
+    Runs the task over byte ranges of the file in parallel and yields results of chunks in the order of the file.
+
+    Every worker resynchronises to the first message boundary in its range. A chunk is valid only if it starts exactly
+    where the previous chunk stopped, otherwise the worker synchronised to a false boundary, or a message of
+    the previous chunk extends past the range, and the chunk is processed again from the known boundary.
+    """
+    ranges = [(start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)]
+    futures = [
+        executor.submit(task, path, start, end, start == 0, chunk, out_dir)
+        for chunk, (start, end) in enumerate(ranges)
+    ]
+    expected = 0
+    for chunk, ((_, end), future) in enumerate(zip(ranges, futures)):
+        first, stop, result = future.result()
+        if first != expected:
+            if discard is not None:
+                discard(result)
+            first, stop, result = executor.submit(task, path, expected, end, True, chunk, out_dir).result()
+        expected = stop
+        yield result
+    if expected != size:
+        raise DecodingError(f"Truncated message at offset {expected}")
+
+
+def decode_file_parallel(
+    path: str,
+    schema: MessageSchema,
+    workers: int | None = None,
+    out_dir: str | None = None,
+    chunk_size: int = 64 << 20,
+    root_only: bool = False,
+):
+    """
+    Decodes a capture file of messages preceded by the message header using a pool of processes.
+
+    The file is split into byte ranges and every worker resynchronises its range to a message boundary,
+    so the file is never scanned serially. Every worker process compiles the schema once.
+
+    Only root blocks of messages are decoded, groups and variable length data are not returned.
+    Messages with groups or data raise ValueError unless `root_only` acknowledges that they are dropped.
+
+    Args:
+        path (str): Path to the capture file.
+        schema (MessageSchema): The schema of messages.
+        workers (int | None): Number of worker processes, defaults to the number of CPUs.
+        out_dir (str | None): If given, messages are split into one capture file per message, named after the message.
+        chunk_size (int): Approximate size of a chunk processed by a worker in bytes.
+        root_only (bool): Decode root blocks of messages with groups or variable length data, dropping the rest.
+
+    Returns:
+        dict[int, list[np.ndarray]] | dict[int, str]: Root blocks of messages by template ID, as one NumPy structured
+        array per chunk in the order of the file, which avoids another copy of all blocks,
+        or paths of per message capture files by template ID if `out_dir` is given.
+    Raises:
+        DecodingError: If the file contains an unknown template or ends with an incomplete message.
+        ValueError: If a decoded message has groups or data and `root_only` is False.
+    """
+    size = os.path.getsize(path)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(schema,)) as executor:
+        if out_dir is not None:
+            os.makedirs(out_dir, exist_ok=True)
+            chunks = list(_run_chunks(executor, _split_templates, path, size, chunk_size, out_dir, _discard_parts))
+            return _merge_files(chunks, out_dir, schema)
+
+        from .batch import block_dtype  # requires numpy
+        import numpy as np
+        dtypes = {}
+        result: dict[int, list] = {}
+        for blocks in _run_chunks(executor, _decode_blocks, path, size, chunk_size):
+            for template_id, data in blocks.items():
+                dtype = dtypes.get(template_id)
+                if dtype is None:
+                    message = schema.messages[template_id]
+                    if (message.groups or message.datas) and not root_only:
+                        raise ValueError(f"Message '{message.name}' has groups or data, which are not decoded, pass root_only=True")
+                    message_layout = schema.layout[template_id]
+                    dtype = dtypes[template_id] = block_dtype(message_layout.fields, message_layout.block_length, schema.byte_order)
+                result.setdefault(template_id, []).append(np.frombuffer(data, dtype=dtype))
+    return dict(sorted(result.items()))
+
+
+def _merge_files(chunks: list[dict[int, str]], out_dir: str, schema: MessageSchema) -> dict[int, str]:
+    """
+    Concatenates per chunk files of every template, in the order of chunks.
+    """
+    result = {}
+    chunks = [chunk or {} for chunk in chunks]
+    for template_id in sorted({template_id for chunk in chunks for template_id in chunk}):
+        target = os.path.join(out_dir, f'{schema.messages[template_id].name}.sbe')
+        with open(target, 'wb') as out:
+            for chunk in chunks:
+                part = chunk.get(template_id)
+                if part is None:
+                    continue
+                with open(part, 'rb') as file:
+                    shutil.copyfileobj(file, out)
+                os.remove(part)
+        result[template_id] = target
+    return result
@@ -0,0 +1,107 @@
+from ..schema import MessageSchema
+from .compiler import CompiledSchema, compile
+from .errors import DecodingError
+from typing import Iterator
+
+
+def find_frame(compiled: CompiledSchema, buf, offset: int) -> tuple[int, int] | None:
+    """
+    Finds boundaries of the message starting at the given offset, without decoding its fields.
+
+    Args:
+        compiled (CompiledSchema): The compiled schema.
+        buf: Buffer containing the encoded messages.
+        offset (int): Offset of the message header in the buffer.
+
+    Returns:
+        tuple[int, int] | None: Template ID and the offset just after the message, None if the message is incomplete.
+    """
+    header_decoder = compiled.header
+    if len(buf) - offset < header_decoder.size:
+        return None
+    header = header_decoder.decode(buf, offset)
+    decoder = compiled.get(header.template_id)
+    if decoder is None:
+        raise DecodingError(f"Unknown template ID: {header.template_id}")
+    try:
+        end = decoder.skip(buf, offset + header_decoder.size, header.block_length)
+    except DecodingError:
+        return None
+    if end > len(buf):
+        return None
+    return header.template_id, end
+
+
+class MessageReader:
+    """
+    Splits a stream of messages, each preceded by the message header, into separate messages.
+
+    The source can be any buffer (bytes, bytearray, memoryview, mmap), a binary file or any other object
+    with a `readinto` method, or a socket. Buffers are sliced without copying. Streams are read in bulk
+    into a reusable buffer, so a yielded memoryview is valid only until the next message is requested.
+    Message boundaries are found by reading only headers, group dimensions and lengths of variable length data.
+    """
+
+    def __init__(self, schema: MessageSchema | CompiledSchema, source, buffer_size: int = 1 << 16):
+        self.compiled = schema if isinstance(schema, CompiledSchema) else compile(schema)
+        self._source = source
+        self._buffer_size = buffer_size
+        try:
+            self._view = memoryview(source).cast('B')
+            self._readinto = None
+        except TypeError:
+            self._view = None
+            self._readinto = getattr(source, 'readinto', None) or getattr(source, 'recv_into', None)
+            if self._readinto is None:
+                raise TypeError(f"Unsupported message source: {type(source)}")
+
+    def __iter__(self) -> Iterator[tuple[int, memoryview]]:
+        """
+        Returns an iterator over `(template_id, message)` pairs.
+        The message memoryview includes the message header and can be passed to `CompiledSchema.decode`.
+        """
+        if self._view is not None:
+            return self._iter_buffer()
+        return self._iter_stream()
+
+    def _iter_buffer(self) -> Iterator[tuple[int, memoryview]]:
+        view = self._view
+        offset = 0
+        while offset < len(view):
+            frame = find_frame(self.compiled, view, offset)
+            if frame is None:
+                raise DecodingError(f"Truncated message at offset {offset}")
+            template_id, end = frame
+            yield template_id, view[offset:end]
+            offset = end
+
+    def _iter_stream(self) -> Iterator[tuple[int, memoryview]]:
+        buf = bytearray(self._buffer_size)
+        view = memoryview(buf)
+        start = 0
+        end = 0
+        while True:
+            filled = view[:end]
+            while True:
+                frame = find_frame(self.compiled, filled, start)
+                if frame is None:
+                    break
+                template_id, stop = frame
+                yield template_id, filled[start:stop]
+                start = stop
+            if start:
+                # move the incomplete message to the beginning of the buffer
+                buf[:end - start] = buf[start:end]
+                end -= start
+                start = 0
+            if end == len(buf):
+                # the message does not fit, previously yielded views keep referencing the old buffer
+                buf = bytearray(len(buf) * 2)
+                buf[:end] = view[:end]
+                view = memoryview(buf)
+            read = self._readinto(view[end:])
+            if not read:
+                if end:
+                    raise DecodingError(f"Stream ends with a truncated message of {end} bytes")
+                return
+            end += read
@@ -0,0 +1,289 @@
+from ..schema import ByteOrder, Group, Message, GroupLayout, MessageLayout
+from .decoder import DataDecoder, DimensionDecoder, GroupDecoder
+from .formats import block_formats, byte_order_prefix, ElementFormat
+from typing import Any, ClassVar, Iterator, Self
+import struct
+
+
+class BlockView:
+    """
+    Flyweight over a fixed size block followed by repeating groups and variable length data,
+    i.e. over an encoded message or a single group entry.
+    Fields are decoded lazily at precomputed offsets, only when accessed.
+    The same instance can be re-wrapped over any number of blocks without allocating.
+
+    Subclasses with one property per field, group and data are created by `view_class` and `group_view_class`.
+    Attributes and methods of views are prefixed with `sbe_`, so that they do not clash with names of schema elements.
+    """
+    __slots__ = ('_sbe_buf', '_sbe_offset', '_sbe_block_length', '_sbe_groups')
+
+    sbe_block_length: ClassVar[int]
+    sbe_field_names: ClassVar[tuple[str, ...]] = ()
+    sbe_group_classes: ClassVar[tuple[type['GroupView'], ...]] = ()
+    sbe_group_decoders: ClassVar[tuple[GroupDecoder, ...]] = ()
+    sbe_data_decoders: ClassVar[tuple[DataDecoder, ...]] = ()
+
+    def __init__(self, buf=None, offset: int = 0, block_length: int | None = None):
+        # nested group views are reused, as well as the entries they yield
+        self._sbe_groups = [cls() for cls in self.sbe_group_classes]
+        self.sbe_wrap(buf, offset, block_length)
+
+    def sbe_wrap(self, buf, offset: int = 0, block_length: int | None = None) -> Self:
+        """
+        Points the view at a block. The buffer is not copied.
+
+        Args:
+            buf: Buffer containing the encoded block, preferably a `memoryview`.
+            offset (int): Offset of the block in the buffer.
+            block_length (int | None): Block length read from the message header or the group dimension.
+                Defaults to the schema block length.
+
+        Returns:
+            Self: This view.
+        """
+        self._sbe_buf = buf
+        self._sbe_offset = offset
+        self._sbe_block_length = self.sbe_block_length if block_length is None else block_length
+        return self
+
+    @property
+    def sbe_offset(self) -> int:
+        """
+        Returns the offset of the block in the wrapped buffer.
+        """
+        return self._sbe_offset
+
+    @property
+    def sbe_end(self) -> int:
+        """
+        Returns the offset just after the block, including its groups and variable length data.
+        """
+        buf = self._sbe_buf
+        pos = self._sbe_group_offset(len(self.sbe_group_decoders))
+        for data in self.sbe_data_decoders:
+            pos = data.skip(buf, pos)
+        return pos
+
+    def _sbe_group_offset(self, index: int) -> int:
+        """
+        Returns the offset of the group with the given index, skipping preceding groups without decoding them.
+        """
+        buf = self._sbe_buf
+        pos = self._sbe_offset + self._sbe_block_length
+        for group in self.sbe_group_decoders[:index]:
+            pos = group.skip(buf, pos)
+        return pos
+
+    def _sbe_group(self, index: int) -> 'GroupView':
+        return self._sbe_groups[index].sbe_wrap(self._sbe_buf, self._sbe_group_offset(index))
+
+    def _sbe_data(self, index: int) -> bytes | str:
+        buf = self._sbe_buf
+        pos = self._sbe_group_offset(len(self.sbe_group_decoders))
+        datas = self.sbe_data_decoders
+        for data in datas[:index]:
+            pos = data.skip(buf, pos)
+        return datas[index].decode_from(buf, pos)[0]
+
+    def sbe_to_dict(self) -> dict[str, Any]:
+        """
+        Decodes all fields of the block, without groups and variable length data.
+
+        Returns:
+            dict[str, Any]: Field values by field name.
+        """
+        return {name: getattr(self, name) for name in self.sbe_field_names}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(offset={self._sbe_offset})"
+
+
+class MessageView(BlockView):
+    """
+    Flyweight over an encoded message, starting at its root block.
+    """
+    __slots__ = ()
+
+    sbe_message: ClassVar[Message]
+
+
+class GroupEntryView(BlockView):
+    """
+    Flyweight over a single entry of a repeating group.
+    """
+    __slots__ = ()
+
+    sbe_group: ClassVar[Group]
+
+
+class GroupView:
+    """
+    Lazy view of a repeating group. Iterating yields the same reusable entry flyweight re-wrapped over every entry,
+    so entries must not be stored. Entries are located using the block length from the group dimension,
+    so extra bytes appended to entries by newer schema versions are skipped.
+    """
+    __slots__ = ('_sbe_buf', '_sbe_offset', '_sbe_entry')
+
+    sbe_group: ClassVar[Group]
+    sbe_layout: ClassVar[GroupLayout]
+    sbe_byte_order: ClassVar[ByteOrder]
+    sbe_dimension: ClassVar[DimensionDecoder]
+    sbe_entry_class: ClassVar[type[GroupEntryView]]
+
+    def __init__(self, buf=None, offset: int = 0):
+        self._sbe_buf = buf
+        self._sbe_offset = offset
+        self._sbe_entry = self.sbe_entry_class()
+
+    def sbe_wrap(self, buf, offset: int = 0) -> Self:
+        """
+        Points the view at the group dimension. The buffer is not copied.
+
+        Returns:
+            Self: This view.
+        """
+        self._sbe_buf = buf
+        self._sbe_offset = offset
+        return self
+
+    @property
+    def sbe_offset(self) -> int:
+        """
+        Returns the offset of the group dimension in the wrapped buffer.
+        """
+        return self._sbe_offset
+
+    @property
+    def sbe_entry_block_length(self) -> int:
+        """
+        Returns the block length of entries, read from the group dimension.
+        """
+        return self.sbe_dimension.decode(self._sbe_buf, self._sbe_offset)[0]
+
+    def __len__(self) -> int:
+        """
+        Returns the number of entries, read from the group dimension.
+        """
+        return self.sbe_dimension.decode(self._sbe_buf, self._sbe_offset)[1]
+
+    def __iter__(self) -> Iterator[GroupEntryView]:
+        buf = self._sbe_buf
+        dimension = self.sbe_dimension
+        block_length, num_in_group = dimension.decode(buf, self._sbe_offset)
+        pos = self._sbe_offset + dimension.size
+        entry = self._sbe_entry
+        plain = not entry.sbe_group_decoders and not entry.sbe_data_decoders
+        for _ in range(num_in_group):
+            entry.sbe_wrap(buf, pos, block_length)
+            yield entry
+            pos = pos + block_length if plain else entry.sbe_end
+
+    @property
+    def sbe_end(self) -> int:
+        """
+        Returns the offset just after the group.
+        """
+        return self._sbe_entry.sbe_group_decoder.skip(self._sbe_buf, self._sbe_offset)
+
+    def sbe_to_array(self):
+        """
+        Decodes all entries into a NumPy structured array with a single `np.frombuffer` call, see `decode_group_batch`.
+        Entries must contain only fixed size fields. Requires the optional `numpy` dependency.
+
+        Returns:
+            np.ndarray: Structured array of entries, a view of the wrapped buffer.
+        """
+        from .batch import decode_group_batch
+        return decode_group_batch(self._sbe_buf, self.sbe_layout, self.sbe_byte_order, self._sbe_offset)[0]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(offset={self._sbe_offset})"
+
+
+def field_property(offset: int, element_fmt: ElementFormat, prefix: str) -> property:
+    """
+    Creates a property decoding a single field at the given offset of the wrapped block.
+    Fields past the end of a block shorter than the schema block, e.g. encoded by an older schema version, are None.
+    """
+    if element_fmt.count == 0:
+        value = element_fmt.decode((), 0)
+        return property(lambda self: value)
+    unpack_from = struct.Struct(prefix + element_fmt.fmt).unpack_from
+    decode = element_fmt.decode
+    end = offset + element_fmt.size
+    if decode is None:
+        return property(lambda self: None if self._sbe_block_length < end else unpack_from(self._sbe_buf, self._sbe_offset + offset)[0])
+    return property(lambda self: None if self._sbe_block_length < end else decode(unpack_from(self._sbe_buf, self._sbe_offset + offset), 0))
+
+
+def block_namespace(name: str, fields, groups, datas, byte_order: ByteOrder, base: type) -> dict[str, Any]:
+    """
+    Creates class attributes of a block view: properties of fields, groups and variable length data.
+    """
+    prefix = byte_order_prefix(byte_order)
+    group_classes = tuple(group_view_class(group, byte_order) for group in groups)
+    namespace: dict[str, Any] = {
+        '__slots__': (),
+        'sbe_field_names': tuple(field_layout.name for field_layout in fields),
+        'sbe_group_classes': group_classes,
+        'sbe_group_decoders': tuple(cls.sbe_entry_class.sbe_group_decoder for cls in group_classes),
+        'sbe_data_decoders': tuple(DataDecoder(data, byte_order) for data in datas),
+    }
+    members = [field_layout.name for field_layout in fields] + [group.name for group in groups] + [data.name for data in datas]
+    for member in members:
+        if hasattr(base, member):
+            raise ValueError(f"Element '{member}' of '{name}' clashes with a view attribute, names starting with 'sbe_' are reserved")
+    for field_layout, element_fmt in block_formats(fields):
+        namespace[field_layout.name] = field_property(field_layout.offset, element_fmt, prefix)
+    for index, group in enumerate(groups):
+        namespace[group.name] = property(lambda self, index=index: self._sbe_group(index))
+    for index, data in enumerate(datas):
+        namespace[data.name] = property(lambda self, index=index: self._sbe_data(index))
+    return namespace
+
+
+def group_view_class(layout: GroupLayout, byte_order: ByteOrder) -> type[GroupView]:
+    """
+    Creates a lazy view class of the repeating group, together with the flyweight class of its entries.
+
+    Args:
+        layout (GroupLayout): Layout of the group.
+        byte_order (ByteOrder): Byte order of the schema.
+
+    Returns:
+        type[GroupView]: Subclass of GroupView yielding entries with a property per field, nested group and data.
+    """
+    group = layout.group
+    namespace = block_namespace(group.name, layout.fields, layout.groups, group.datas, byte_order, GroupEntryView)
+    namespace.update(
+        sbe_group=group,
+        sbe_block_length=layout.block_length,
+        sbe_group_decoder=GroupDecoder(layout, byte_order),
+    )
+    class_name = group.name[:1].upper() + group.name[1:]
+    entry_class = type(f"{class_name}Entry", (GroupEntryView,), namespace)
+    return type(f"{class_name}Group", (GroupView,), {
+        '__slots__': (),
+        'sbe_group': group,
+        'sbe_layout': layout,
+        'sbe_byte_order': byte_order,
+        'sbe_dimension': DimensionDecoder(group.dimension_type, byte_order),
+        'sbe_entry_class': entry_class,
+    })
+
+
+def view_class(layout: MessageLayout, byte_order: ByteOrder) -> type[MessageView]:
+    """
+    Creates a flyweight view class of the message.
+
+    Args:
+        layout (MessageLayout): Layout of the message to create the view class for.
+        byte_order (ByteOrder): Byte order of the schema.
+
+    Returns:
+        type[MessageView]: Subclass of MessageView with a property per field, group and data.
+    """
+    message = layout.message
+    namespace = block_namespace(message.name, layout.fields, layout.groups, message.datas, byte_order, MessageView)
+    namespace.update(sbe_message=message, sbe_block_length=layout.block_length)
+    return type(f"{message.name}View", (MessageView,), namespace)
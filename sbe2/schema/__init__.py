@@ -12,4 +12,6 @@ from .message import Message
 from .message_schema import MessageSchema
 from .group import Group
 from .data import Data
-from .field import Field
\ No newline at end of file
+from .field import Field
+from .layout import FieldLayout, GroupLayout, MessageLayout, SchemaLayout
+from .snapshot import to_snapshot, from_snapshot
@@ -1,6 +1,6 @@
 import enum
 from dataclasses import dataclass
-from typing import ClassVar
+from typing import Any, ClassVar
 
 class Presence(enum.StrEnum):
     'Matches the `presence` attribute in the schema.'
@@ -13,8 +13,28 @@ class ByteOrder(enum.StrEnum):
     BIG_ENDIAN = "bigEndian"
     LITTLE_ENDIAN = "littleEndian"
 
-@dataclass
-class Element:
+class Cached:
+    """
+    Base of slotted schema classes with attributes computed once, on first access.
+
+    A cached attribute is declared as a dataclass field with `field(init=False, repr=False, compare=False)`,
+    so it is a slot which stays unset until it is first accessed. Reading an unset slot falls back to `__getattr__`,
+    which stores the result of the `_compute_<name>` method in the slot. Later reads access the slot directly.
+    Deleting the attribute invalidates the cached value.
+    """
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        compute = getattr(type(self), f'_compute_{name}', None)
+        if compute is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        value = compute(self)
+        setattr(self, name, value)
+        return value
+
+
+@dataclass(slots=True)
+class Element(Cached):
     name: str
     description: str
     
@@ -32,7 +52,7 @@ class TypeKind(enum.StrEnum):
     REF = "ref"
     
     
-@dataclass
+@dataclass(slots=True)
 class FixedLengthElement(Element):
     """
     Represents an element with a fixed length in bytes.
@@ -42,10 +62,9 @@ class FixedLengthElement(Element):
     
     type_kind: ClassVar[TypeKind] = None
    
-    @property
-    def total_length(self) -> int: # pragma: no cover
+    def _compute_total_length(self) -> int: # pragma: no cover
         """
-        Returns the total length of the element in bytes.
+        Returns the total length of the element in bytes, cached in the `total_length` attribute.
         This is a placeholder and should be overridden in subclasses.
         """
         raise NotImplementedError("Subclasses must implement total_length")
@@ -57,3 +76,9 @@ class FixedLengthElement(Element):
         This is a placeholder and should be overridden in subclasses.
         """
         raise NotImplementedError("Subclasses must implement lazy_bind")
+
+    def references(self) -> list[str]:
+        """
+        Returns names of types this element refers to, which `lazy_bind` resolves.
+        """
+        return []
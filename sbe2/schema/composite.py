@@ -1,9 +1,8 @@
 from .common import FixedLengthElement, TypeKind
-from dataclasses import dataclass
-from functools import cached_property
+from dataclasses import dataclass, field
 from typing import override, ClassVar
 
-@dataclass
+@dataclass(slots=True)
 class Composite(FixedLengthElement):
     """
     Represents a composite element in the schema.
@@ -13,20 +12,31 @@ class Composite(FixedLengthElement):
     offset: int|None = None  # Offset in bytes, if applicable
     since_version: int = 0  # Version since this composite is present
     deprecated: int|None = None  # Version this composite was deprecated, if applicable
+    total_length: int = field(init=False, repr=False, compare=False)  # Cached
     
     type_kind: ClassVar[TypeKind] = TypeKind.COMPOSITE
 
-    @cached_property
     @override
-    def total_length(self) -> int:
+    def _compute_total_length(self) -> int:
         """
         Returns the total length of the composite in bytes.
-        This is the sum of the lengths of all contained elements.
+        This is the sum of the lengths of all contained elements, including padding before elements with explicit offsets.
         """
-        # TODO: handle offset of elements
-        return sum(element.total_length for element in self.elements)
+        pos = 0
+        for element in self.elements:
+            offset = getattr(element, 'offset', None)
+            if offset is not None:
+                if offset < pos:
+                    raise ValueError(f"Element '{element.name}' of composite '{self.name}' at offset {offset} overlaps the previous element")
+                pos = offset
+            pos += element.total_length
+        return pos
     
     @override
     def lazy_bind(self, types):
         for element in self.elements:
-            element.lazy_bind(types)
\ No newline at end of file
+            element.lazy_bind(types)
+    
+    @override
+    def references(self):
+        return [name for element in self.elements for name in element.references()]
\ No newline at end of file
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from .composite import Composite
 
-@dataclass
+@dataclass(slots=True)
 class Data:
     """
     Represents a data object in the SBE2 schema.
@@ -1,10 +1,9 @@
 from .common import FixedLengthElement, Element, TypeKind
 from .type import Type
-from dataclasses import dataclass
-from functools import cached_property
+from dataclasses import dataclass, field
 from typing import override, ClassVar
 
-@dataclass
+@dataclass(slots=True)
 class ValidValue(Element):
     """
     Represents a valid value for an enumeration.
@@ -16,7 +15,7 @@ class ValidValue(Element):
     deprecated: int | None = None  # Version this value was deprecated, if applicable
     enum: 'Enum' = None # set lazily during parsing
 
-@dataclass
+@dataclass(slots=True)
 class Enum(FixedLengthElement):
     """
     Represents an enumeration element in the schema.
@@ -30,14 +29,32 @@ class Enum(FixedLengthElement):
     since_version: int = 0  # Version since this enum is present
     deprecated: int|None = None  # Version this enum was deprecated, if applicable  
     offset: int|None = None  # Offset in bytes, if applicable
+    total_length: int = field(init=False, repr=False, compare=False)  # Cached
+    valid_values_by_name: dict[str, ValidValue] = field(init=False, repr=False, compare=False)  # Cached
     
     type_kind: ClassVar[TypeKind] = TypeKind.ENUM
     
-    @cached_property
     @override
-    def total_length(self):
+    def _compute_total_length(self):
         return self.encoding_type.total_length
     
+    def _compute_valid_values_by_name(self) -> dict[str, ValidValue]:
+        return {vv.name: vv for vv in self.valid_values}
+    
+    def valid_value(self, name: str) -> ValidValue:
+        """
+        Returns the valid value with the given name.
+        Raises ValueError if the enum does not contain it.
+        """
+        vv = self.valid_values_by_name.get(name)
+        if vv is None:
+            raise ValueError(f"Enum '{self.name}' does not contain value '{name}'")
+        return vv
+    
     @override
     def lazy_bind(self, types):
-        self.encoding_type = types[self.encoding_type_name]
\ No newline at end of file
+        self.encoding_type = types[self.encoding_type_name]
+    
+    @override
+    def references(self):
+        return [self.encoding_type_name]
\ No newline at end of file
@@ -1,10 +1,9 @@
 from .common import FixedLengthElement, Presence
-from dataclasses import dataclass
-from functools import cached_property
+from dataclasses import dataclass, field
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class Field(FixedLengthElement):
     """
     Represents a field in the SBE schema.
@@ -19,10 +18,14 @@ class Field(FixedLengthElement):
     constant_value: Any = None
     since_version: int = 0
     deprecated: int | None = None
+    semantic_type: str = ""
+    total_length: int = field(init=False, repr=False, compare=False)  # Cached
 
-    @cached_property
-    def total_length(self) -> int:
+    def _compute_total_length(self) -> int:
         """
         Returns the total length of the field, which is the size of the type.
+        Constant fields are not encoded, so their length is 0.
         """
+        if self.presence is Presence.CONSTANT:
+            return 0
         return self.type.total_length
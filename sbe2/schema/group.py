@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from .field import Field
 from .data import Data
 from .type import Type
-@dataclass
+@dataclass(slots=True)
 class Group(Element):
     id: int
     fields: list[Field]
@@ -0,0 +1,176 @@
+from .field import Field
+from .group import Group
+from .message import Message
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class FieldLayout:
+    """
+    Position of a field in a fixed size block of a message or a group entry.
+    """
+    field: Field
+    offset: int  # Offset in bytes from the beginning of the block
+    length: int  # Encoded length in bytes, 0 for constants
+
+    @property
+    def name(self) -> str:
+        return self.field.name
+
+
+@dataclass(frozen=True, slots=True)
+class GroupLayout:
+    """
+    Layout of a repeating group.
+    """
+    group: Group
+    dimension_length: int  # Length of the dimension composite in bytes
+    block_length: int  # Length of the fixed size part of a single entry in bytes
+    fields: tuple[FieldLayout, ...]
+    groups: tuple["GroupLayout", ...]
+
+    @property
+    def name(self) -> str:
+        return self.group.name
+
+
+@dataclass(frozen=True, slots=True)
+class MessageLayout:
+    """
+    Layout of a message.
+    """
+    message: Message
+    block_length: int  # Length of the root block in bytes
+    fields: tuple[FieldLayout, ...]
+    groups: tuple[GroupLayout, ...]
+
+    @property
+    def name(self) -> str:
+        return self.message.name
+
+
+def align(offset: int, alignment: int | None) -> int:
+    """
+    Rounds the offset up to a multiple of the alignment.
+
+    Args:
+        offset (int): The offset to align.
+        alignment (int | None): The alignment in bytes, None or 0 for no alignment.
+
+    Returns:
+        int: The aligned offset.
+    """
+    if not alignment:
+        return offset
+    return (offset + alignment - 1) // alignment * alignment
+
+
+def resolve_fields(fields: list[Field], block_length: int | None = None, alignment: int | None = None) -> tuple[tuple[FieldLayout, ...], int]:
+    """
+    Computes offsets of fields in a fixed size block.
+    Fields without an explicit offset follow the previous field, aligned to the field alignment if defined.
+
+    Args:
+        fields (list[Field]): Fields of the block.
+        block_length (int | None): Explicit block length, if defined in the schema.
+        alignment (int | None): Alignment of the block length, used only if the block length is not explicit.
+
+    Returns:
+        tuple[tuple[FieldLayout, ...], int]: Layouts of fields and the length of the block.
+    """
+    result = []
+    pos = 0
+    for field in fields:
+        if field.offset is not None:
+            if field.offset < pos:
+                raise ValueError(f"Field '{field.name}' at offset {field.offset} overlaps the previous field ending at {pos}")
+            pos = field.offset
+        else:
+            pos = align(pos, field.alignment)
+        length = field.total_length
+        result.append(FieldLayout(field=field, offset=pos, length=length))
+        pos += length
+    if block_length is not None:
+        if block_length < pos:
+            raise ValueError(f"Block length {block_length} is smaller than the length of fields: {pos}")
+        pos = block_length
+    else:
+        pos = align(pos, alignment)
+    return tuple(result), pos
+
+
+def resolve_group(group: Group) -> GroupLayout:
+    """
+    Computes the layout of a repeating group and all its nested groups.
+
+    Args:
+        group (Group): The group to resolve.
+
+    Returns:
+        GroupLayout: The layout of the group.
+    """
+    fields, block_length = resolve_fields(group.fields, group.block_length)
+    return GroupLayout(
+        group=group,
+        dimension_length=group.dimension_type.total_length,
+        block_length=block_length,
+        fields=fields,
+        groups=tuple(resolve_group(g) for g in group.groups),
+    )
+
+
+def resolve_message(message: Message) -> MessageLayout:
+    """
+    Computes the layout of a message and all its groups.
+
+    Args:
+        message (Message): The message to resolve.
+
+    Returns:
+        MessageLayout: The layout of the message.
+    """
+    fields, block_length = resolve_fields(message.fields, message.block_length, message.alignment)
+    return MessageLayout(
+        message=message,
+        block_length=block_length,
+        fields=fields,
+        groups=tuple(resolve_group(g) for g in message.groups),
+    )
+
+
+class SchemaLayout:
+    """
+    Layouts of all messages of a schema, computed once.
+    """
+
+    def __init__(self, messages):
+        self._by_id: dict[int, MessageLayout] = {}
+        self._by_name: dict[str, MessageLayout] = {}
+        for message in messages:
+            layout = resolve_message(message)
+            self._by_id[message.id] = layout
+            self._by_name[message.name] = layout
+
+    def __getitem__(self, key: int | str) -> MessageLayout:
+        """
+        Returns MessageLayout by message ID or name.
+        Raises KeyError if not found.
+        """
+        if isinstance(key, str):
+            return self._by_name[key]
+        if isinstance(key, int):
+            return self._by_id[key]
+        key_type = type(key)
+        raise KeyError(f"Unrecognized message key type: '{key_type}'")
+
+    def __iter__(self):
+        """
+        Returns an iterator over the message layouts.
+        """
+        return iter(self._by_id.values())
+
+    def __len__(self) -> int:
+        """
+        Returns the number of message layouts.
+        """
+        return len(self._by_id)
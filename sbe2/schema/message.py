@@ -5,7 +5,7 @@ from .group import Group
 from .data import Data
 
 
-@dataclass
+@dataclass(slots=True)
 class Message(Element):
     """
     Represents a message in the SBE schema.
@@ -1,11 +1,12 @@
 from dataclasses import dataclass, field
 from .types import Types
 from .messages import Messages
-from .common import ByteOrder
-from.composite import Composite
+from .common import ByteOrder, Cached
+from .composite import Composite
+from .layout import SchemaLayout
 
-@dataclass
-class MessageSchema:
+@dataclass(slots=True)
+class MessageSchema(Cached):
     """
     Represents the SBE schema.
     """
@@ -18,4 +19,17 @@ class MessageSchema:
     byte_order: ByteOrder = ByteOrder.LITTLE_ENDIAN
     types: Types = field(default_factory=Types)
     messages: Messages = field(default_factory=Messages)
-    description: str = ""
\ No newline at end of file
+    description: str = ""
+    layout: SchemaLayout = field(init=False, repr=False, compare=False)  # Cached
+
+    def __reduce__(self):
+        # pickled as a compact snapshot, which is much faster to restore than the object graph
+        from .snapshot import from_snapshot, to_snapshot
+        return from_snapshot, (to_snapshot(self),)
+
+    def _compute_layout(self) -> SchemaLayout:
+        """
+        Returns offsets, block lengths and group entry lengths of all messages.
+        This is computed once, the first time it is accessed, after the schema is fully parsed.
+        """
+        return SchemaLayout(self.messages)
\ No newline at end of file
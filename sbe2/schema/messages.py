@@ -1,15 +1,41 @@
 from .message import Message
+from .common import FixedLengthElement
+from .field import Field
+from .data import Data
+from typing import Callable
+
+# The dense table of messages is used only if it is at most this many times longer than the number of messages,
+# or not longer than DENSE_TABLE_MIN_LENGTH
+DENSE_TABLE_RATIO = 4
+DENSE_TABLE_MIN_LENGTH = 64
+
+
+class LazyMessage:
+    """
+    Placeholder of a message which is parsed on first access.
+    """
+    __slots__ = ('id', 'name', 'load')
+
+    def __init__(self, id: int, name: str, load: Callable[[], Message]):
+        self.id = id
+        self.name = name
+        self.load = load
+
 
 class Messages:
     """
     Collection of parsed message schemas
     """
-    
+
     def __init__(self):
-        self._by_id:dict[int, Message] = {}
-        self._by_name:dict[str, Message] = {}
-    
-    def add(self, msg: Message):
+        self._by_id:dict[int, Message | LazyMessage] = {}
+        self._by_name:dict[str, Message | LazyMessage] = {}
+        # secondary indexes, built on first use and dropped whenever a message is added
+        self._users: dict[str, list[Message]] | None = None
+        self._semantic_types: dict[str, list[tuple[Message, Field | Data]]] = {}
+        self._dimension_types: list[FixedLengthElement] = []
+
+    def add(self, msg: Message | LazyMessage):
         """
         Adds message to the collection
         """
@@ -19,40 +45,142 @@ class Messages:
             raise ValueError(f"Message with name '{msg.name}' is already defined")
         self._by_id[msg.id] = msg
         self._by_name[msg.name] = msg
-        
-        
+        self._users = None
+
+    def add_lazy(self, id: int, name: str, load: Callable[[], Message]):
+        """
+        Adds a message which is created by `load` when it is accessed for the first time.
+        Iterating the collection loads all messages.
+        """
+        self.add(LazyMessage(id, name, load))
+
+    def _load(self, lazy: LazyMessage) -> Message:
+        msg = self._by_id[lazy.id]
+        if msg is not lazy:
+            return msg  # loaded concurrently
+        msg = lazy.load()
+        if msg.id != lazy.id or msg.name != lazy.name:
+            raise ValueError(f"Loaded message '{msg.name}' ({msg.id}) does not match '{lazy.name}' ({lazy.id})")
+        # replacing existing keys keeps the order of messages
+        self._by_id[msg.id] = msg
+        self._by_name[msg.name] = msg
+        return msg
+
+    def is_loaded(self, key: int|str) -> bool:
+        """
+        Returns True if the message was already parsed, False if it is loaded on first access.
+        Raises KeyError if not found.
+        """
+        msg = self._by_name[key] if isinstance(key, str) else self._by_id[key]
+        return type(msg) is not LazyMessage
+
     def __iter__(self):
         """
         Returns an iterator over the messages in the collection.
         """
-        return iter(self._by_id.values())
-        
-        
+        for msg in list(self._by_id.values()):
+            yield self._load(msg) if type(msg) is LazyMessage else msg
+
+
     def __getitem__(self, key: int|str) -> Message:
         """
         Returns Message by ID or name.
         Raises KeyError if not found.
         """
         if isinstance(key, str):
-            return self._by_name[key]
-        if isinstance(key, int):
-            return self._by_id[key]
-        key_type = type(key)
-        raise KeyError(f"Unrecognized message key type: '{key_type}'")
-    
+            msg = self._by_name[key]
+        elif isinstance(key, int):
+            msg = self._by_id[key]
+        else:
+            key_type = type(key)
+            raise KeyError(f"Unrecognized message key type: '{key_type}'")
+        return self._load(msg) if type(msg) is LazyMessage else msg
+
     def __len__(self) -> int:
         """
         Returns the number of messages in the collection.
         """
         return len(self._by_id)
-    
 
-    
+
+
     def get(self, key: int|str) -> Message | None:
         """
         Returns Message by ID or name
         """
         if isinstance(key, str):
-            return self._by_name.get(key)
-        if isinstance(key, int):
-            return self._by_id.get(key)
\ No newline at end of file
+            msg = self._by_name.get(key)
+        elif isinstance(key, int):
+            msg = self._by_id.get(key)
+        else:
+            return None
+        return self._load(msg) if type(msg) is LazyMessage else msg
+
+    def _index(self):
+        """
+        Builds secondary indexes in a single pass over all messages, loading lazy messages.
+        """
+        users: dict[str, list[Message]] = {}
+        semantic_types: dict[str, list[tuple[Message, Field | Data]]] = {}
+        dimension_types: dict[int, FixedLengthElement] = {}
+        for msg in self:
+            used: dict[str, None] = {}
+            blocks = [msg]
+            for block in blocks:  # nested groups are appended while iterating
+                for field in block.fields:
+                    used[field.type.name] = None
+                    if field.semantic_type:
+                        semantic_types.setdefault(field.semantic_type, []).append((msg, field))
+                for group in block.groups:
+                    used[group.dimension_type.name] = None
+                    dimension_types.setdefault(id(group.dimension_type), group.dimension_type)
+                    blocks.append(group)
+                for data in block.datas:
+                    used[data.type_.name] = None
+                    if data.semantic_type:
+                        semantic_types.setdefault(data.semantic_type, []).append((msg, data))
+            for name in used:
+                users.setdefault(name, []).append(msg)
+        self._semantic_types = semantic_types
+        self._dimension_types = list(dimension_types.values())
+        self._users = users
+
+    def users(self, type_name: str) -> list[Message]:
+        """
+        Returns messages whose fields, groups or data use the type with the given name directly,
+        including nested groups and dimension types of groups.
+        """
+        if self._users is None:
+            self._index()
+        return self._users.get(type_name, [])
+
+    def by_semantic_type(self, semantic_type: str) -> list[tuple[Message, Field | Data]]:
+        """
+        Returns fields and data of all messages, including nested groups, with the given semantic type,
+        together with their messages.
+        """
+        if self._users is None:
+            self._index()
+        return self._semantic_types.get(semantic_type, [])
+
+    def dimension_types(self) -> list[FixedLengthElement]:
+        """
+        Returns composites used as dimension types of groups of any message.
+        """
+        if self._users is None:
+            self._index()
+        return self._dimension_types
+
+    def dense_table(self) -> list[Message | None] | None:
+        """
+        Returns messages in a list indexed by message ID, with None for unused IDs.
+        Template IDs are usually small integers, so the list allows dispatching messages without hashing.
+        Returns None if the IDs are too sparse for the list, the caller should use a dictionary instead.
+        """
+        length = max(self._by_id, default=-1) + 1
+        if length > max(DENSE_TABLE_MIN_LENGTH, DENSE_TABLE_RATIO * len(self._by_id)):
+            return None
+        table: list[Message | None] = [None] * length
+        for msg in self:
+            table[msg.id] = msg
+        return table
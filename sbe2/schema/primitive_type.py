@@ -1,8 +1,7 @@
-from dataclasses import dataclass
-from functools import cached_property
+from dataclasses import dataclass, field
 from typing import ClassVar
 
-@dataclass
+@dataclass(slots=True)
 class PrimitiveType:
     """
     Represents a primitive type built into SBE.
@@ -13,22 +12,15 @@ class PrimitiveType:
     min_value: int | float | str  # Minimum value for the primitive type
     default_null_value: int | float | str  # Default null value for the primitive type
     base_type: type # Python type equivalent
+    is_byte: bool = field(init=False, repr=False, compare=False)  # True if this primitive type is a byte
     
     by_name: ClassVar[dict[str, "PrimitiveType"]] = {}
-
-    @cached_property
-    def is_byte(self) -> bool:
-        """
-        Returns True if this primitive type is a byte.
-        """
-        return self.length == 1
-    
-    
     
     def __post_init__(self):
         """
-        Post-initialization to register the primitive type by its name.
+        Post-initialization to precompute derived attributes and register the primitive type by its name.
         """
+        self.is_byte = self.length == 1
         if self.name in PrimitiveType.by_name:
             raise ValueError(f"Primitive type '{self.name}' is already registered.") # pragma: no cover
         PrimitiveType.by_name[self.name] = self
@@ -1,9 +1,8 @@
 from .common import FixedLengthElement, TypeKind
-from dataclasses import dataclass
-from functools import cached_property
+from dataclasses import dataclass, field
 from typing import ClassVar
 
-@dataclass
+@dataclass(slots=True)
 class Ref(FixedLengthElement):
     """
     Represents a reference element in the schema.
@@ -13,14 +12,17 @@ class Ref(FixedLengthElement):
     type_name: str
     type_: FixedLengthElement = None  # The type this reference points to. Set lazily
     offset: int|None = None  # Offset in bytes, if applicable
+    total_length: int = field(init=False, repr=False, compare=False)  # Cached
     
     type_kind: ClassVar[TypeKind] = TypeKind.REF
     
-    @cached_property
-    def total_length(self) -> int:
+    def _compute_total_length(self) -> int:
         return self.type_.total_length
     
     
     def lazy_bind(self, types):
         self.type_ = types[self.type_name]
+    
+    def references(self):
+        return [self.type_name]
     
\ No newline at end of file
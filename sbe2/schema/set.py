@@ -1,10 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from .type import Type
-from functools import cached_property
 from .common import Element, FixedLengthElement, TypeKind
 from typing import override, ClassVar
 
-@dataclass
+@dataclass(slots=True)
 class Choice(Element):
     """
     Represents a choice element in the schema.
@@ -16,7 +15,7 @@ class Choice(Element):
     deprecated: int | None = None  # Version this choice was deprecated, if applicable
     
 
-@dataclass
+@dataclass(slots=True)
 class Set(FixedLengthElement):
     """Represents a set element in the schema.
     This is used to define a collection of choices that can be selected.
@@ -28,16 +27,20 @@ class Set(FixedLengthElement):
     offset: int | None = None
     since_version: int = 0
     deprecated: int | None = None
+    total_length: int = field(init=False, repr=False, compare=False)  # Cached
     
-    type_kind: ClassVar[TypeKind] = TypeKind.TYPE
+    type_kind: ClassVar[TypeKind] = TypeKind.SET
     
     
-    @cached_property
     @override
-    def total_length(self) -> int:
+    def _compute_total_length(self) -> int:
         return self.encoding_type.total_length
     
     @override
     def lazy_bind(self, types):
         self.encoding_type = types[self.encoding_type_name]
+    
+    @override
+    def references(self):
+        return [self.encoding_type_name]
     
\ No newline at end of file
@@ -0,0 +1,232 @@
+from .common import ByteOrder, Presence
+from .composite import Composite
+from .data import Data
+from .enum import Enum, ValidValue
+from .field import Field
+from .group import Group
+from .message import Message
+from .message_schema import MessageSchema
+from .primitive_type import PrimitiveType
+from .ref import Ref
+from .set import Set, Choice
+from .type import Type
+from .types import Types
+from .messages import Messages
+from collections import deque
+from dataclasses import fields
+from typing import Any
+import marshal
+
+# Bump whenever classes of the schema model gain, lose or reorder fields
+SNAPSHOT_VERSION = 2
+SNAPSHOT_MAGIC = b'SBE2SNAP'
+
+# Classes of snapshot objects, rows of the object table refer to them by index
+CLASSES: tuple[type, ...] = (Type, Composite, Enum, ValidValue, Set, Choice, Ref, Field, Group, Message, Data)
+CLASS_INDEXES: dict[type, int] = {cls: index for index, cls in enumerate(CLASSES)}
+# Names of constructor fields of every class, cached attributes are not part of the snapshot
+CLASS_FIELDS: tuple[tuple[str, ...], ...] = tuple(tuple(f.name for f in fields(cls) if f.init) for cls in CLASSES)
+SCHEMA_FIELDS = ('package', 'version', 'id', 'semantic_version', 'header_type_name', 'description')
+
+# Kinds of columns and tags of values which are not plain marshal-able scalars
+PLAIN = 'v'  # column of plain scalars
+TAGGED = 'x'  # column of values encoded individually
+REFS = 'R'  # column of lists of references
+REF = 'r'  # index in the object table
+BUILTIN = 'B'  # name of a built-in type shared by all schemas
+LIST = 'l'
+TUPLE = 't'
+PRESENCE = 'p'
+BYTE_ORDER = 'o'
+PRIMITIVE = 'P'  # name of a primitive type
+
+SCALARS = (type(None), bool, int, float, str, bytes)
+
+
+class SnapshotWriter:
+    """
+    Flattens a schema into tables of objects, one per class, stored column by column.
+    References between objects are replaced by indexes of objects.
+    """
+
+    def __init__(self):
+        self.objects: list[Any] = []
+        self._indexes: dict[int, int] = {}
+        self.builtins = {id(type_): type_.name for type_ in Types()}  # built-in types are not copied
+
+    def ref(self, obj: Any) -> int:
+        """
+        Returns the index of the object, assigning a new index to objects seen for the first time.
+        """
+        index = self._indexes.get(id(obj))
+        if index is None:
+            index = self._indexes[id(obj)] = len(self.objects)
+            self.objects.append(obj)
+        return index
+
+    def value(self, value: Any) -> Any:
+        """
+        Encodes a single value into marshal-able form, tagging values which are not plain scalars.
+        """
+        if isinstance(value, Presence):
+            return (PRESENCE, value.value)
+        if isinstance(value, ByteOrder):
+            return (BYTE_ORDER, value.value)
+        if isinstance(value, SCALARS):
+            return value
+        if type(value) in CLASS_INDEXES:
+            name = self.builtins.get(id(value))
+            if name is not None:
+                return (BUILTIN, name)
+            return (REF, self.ref(value))
+        if isinstance(value, PrimitiveType):
+            return (PRIMITIVE, value.name)
+        if isinstance(value, list):
+            return (LIST, [self.value(item) for item in value])
+        if isinstance(value, tuple):
+            return (TUPLE, [self.value(item) for item in value])
+        raise TypeError(f"Cannot snapshot value of type '{type(value).__name__}'")
+
+    def column(self, values: list) -> tuple[str, list]:
+        """
+        Encodes values of a single field of all objects of a class.
+        Columns of plain scalars, or of values with the same tag, are stored without per-value tags.
+        """
+        encoded = [self.value(value) for value in values]
+        if all(type(value) is not tuple for value in encoded):
+            return PLAIN, encoded
+        if all(type(value) is tuple and value[0] == LIST and all(type(item) is tuple and item[0] == REF for item in value[1]) for value in encoded):
+            return REFS, [[item[1] for item in value[1]] for value in encoded]
+        tags = {value[0] if type(value) is tuple else None for value in encoded}
+        if len(tags) == 1 and next(iter(tags)) in (REF, PRESENCE, PRIMITIVE, BUILTIN, BYTE_ORDER):
+            return next(iter(tags)), [value[1] for value in encoded]
+        return TAGGED, encoded
+
+    def tables(self) -> list[tuple[int, list[int], list[tuple[str, list]]]]:
+        """
+        Encodes all referenced objects, including objects referenced while encoding, into per class tables.
+
+        Returns:
+            list: Class index, indexes of objects and columns of every class.
+        """
+        tables = []
+        done = 0
+        # encoding may discover new objects, which are encoded in the next round
+        while done < len(self.objects):
+            by_class: dict[int, list[int]] = {}
+            for index in range(done, len(self.objects)):
+                by_class.setdefault(CLASS_INDEXES[type(self.objects[index])], []).append(index)
+            done = len(self.objects)
+            for class_index, indexes in by_class.items():
+                members = [self.objects[index] for index in indexes]
+                columns = [self.column([getattr(obj, name) for obj in members]) for name in CLASS_FIELDS[class_index]]
+                tables.append((class_index, indexes, columns))
+        return tables
+
+
+def to_snapshot(schema: MessageSchema) -> bytes:
+    """
+    Serialises a schema into a compact, versioned snapshot.
+
+    The snapshot is a set of flat tables of schema objects, one per class, stored column by column,
+    where references between objects are replaced by indexes, serialised using `marshal`.
+    Restoring it is much faster than parsing the XML or unpickling the object graph,
+    so it is suitable for shipping schemas to worker processes.
+
+    Args:
+        schema (MessageSchema): The schema to serialise.
+
+    Returns:
+        bytes: The snapshot.
+    """
+    writer = SnapshotWriter()
+    types = [writer.ref(type_) for type_ in schema.types if id(type_) not in writer.builtins]
+    messages = [writer.ref(message) for message in schema.messages]
+    header_type = writer.value(schema.header_type)
+    tables = writer.tables()
+    payload = (
+        SNAPSHOT_VERSION,
+        tuple(cls.__name__ for cls in CLASSES),
+        CLASS_FIELDS,
+        bytes(CLASS_INDEXES[type(obj)] for obj in writer.objects),
+        tables,
+        types,
+        messages,
+        tuple(getattr(schema, name) for name in SCHEMA_FIELDS),
+        header_type,
+        schema.byte_order.value,
+    )
+    return SNAPSHOT_MAGIC + marshal.dumps(payload)
+
+
+def from_snapshot(data: bytes) -> MessageSchema:
+    """
+    Restores a schema from a snapshot created by `to_snapshot`.
+
+    Args:
+        data (bytes): The snapshot.
+
+    Returns:
+        MessageSchema: The restored schema, equivalent to the serialised one.
+    Raises:
+        ValueError: If the data is not a snapshot or was created by an incompatible version.
+    """
+    if not data.startswith(SNAPSHOT_MAGIC):
+        raise ValueError("Data is not a schema snapshot")
+    try:
+        payload = marshal.loads(memoryview(data)[len(SNAPSHOT_MAGIC):])
+        version, class_names, class_fields, class_indexes, tables, types, messages, schema_values, header_type, byte_order = payload
+    except (EOFError, ValueError, TypeError) as e:
+        raise ValueError(f"Corrupted schema snapshot: {e}") from e
+    if version != SNAPSHOT_VERSION or class_names != tuple(cls.__name__ for cls in CLASSES) or class_fields != CLASS_FIELDS:
+        raise ValueError(f"Unsupported schema snapshot version {version}")
+
+    # all objects are created first, so that references can be resolved regardless of their order and cycles
+    new = [cls.__new__ for cls in CLASSES]
+    objects = [new[index](CLASSES[index]) for index in class_indexes]
+    # tag -> mapping of encoded items to values
+    lookups = {
+        REF: objects,
+        PRESENCE: {presence.value: presence for presence in Presence},
+        BYTE_ORDER: {byte_order.value: byte_order for byte_order in ByteOrder},
+        PRIMITIVE: PrimitiveType.by_name,
+        BUILTIN: {type_.name: type_ for type_ in Types()},
+    }
+
+    def value(encoded: Any) -> Any:
+        if type(encoded) is not tuple:
+            return encoded
+        tag, item = encoded
+        lookup = lookups.get(tag)
+        if lookup is not None:
+            return lookup[item]
+        if tag == LIST:
+            return [value(v) for v in item]
+        if tag == TUPLE:
+            return tuple(value(v) for v in item)
+        raise ValueError(f"Corrupted schema snapshot: unknown tag '{tag}'")
+
+    for class_index, indexes, columns in tables:
+        cls = CLASSES[class_index]
+        members = [objects[index] for index in indexes]
+        for name, (kind, column) in zip(CLASS_FIELDS[class_index], columns):
+            if kind == REFS:
+                column = [list(map(objects.__getitem__, items)) for items in column]
+            elif kind == TAGGED:
+                column = map(value, column)
+            elif kind != PLAIN:
+                column = map(lookups[kind].__getitem__, column)
+            # assigns the whole column through the slot descriptor, without a Python level loop
+            deque(map(getattr(cls, name).__set__, members, column), maxlen=0)
+
+    schema = MessageSchema(**dict(zip(SCHEMA_FIELDS, schema_values)), byte_order=ByteOrder(byte_order))
+    schema.header_type = value(header_type)
+    schema_types = Types()
+    for index in types:
+        schema_types.add(objects[index])
+    schema.types = schema_types
+    schema_messages = Messages()
+    for index in messages:
+        schema_messages.add(objects[index])
+    schema.messages = schema_messages
+    return schema
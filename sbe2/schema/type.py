@@ -1,7 +1,6 @@
 from .common import FixedLengthElement, Presence, TypeKind
 from .primitive_type import PrimitiveType
-from dataclasses import dataclass
-from functools import cached_property
+from dataclasses import dataclass, field
 from typing import Any, override, ClassVar
 
 
@@ -14,12 +13,9 @@ def value_ref_to_valid_value(value_ref:str, types):
     enum = types[enum_name]
     if not isinstance(enum, Enum):
         raise ValueError(f"'{enum_name}' type is not enum")
-    for vv in enum.valid_values:
-        if vv.name == valid_value:
-            return vv
-    raise ValueError(f"Enum '{enum_name}' does not contain value '{valid_value}'")
+    return enum.valid_value(valid_value)
 
-@dataclass
+@dataclass(slots=True)
 class Type(FixedLengthElement):
     """
     Represents a type element in the schema.
@@ -39,11 +35,15 @@ class Type(FixedLengthElement):
     null_value: Any = None  # Value that represents null, if applicable
     max_value: Any = None  # Maximum value for this type, if applicable
     min_value: Any = None  # Minimum value for this type, if applicable
+    # Cached
+    effective_null_value: Any = field(init=False, repr=False, compare=False)
+    effective_max_value: Any = field(init=False, repr=False, compare=False)
+    effective_min_value: Any = field(init=False, repr=False, compare=False)
+    total_length: int = field(init=False, repr=False, compare=False)
     
     type_kind: ClassVar[TypeKind] = TypeKind.TYPE
     
-    @cached_property
-    def effective_null_value(self):
+    def _compute_effective_null_value(self):
         """
         Returns the effective null value for this type.
         If a null_value is defined, it returns that; otherwise, it returns the default value for the primitive type.
@@ -54,8 +54,7 @@ class Type(FixedLengthElement):
             return self.null_value
         return self.primitive_type.default_null_value
     
-    @cached_property
-    def effective_max_value(self):
+    def _compute_effective_max_value(self):
         """
         Returns the effective maximum value for this type.
         If a max_value is defined, it returns that; otherwise, it returns the maximum value for the primitive type.
@@ -64,8 +63,7 @@ class Type(FixedLengthElement):
             return self.max_value
         return self.primitive_type.max_value
     
-    @cached_property
-    def effective_min_value(self):
+    def _compute_effective_min_value(self):
         """
         Returns the effective minimum value for this type.
         If a min_value is defined, it returns that; otherwise, it returns the minimum value for the primitive type.
@@ -86,12 +84,16 @@ class Type(FixedLengthElement):
             else:
                 raise ValueError(f"Type '{self.name}' is constant but does not have any constant value assigned")
     
-    @cached_property
+    def references(self):
+        if self.presence is Presence.CONSTANT and self.value_ref:
+            return [self.value_ref.split('.')[0]]
+        return []
+    
     @override
-    def total_length(self):
+    def _compute_total_length(self):
         if self.presence is Presence.CONSTANT:
             return 0
-        return self.primitive_type.length
+        return self.primitive_type.length * self.length
     
     
     @override
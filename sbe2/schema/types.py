@@ -1,7 +1,8 @@
-from .common import FixedLengthElement
+from .common import FixedLengthElement, TypeKind
 from .builtin import decimal, decimal32, decimal64, int16, int32, int64, int8, uint16, uint32, uint64, float_, double, char, int_, uint8
 from .type import Type
 from .composite import Composite
+from typing import Iterable
 
 
 class Types:
@@ -12,6 +13,9 @@ class Types:
     
     def __init__(self):
         self._types : dict[str: FixedLengthElement] = {}
+        # secondary indexes, built on first use and dropped whenever a type is added
+        self._by_kind: dict[TypeKind, list[FixedLengthElement]] | None = None
+        self._users: dict[str, list[FixedLengthElement]] | None = None
         self.add(decimal)
         self.add(decimal32)
         self.add(decimal64)
@@ -48,6 +52,7 @@ class Types:
         if type_.name in self._types:
             raise ValueError(f"Type '{type_.name}' already exists.")
         self._types[type_.name] = type_
+        self._by_kind = self._users = None
         
     def __getitem__(self, name: str) -> FixedLengthElement:
         """
@@ -59,9 +64,10 @@ class Types:
         Raises:
             KeyError: If the type does not exist.
         """
-        if name not in self._types:
-            raise KeyError(f"Type '{name}' does not exist.")
-        return self._types[name]
+        try:
+            return self._types[name]
+        except KeyError:
+            raise KeyError(f"Type '{name}' does not exist.") from None
     
     def get(self, name: str) -> FixedLengthElement | None:
         """
@@ -78,6 +84,42 @@ class Types:
     def __iter__(self):
         return iter(self._types.values())
     
+    def by_kind(self, kind: TypeKind) -> list[FixedLengthElement]:
+        """
+        Returns types of the given kind, in the order they were added.
+        
+        Args:
+            kind (TypeKind): The kind of types, e.g. `TypeKind.ENUM`.
+        
+        Returns:
+            list[FixedLengthElement]: The types of the kind.
+        """
+        if self._by_kind is None:
+            by_kind = {}
+            for type_ in self._types.values():
+                by_kind.setdefault(type_.type_kind, []).append(type_)
+            self._by_kind = by_kind
+        return self._by_kind.get(kind, [])
+    
+    def users(self, name: str) -> list[FixedLengthElement]:
+        """
+        Returns types which refer to the type with the given name directly,
+        including references of elements nested in composites and valid value references of constants.
+        
+        Args:
+            name (str): Name of the referred type.
+        
+        Returns:
+            list[FixedLengthElement]: The referring types, in the order they were added.
+        """
+        if self._users is None:
+            users = {}
+            for type_ in self._types.values():
+                for referred in dict.fromkeys(type_.references()):
+                    users.setdefault(referred, []).append(type_)
+            self._users = users
+        return self._users.get(name, [])
+    
     
     def get_composite(self, name:str):
         com = self[name]
@@ -89,4 +131,53 @@ class Types:
         type_ = self[name]
         if not isinstance(type_, Type):
             raise ValueError(f"Type '{name}' is not type but '{type(type_)}'")
-        return type_
\ No newline at end of file
+        return type_
+    
+    def bind(self, types: Iterable[FixedLengthElement] | None = None):
+        """
+        Binds types to the types they refer to, see `FixedLengthElement.lazy_bind`.
+        Types are bound in dependency order, every type after the types it refers to,
+        in a single depth first pass which is linear in the number of types and references.
+        
+        Args:
+            types (Iterable[FixedLengthElement] | None): The types to bind, all types of the collection by default.
+                References of other types are followed to detect cycles, but these types are not bound again.
+        Raises:
+            KeyError: If a type refers to a type which does not exist.
+            ValueError: If types refer to each other in a cycle.
+        """
+        types = list(self._types.values() if types is None else types)
+        targets = {id(type_) for type_ in types}
+        done: set[int] = set()
+        for root in types:
+            if id(root) in done:
+                continue
+            references = root.references()
+            if not references:  # most types, bound without visiting
+                done.add(id(root))
+                if id(root) in targets:
+                    root.lazy_bind(self)
+                continue
+            # stack of types being visited, with iterators over the types they refer to
+            path = [root]
+            visiting = {id(root): 0}
+            stack = [iter(references)]
+            while stack:
+                name = next(stack[-1], None)
+                if name is None:
+                    stack.pop()
+                    type_ = path.pop()
+                    del visiting[id(type_)]
+                    done.add(id(type_))
+                    if id(type_) in targets:
+                        type_.lazy_bind(self)
+                    continue
+                referred = self[name]
+                if id(referred) in done:
+                    continue
+                if id(referred) in visiting:
+                    cycle = [type_.name for type_ in path[visiting[id(referred)]:]] + [name]
+                    raise ValueError(f"Types refer to each other in a cycle: {' -> '.join(cycle)}")
+                visiting[id(referred)] = len(path)
+                path.append(referred)
+                stack.append(iter(referred.references()))
@@ -1 +1,5 @@
-from .types import parse_schema
\ No newline at end of file
+from .types import parse_schema
+from .cache import parse_schema_cached, schema_hash, schema_files
+from .stream import parse_schema_stream
+from .bulk import parse_schemas, IncludeCache
+from .session import SchemaSession
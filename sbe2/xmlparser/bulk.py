@@ -0,0 +1,111 @@
+from ..schema import MessageSchema
+from .types import parse_schema_fd
+from lxml.etree import Element, XMLParser, fromstring
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+import hashlib
+import os
+
+
+class IncludeCache:
+    """
+    XInclude loader which parses every distinct included file once.
+
+    Files are addressed by the hash of their content, so files with the same content are parsed once
+    regardless of their paths, and modified files are parsed again.
+    The content of a file is read once while its size and modification time do not change.
+    """
+
+    def __init__(self):
+        self._digests: dict[tuple[str, int, int], str] = {}
+        self._elements: dict[str, Element] = {}
+        self._texts: dict[tuple[str, str], str] = {}
+        self._parser = XMLParser(remove_comments=True)
+        self.loads = 0  # number of files read and parsed
+
+    def _content(self, href: str) -> tuple[str, bytes | None]:
+        """
+        Returns the content digest of the file, and its content if the file had to be read.
+        """
+        stat = os.stat(href)
+        key = (os.path.abspath(href), stat.st_mtime_ns, stat.st_size)
+        digest = self._digests.get(key)
+        if digest is not None:
+            return digest, None
+        with open(href, 'rb') as file:
+            content = file.read()
+        digest = self._digests[key] = hashlib.sha256(content).hexdigest()
+        return digest, content
+
+    def __call__(self, href: str, parse: str, encoding: str | None = None):
+        """
+        Loads an included file, implementing the loader interface of `lxml.ElementInclude`.
+
+        Returns:
+            Element | str: A copy of the root element of an XML file, or the text of a text file.
+        """
+        digest, content = self._content(href)
+        if parse != 'xml':
+            key = (digest, encoding or 'utf-8')
+            text = self._texts.get(key)
+            if text is None:
+                if content is None:
+                    with open(href, 'rb') as file:
+                        content = file.read()
+                text = self._texts[key] = content.decode(key[1])
+            return text
+        element = self._elements.get(digest)
+        if element is None:
+            if content is None:
+                with open(href, 'rb') as file:
+                    content = file.read()
+            element = self._elements[digest] = fromstring(content, parser=self._parser, base_url=href)
+            self.loads += 1
+        # including moves the element into the including document
+        return deepcopy(element)
+
+
+# Include cache of the worker process, shared by all schemas it parses
+_include_cache: IncludeCache | None = None
+
+
+def _init_worker():
+    global _include_cache
+    _include_cache = IncludeCache()
+
+
+def _parse_worker(path: str) -> MessageSchema:
+    with open(path, 'rb') as file:
+        return parse_schema_fd(file, loader=_include_cache)
+
+
+def parse_schemas(paths: list[str], workers: int | None = None) -> list[MessageSchema]:
+    """
+    Parses many schema files using a pool of processes.
+
+    Every worker process parses each distinct file included using XInclude once,
+    which makes parsing many schemas sharing common type files much faster.
+
+    Args:
+        paths (list[str]): Paths to the XML files containing the schemas.
+        workers (int | None): Number of worker processes, defaults to the number of CPUs.
+            With a single worker the schemas are parsed in the calling process.
+
+    Returns:
+        list[MessageSchema]: The parsed schemas, in the order of paths.
+    Raises:
+        SchemaParsingError: If any schema cannot be parsed.
+    """
+    paths = list(paths)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(paths) <= 1:
+        loader = IncludeCache()
+        schemas = []
+        for path in paths:
+            with open(path, 'rb') as file:
+                schemas.append(parse_schema_fd(file, loader=loader))
+        return schemas
+    # several schemas per task, so that workers reuse their include caches with few round trips
+    chunksize = max(1, len(paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        return list(executor.map(_parse_worker, paths, chunksize=chunksize))
@@ -0,0 +1,134 @@
+from ..schema import MessageSchema
+from ..schema.snapshot import SNAPSHOT_VERSION
+from .types import parse_schema
+from lxml.etree import XMLParser, parse
+from os import path as os_path
+import hashlib
+import os
+import pickle
+
+# Bump whenever the parser changes in a way that invalidates cached schemas,
+# changes of the schema model are covered by the snapshot version
+CACHE_VERSION = 4
+XINCLUDE = '{http://www.w3.org/2001/XInclude}include'
+
+
+def schema_files(path: str) -> list[str]:
+    """
+    Returns the schema file and all files it includes, directly or indirectly, using XInclude.
+
+    Args:
+        path (str): Path to the schema file.
+
+    Returns:
+        list[str]: Absolute paths of the files, starting with the schema file.
+    """
+    parser = XMLParser(remove_comments=True)
+    result = []
+    pending = [os_path.abspath(path)]
+    while pending:
+        file_path = pending.pop()
+        if file_path in result:
+            continue
+        result.append(file_path)
+        root = parse(file_path, parser=parser).getroot()
+        base = os_path.dirname(file_path)
+        for include in root.iter(XINCLUDE):
+            href = include.get('href')
+            if href and include.get('parse', 'xml') == 'xml':
+                pending.append(os_path.abspath(os_path.join(base, href)))
+    return result
+
+
+def schema_hash(path: str, files: list[str] | None = None) -> str:
+    """
+    Returns a hash of the content of the schema file and all files it includes.
+
+    Args:
+        path (str): Path to the schema file.
+        files (list[str] | None): The schema file and included files, found by `schema_files` if not given.
+
+    Returns:
+        str: Hexadecimal digest, which changes whenever any of the files changes.
+    """
+    digest = hashlib.sha256(f'sbe2-schema-cache-{CACHE_VERSION}-{SNAPSHOT_VERSION}'.encode())
+    for file_path in schema_files(path) if files is None else files:
+        with open(file_path, 'rb') as file:
+            content = file.read()
+        digest.update(file_path.encode())
+        digest.update(len(content).to_bytes(8, 'little'))
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def write_atomic(path: str, data: bytes):
+    """
+    Writes a file so that concurrent writers never expose a partially written file.
+    """
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+
+
+def cached_files(path: str, manifest_path: str) -> list[str] | None:
+    """
+    Returns the schema file and included files listed in the manifest of a previous parse, None if unknown.
+    """
+    try:
+        with open(manifest_path, encoding='utf-8') as file:
+            files = file.read().splitlines()
+    except (OSError, ValueError):
+        return None
+    return files if files and files[0] == os_path.abspath(path) else None
+
+
+def load_entry(cache_path: str) -> MessageSchema | None:
+    """
+    Returns the schema stored in a cache entry, None if the entry is missing, unreadable or outdated.
+    """
+    try:
+        with open(cache_path, 'rb') as file:
+            return pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+        return None  # outdated snapshots raise ValueError
+
+
+def parse_schema_cached(path: str, cache_dir: str) -> MessageSchema:
+    """
+    Parses an SBE schema from an XML file, reusing the schema previously parsed by any process.
+    Parsed schemas are stored in the cache directory under the hash of the content of all input files,
+    so modifying the schema or any included file invalidates the cache.
+
+    The list of included files is stored in a manifest next to the entries. While none of the listed files
+    changes, the included files cannot change either, so they are hashed without parsing the XML again.
+
+    Args:
+        path (str): Path to the XML file containing the schema.
+        cache_dir (str): Directory of the cache, created if it does not exist.
+
+    Returns:
+        MessageSchema: The parsed schema.
+    Raises:
+        SchemaParsingError: If the schema cannot be parsed.
+    """
+    manifest_path = os_path.join(cache_dir, f'{hashlib.sha256(os_path.abspath(path).encode()).hexdigest()}.files')
+    files = cached_files(path, manifest_path)
+    if files is not None:
+        try:
+            schema = load_entry(os_path.join(cache_dir, f'{schema_hash(path, files)}.pickle'))
+            if schema is not None:
+                return schema
+        except OSError:
+            pass  # a listed file was removed
+    # the schema or an included file changed, which may have changed the included files
+    files = schema_files(path)
+    cache_path = os_path.join(cache_dir, f'{schema_hash(path, files)}.pickle')
+    schema = load_entry(cache_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    if schema is None:
+        schema = parse_schema(path=path)
+        write_atomic(cache_path, pickle.dumps(schema, protocol=pickle.HIGHEST_PROTOCOL))
+    write_atomic(manifest_path, '\n'.join(files).encode('utf-8'))
+    return schema
+
@@ -0,0 +1,142 @@
+from ..schema import FixedLengthElement, Message, MessageSchema
+from .types import get_package, parse_message, parse_message_schema, parse_schema_root, parse_type_node
+from .ctx import ParsingContext
+from lxml.etree import Element, tostring
+
+# Attributes of schema elements which refer to types by name
+REFERENCE_ATTRIBUTES = ('encodingType', 'type', 'dimensionType')
+
+
+def references(node: Element) -> set[str]:
+    """
+    Returns names of types referred to by the element and its children.
+    """
+    names = set()
+    for element in node.iter():
+        for attribute in REFERENCE_ATTRIBUTES:
+            value = element.get(attribute)
+            if value:
+                names.add(value)
+        value_ref = element.get('valueRef')
+        if value_ref:
+            names.add(value_ref.split('.', 1)[0])
+        if element.tag == 'group' and element.get('dimensionType') is None:
+            names.add('groupSizeEncoding')
+    return names
+
+
+def fingerprint(node: Element) -> bytes:
+    """
+    Returns the serialised element, which changes whenever the element or any of its children changes.
+    """
+    return tostring(node, with_tail=False)
+
+
+class SchemaSession:
+    """
+    Parses successive versions of the same schema, for example in a watch loop.
+
+    Types and messages are matched with the previous version by name. Those whose XML,
+    or any type they refer to, did not change are reused rather than parsed and bound again.
+    Schemas returned by the session share the reused objects.
+    """
+
+    def __init__(self):
+        # name -> fingerprint, names of referred types and the parsed object
+        self._types: dict[str, tuple[bytes, set[str], FixedLengthElement]] = {}
+        self._messages: dict[str, tuple[tuple[bytes, str], set[str], Message]] = {}
+        self.changed_types: set[str] = set()  # names of types parsed by the last call of `parse`
+        self.changed_messages: set[str] = set()  # names of messages parsed by the last call of `parse`
+
+    def parse(self, path=None, fd=None, text=None) -> MessageSchema:
+        """
+        Parses the current version of the schema.
+        Args:
+            path (str, optional): Path to the XML file containing the schema.
+            fd (file-like object, optional): File-like object containing the XML data.
+            text (str, optional): String containing the XML data.
+        Returns:
+            MessageSchema: The parsed schema, equivalent to `parse_schema`.
+        Raises:
+            SchemaParsingError: If the schema cannot be parsed. The state of the session is unchanged.
+        """
+        args = sum(1 for arg in (path, fd, text) if arg is not None)
+        if args != 1:
+            raise ValueError("Exactly one of 'path', 'fd', or 'text' must be provided")
+        if path is not None:
+            with open(path, 'rb') as file:
+                root = parse_schema_root(file)
+        elif fd is not None:
+            root = parse_schema_root(fd)
+        else:
+            from io import StringIO
+            root = parse_schema_root(StringIO(text))
+        return self._parse_root(root)
+
+    def _parse_root(self, root: Element) -> MessageSchema:
+        schema = parse_message_schema(root)
+        ctx = ParsingContext(types=schema.types)
+
+        type_nodes = [type_ for types in root.iter('types') for type_ in types]
+        names = {node.get('name') for node in type_nodes}
+        changed = {name for name in self._types if name not in names}  # removed types
+        entries = []
+        for node in type_nodes:
+            name = node.get('name')
+            digest = fingerprint(node)
+            previous = self._types.get(name)
+            if previous is None or previous[0] != digest:
+                changed.add(name)
+                entries.append((node, digest, references(node)))
+            else:
+                entries.append((node, digest, previous[1]))  # references depend only on the XML
+
+        # types referring to changed types, directly or indirectly, are parsed again too
+        dependents: dict[str, list[str]] = {}
+        for node, _, refs in entries:
+            for name in refs:
+                dependents.setdefault(name, []).append(node.get('name'))
+        pending = list(changed)
+        while pending:
+            for name in dependents.get(pending.pop(), ()):
+                if name not in changed:
+                    changed.add(name)
+                    pending.append(name)
+
+        types = {}
+        parsed = []
+        for node, digest, refs in entries:
+            name = node.get('name')
+            if name in changed:
+                type_def = parse_type_node(node)
+                parsed.append(type_def)
+            else:
+                type_def = self._types[name][2]
+            ctx.types.add(type_def)
+            types[name] = (digest, refs, type_def)
+        ctx.types.bind(parsed)
+        schema.header_type = schema.types.get_composite(schema.header_type_name)
+
+        messages = {}
+        changed_messages = set()
+        for node in root.iterfind('.//sbe:message', namespaces=root.nsmap):
+            name = node.get('name')
+            key = (fingerprint(node), get_package(node) or schema.package)
+            previous = self._messages.get(name)
+            if previous is not None and previous[0] == key:
+                refs = previous[1]
+                message = previous[2] if not refs & changed else None
+            else:
+                refs = references(node)
+                message = None
+            if message is None:
+                message = parse_message(node, ctx, schema.package)
+                changed_messages.add(message.name)
+            schema.messages.add(message)
+            messages[name] = (key, refs, message)
+
+        self._types = types
+        self._messages = messages
+        self.changed_types = {type_def.name for type_def in parsed}
+        self.changed_messages = changed_messages
+        return schema
@@ -0,0 +1,134 @@
+from ..schema import MessageSchema
+from .types import parse_message_schema, parse_message, parse_type_node
+from .errors import SchemaParsingError
+from .ctx import ParsingContext
+from lxml.etree import Element, XMLSyntaxError, iterparse
+from os import path as os_path
+
+XINCLUDE = '{http://www.w3.org/2001/XInclude}include'
+TYPE_TAGS = frozenset(('type', 'enum', 'set', 'composite'))
+
+
+def release(element: Element) -> None:
+    """
+    Frees a processed element together with its already processed preceding siblings.
+    """
+    element.clear(keep_tail=False)
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+class StreamingParser:
+    """
+    Parses a schema incrementally, building types and messages as their end tags arrive
+    and freeing processed elements, so that the XML tree is never fully held in memory.
+
+    Types have to be declared before messages, which is the case for all SBE schemas in practice.
+    """
+
+    def __init__(self):
+        self.schema: MessageSchema | None = None
+        self.ctx: ParsingContext | None = None
+        self.message_tag: str | None = None
+        self.bound = False
+        self._including: list[str] = []
+
+    def parse(self, source) -> MessageSchema:
+        """
+        Parses the schema from the source.
+
+        Args:
+            source: Path or binary file-like object containing the XML data.
+
+        Returns:
+            MessageSchema: The parsed schema.
+        """
+        self.feed(source)
+        if self.schema is None:
+            raise SchemaParsingError("Missing 'messageSchema' element")
+        if not self.bound:
+            self.bind()  # schema without messages
+        return self.schema
+
+    def feed(self, source) -> None:
+        """
+        Processes events of a single document, either the schema or an included file.
+        """
+        try:
+            for event, element in iterparse(source, events=('start', 'end'), remove_comments=True):
+                if event == 'start':
+                    if self.schema is None:
+                        self.start_schema(element)
+                    continue
+                tag = element.tag
+                if tag == XINCLUDE:
+                    self.include(element)
+                    release(element)
+                elif tag in TYPE_TAGS and element.getparent() is not None and element.getparent().tag == 'types':
+                    self.add_type(element)
+                    release(element)
+                elif tag == self.message_tag:
+                    self.add_message(element)
+                    release(element)
+                elif tag == 'types':
+                    release(element)
+        except XMLSyntaxError as e:
+            raise SchemaParsingError(f"Invalid schema XML: {e}") from e
+
+    def start_schema(self, element: Element) -> None:
+        self.schema = parse_message_schema(element)
+        self.ctx = ParsingContext(types=self.schema.types)
+        namespace = element.nsmap.get('sbe')
+        self.message_tag = f'{{{namespace}}}message' if namespace else 'message'
+
+    def add_type(self, element: Element) -> None:
+        if self.bound:
+            raise SchemaParsingError(f"Type '{element.get('name')}' is declared after messages, which streaming parsing does not support")
+        self.ctx.types.add(parse_type_node(element))
+
+    def bind(self) -> None:
+        """
+        Resolves references between types, once all of them are parsed.
+        """
+        self.ctx.types.bind()
+        self.schema.header_type = self.schema.types.get_composite(self.schema.header_type_name)
+        self.bound = True
+
+    def add_message(self, element: Element) -> None:
+        if not self.bound:
+            self.bind()
+        self.schema.messages.add(parse_message(element, self.ctx, self.schema.package))
+
+    def include(self, element: Element) -> None:
+        """
+        Streams a file included using XInclude, resolved relative to the including document.
+        """
+        href = element.get('href')
+        if not href or element.get('parse', 'xml') != 'xml' or element.get('xpointer'):
+            raise SchemaParsingError(f"Unsupported XInclude '{href}', only whole XML files can be included")
+        base = element.base
+        file_path = os_path.abspath(os_path.join(os_path.dirname(base) if base else '', href))
+        if file_path in self._including:
+            raise SchemaParsingError(f"Recursive XInclude of '{file_path}'")
+        self._including.append(file_path)
+        try:
+            self.feed(file_path)
+        finally:
+            self._including.pop()
+
+
+def parse_schema_stream(fd) -> MessageSchema:
+    """
+    Parses an SBE schema incrementally using `iterparse`, for very large schemas.
+    Peak memory is proportional to the parsed schema rather than to the XML tree.
+
+    Args:
+        fd: Path or binary file-like object containing the XML data.
+    Returns:
+        MessageSchema: An instance of MessageSchema with parsed attributes, equivalent to `parse_schema`.
+    Raises:
+        SchemaParsingError: If the schema cannot be parsed, or types are declared after messages.
+    """
+    return StreamingParser().parse(fd)
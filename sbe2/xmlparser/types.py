@@ -16,6 +16,7 @@ from ..schema import (
     builtin
 )
 
+from ..schema.type import value_ref_to_valid_value as resolve_value_ref
 from lxml.etree import Element
 from .attributes import (
     parse_name,
@@ -48,6 +49,7 @@ from .errors import SchemaParsingError
 from .ctx import ParsingContext
 from lxml.etree import XMLParser, parse, QName
 from lxml import ElementInclude
+from functools import partial
 from typing import Any
 
 
@@ -408,14 +410,7 @@ def parse_message(node: Element, ctx: ParsingContext, default_package:str) -> Me
     
 def value_ref_to_valid_value(value_ref:str, ctx:ParsingContext) -> ValidValue:
     try:
-        enum_name, valid_value = value_ref.split('.')
-        enum = ctx.types[enum_name]
-        if not isinstance(enum, Enum):
-            raise ValueError(f"'{enum_name}' type is not enum")
-        for vv in enum.valid_values:
-            if vv.name == valid_value:
-                return vv
-        raise ValueError(f"Enum '{enum_name}' does not contain value '{valid_value}'")
+        return resolve_value_ref(value_ref, ctx.types)
     except Exception as e:
         raise SchemaParsingError(f"Invalid value reference: '{value_ref}'") from e
     
@@ -453,6 +448,7 @@ def parse_field(node: Element, ctx: ParsingContext) -> Field:
     deprecated = parse_deprecated(node)
     alignment = parse_alignment(node)
     value_ref = parse_value_ref(node)
+    semantic_type = parse_semantic_type(node)
     text = node.text
     const_val = field_constant_value(value_ref, text, type_, ctx) if presence is Presence.CONSTANT else None
     
@@ -468,6 +464,7 @@ def parse_field(node: Element, ctx: ParsingContext) -> Field:
         alignment=alignment,
         value_ref=value_ref,
         constant_value=const_val,
+        semantic_type=semantic_type,
     )
     
     
@@ -588,19 +585,33 @@ def parse_type_node(node:Element) -> FixedLengthElement:
         case 'composite':
             return parse_composite(node)
 
-def parse_schema_fd(fd) -> MessageSchema:
+def parse_schema_root(fd, loader=None) -> Element:
+    """
+    Parses the XML document of a schema and expands XInclude directives.
+    Args:
+        fd (file-like object): File descriptor containing the XML data.
+        loader (callable, optional): Loader of files included using XInclude, see `lxml.ElementInclude.include`.
+    Returns:
+        Element: The root element of the schema.
+    """
+    parser = XMLParser(remove_comments=True)
+    root = parse(fd, parser=parser).getroot()
+    ElementInclude.include(root, loader=loader)
+    return root
+
+def parse_schema_fd(fd, loader=None, lazy=False) -> MessageSchema:
     """
     Parses an SBE schema from a file descriptor.
     Args:
         fd (file-like object): File descriptor containing the XML data.
+        loader (callable, optional): Loader of files included using XInclude, see `lxml.ElementInclude.include`.
+        lazy (bool, optional): Parse messages on first access, errors in messages are raised only then.
     Returns:
         MessageSchema: An instance of MessageSchema with parsed attributes.
     Raises:
         SchemaParsingError: If the schema cannot be parsed.
     """
-    parser = XMLParser(remove_comments=True)
-    root = parse(fd, parser=parser).getroot()
-    ElementInclude.include(root)
+    root = parse_schema_root(fd, loader=loader)
     schema = parse_message_schema(root)
     
     ctx = ParsingContext(types=schema.types)
@@ -610,38 +621,63 @@ def parse_schema_fd(fd) -> MessageSchema:
             type_def = parse_type_node(type_)
             ctx.types.add(type_def)
     
-    for type_def in ctx.types:
-        type_def.lazy_bind(ctx.types)
+    ctx.types.bind()
         
     schema.header_type = schema.types.get_composite(schema.header_type_name)
     
     for msg in root.iterfind('.//sbe:message', namespaces=root.nsmap):
+        if lazy:
+            load = partial(parse_message, msg, ctx, schema.package)
+            schema.messages.add_lazy(parse_id(msg), parse_name(msg), load)
+            continue
         m = parse_message(msg, ctx, schema.package)
         schema.messages.add(m)
 
     return schema
 
-def parse_schema(path=None, fd=None, text=None) -> MessageSchema:
+def parse_schema(path=None, fd=None, text=None, cache_dir=None, streaming=False, lazy=False) -> MessageSchema:
     """
     Parses an SBE schema from an XML file or string.
     Args:
         path (str, optional): Path to the XML file containing the schema.
         fd (file-like object, optional): File-like object containing the XML data.
         text (str, optional): String containing the XML data.
+        cache_dir (str, optional): Directory of the on-disk cache of parsed schemas, supported only with 'path'
+            and neither with 'streaming' nor with 'lazy'.
+        streaming (bool, optional): Parse incrementally, without holding the whole XML tree in memory.
+        lazy (bool, optional): Parse messages on first access, keeping their XML elements until then.
     Returns:
         MessageSchema: An instance of MessageSchema with parsed attributes.
     Raises:
         SchemaParsingError: If the schema cannot be parsed.
+        ValueError: If the combination of arguments is not supported.
     """
     args = sum(1 for arg in (path, fd, text) if arg is not None)
     if args != 1:
         raise ValueError("Exactly one of 'path', 'fd', or 'text' must be provided")
     
+    if cache_dir is not None:
+        if path is None:
+            raise ValueError("Schema cache requires 'path'")
+        if streaming or lazy:
+            raise ValueError("Schema cache cannot be combined with streaming or lazy parsing")
+        from .cache import parse_schema_cached
+        return parse_schema_cached(path, cache_dir)
+    
+    if streaming:
+        if lazy:
+            raise ValueError("Streaming parsing cannot parse messages lazily")
+        from .stream import parse_schema_stream
+        if text is not None:
+            from io import BytesIO
+            return parse_schema_stream(BytesIO(text.encode()))
+        return parse_schema_stream(path if path is not None else fd)
+    
     if path is not None:
         with open (path, 'rb') as file:
-            return parse_schema_fd(file)
+            return parse_schema_fd(file, lazy=lazy)
     elif fd is not None:
-        return parse_schema_fd(fd)
+        return parse_schema_fd(fd, lazy=lazy)
     elif text is not None:
         from io import StringIO
-        return parse_schema_fd(StringIO(text))
\ No newline at end of file
+        return parse_schema_fd(StringIO(text), lazy=lazy)
\ No newline at end of file
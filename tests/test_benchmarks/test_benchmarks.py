@@ -0,0 +1,16 @@
+from benchmarks.__main__ import main
+import json
+import tempfile
+
+
+def test_benchmarks_quick(tmp_path, monkeypatch):
+    # temporary files of the cases are created in a directory removed after the run
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+    output = tmp_path / 'results.json'
+    assert main(['--quick', '--repeat', '1', '--output', str(output)]) == 0
+    report = json.loads(output.read_text())
+    results = {result['name']: result for result in report['results']}
+    assert 'decode/pyruntime/Car' in results
+    assert all('error' not in result or 'known_failure' in result for result in results.values())
+    assert 'best_s' in results['parse_schema/example-schema.xml']
+    assert [path.name for path in tmp_path.iterdir()] == ['results.json']
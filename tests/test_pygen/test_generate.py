@@ -0,0 +1,170 @@
+from os import path
+from sbe2.xmlparser import parse_schema
+from sbe2.pygen import generate
+from sbe2 import pyruntime
+from pytest import raises
+
+
+def schema_path(file_name) -> str:
+    cur_dir = path.dirname(path.dirname(__file__))
+    return path.join(cur_dir, 'test_xmlparser', 'example_schema', file_name)
+
+
+def load(file_name):
+    schema = parse_schema(schema_path(file_name))
+    namespace = {}
+    exec(compile(generate(schema), '<generated>', 'exec'), namespace)
+    return schema, namespace
+
+
+def make_car(ns):
+    return ns['Car'](
+        serialNumber=1234,
+        modelYear=2013,
+        available=ns['BooleanType'].T,
+        code=ns['Model'].A,
+        someNumbers=[0, 1, 2, 3],
+        vehicleCode='abcdef',
+        extras=ns['OptionalExtras'].sportsPack | ns['OptionalExtras'].cruiseControl,
+        engine=ns['Engine'](
+            capacity=2000,
+            numCylinders=4,
+            maxRpm=9000,
+            manufacturerCode=b'VTI',
+            fuel='Petrol',
+            efficiency=35,
+            boosterEnabled=ns['BooleanType'].T,
+            booster=ns['Booster'](BoostType=ns['BoostType'].KERS, horsePower=200),
+        ),
+        fuelFigures=[
+            ns['CarFuelFigures'](speed=30, mpg=35.5, usageDescription='Urban'),
+            ns['CarFuelFigures'](speed=55, mpg=49.0, usageDescription='Combined'),
+        ],
+        performanceFigures=[
+            ns['CarPerformanceFigures'](octaneRating=95, acceleration=[
+                ns['CarPerformanceFiguresAcceleration'](mph=30, seconds=4.0),
+                ns['CarPerformanceFiguresAcceleration'](mph=60, seconds=7.5),
+            ]),
+        ],
+        manufacturer='Honda',
+        model='Civic VTi',
+        activationCode='abcdef',
+    )
+
+
+def test_generate_car():
+    schema, ns = load('example-schema.xml')
+    car_cls = ns['Car']
+    assert car_cls.TEMPLATE_ID == 1
+    assert car_cls.BLOCK_LENGTH == 45
+    assert car_cls.discountedModel is ns['Model'].C
+    assert hasattr(car_cls, '__slots__')
+    assert ns['MESSAGES'] == {1: car_cls}
+
+    car = make_car(ns)
+    buf = bytearray(256)
+    size = ns['encode_message'](car, buf, 8)
+
+    # generated code and pyruntime agree on the wire format
+    compiled = pyruntime.compile(schema)
+    message, values, end = compiled.decode_from(buf, 8)
+    assert end == 8 + size
+    assert values['vehicleCode'] == 'abcdef'
+    assert values['extras'] == 6
+    assert values['engine']['booster'] == {'BoostType': 'KERS', 'horsePower': 200}
+    assert values['fuelFigures'][1] == {'speed': 55, 'mpg': 49.0, 'usageDescription': 'Combined'}
+    assert values['performanceFigures'][0]['acceleration'][1] == {'mph': 60, 'seconds': 7.5}
+    assert values['activationCode'] == 'abcdef'
+    expected = bytearray(256)
+    assert compiled.encode_into('Car', values, expected, 8) == size
+    assert expected == buf
+
+    decoded, end = ns['decode_message'](buf, 8)
+    assert end == 8 + size
+    assert decoded == car
+
+
+def test_generate_set_ignores_unknown_choices():
+    _, ns = load('example-schema.xml')
+    buf = bytearray(256)
+    size = make_car(ns).encode_into(buf)
+    extras_offset = 8 + 2 + 1 + 1 + 16 + 6
+    buf[extras_offset] = 0xff
+    decoded, end = ns['Car'].decode(buf)
+    assert end == size
+    assert decoded.extras == ns['OptionalExtras'].sunRoof | ns['OptionalExtras'].sportsPack | ns['OptionalExtras'].cruiseControl
+
+
+def test_generate_extension_schema():
+    schema, ns = load('example-extension-schema.xml')
+    car_cls = ns['Car']
+    assert car_cls.BLOCK_LENGTH == schema.layout['Car'].block_length
+
+
+def test_generate_returns_unknown_enum_values():
+    _, ns = load('example-schema.xml')
+    buf = bytearray(256)
+    size = make_car(ns).encode_into(buf)
+    code_offset = 8 + 2 + 1
+    buf[code_offset] = ord('Z')
+    decoded, end = ns['Car'].decode(buf)
+    assert decoded.code == b'Z'
+    # unknown values are encoded as they are
+    encoded = bytearray(256)
+    assert decoded.encode_into(encoded) == size
+    assert encoded == buf
+
+
+def test_generate_checks_var_data_length():
+    _, ns = load('example-schema.xml')
+    buf = bytearray(256)
+    size = make_car(ns).encode_into(buf)
+    with raises(ns['DecodingError'], match="Data 'activationCode' of length 6 exceeds the buffer"):
+        ns['Car'].decode(buf[:size - 1])
+
+
+CLASH_SCHEMA = """<sbe:messageSchema xmlns:sbe="http://fixprotocol.io/2016/sbe" package="p" id="3" version="0" byteOrder="littleEndian">
+    <types>
+        <composite name="messageHeader">
+            <type name="blockLength" primitiveType="uint16"/>
+            <type name="templateId" primitiveType="uint16"/>
+            <type name="schemaId" primitiveType="uint16"/>
+            <type name="version" primitiveType="uint16"/>
+        </composite>
+        <composite name="groupSizeEncoding">
+            <type name="blockLength" primitiveType="uint16"/>
+            <type name="numInGroup" primitiveType="uint16"/>
+        </composite>
+        {types}
+    </types>
+    <sbe:message name="Order" id="1">
+        {fields}
+    </sbe:message>
+</sbe:messageSchema>
+"""
+
+
+def test_generate_rejects_name_clashes():
+    def generate_text(types: str = '', fields: str = '<field name="a" id="1" type="uint32"/>'):
+        return generate(parse_schema(text=CLASH_SCHEMA.format(types=types, fields=fields)))
+
+    with raises(ValueError, match="Element 'decode' of 'Order' clashes with a generated member"):
+        generate_text(fields='<field name="decode" id="1" type="uint32"/>')
+    with raises(ValueError, match="Element 'BLOCK_LENGTH' of 'OrderLegs' clashes"):
+        generate_text(fields="""
+            <group name="legs" id="2" dimensionType="groupSizeEncoding">
+                <field name="BLOCK_LENGTH" id="3" type="uint32"/>
+            </group>""")
+    with raises(ValueError, match="Class of message 'Order' clashes with type 'Order'"):
+        generate_text(types='<composite name="Order"><type name="x" primitiveType="uint8"/></composite>')
+    with raises(ValueError, match="Class of group 'OrderLegs' clashes with type 'OrderLegs'"):
+        generate_text(types='<enum name="OrderLegs" encodingType="uint8"><validValue name="A">1</validValue></enum>', fields="""
+            <group name="legs" id="2" dimensionType="groupSizeEncoding">
+                <field name="a" id="3" type="uint32"/>
+            </group>""")
+    with raises(ValueError, match="Class of type 'struct' clashes with a name of the generated module"):
+        generate_text(types='<composite name="struct"><type name="x" primitiveType="uint8"/></composite>')
+    with raises(ValueError, match="Type 'Side' is defined more than once"):
+        generate_text(types="""
+            <composite name="First"><enum name="Side" encodingType="uint8"><validValue name="Buy">1</validValue></enum></composite>
+            <composite name="Second"><enum name="Side" encodingType="uint8"><validValue name="Sell">2</validValue></enum></composite>""")
@@ -74,19 +74,35 @@ class TestComposite:
 
 def test_render_header():
     got = render_header('description', 1, '1.0.0', ByteOrder.BIG_ENDIAN, datetime.datetime(2023, 10, 1, 12, 0, 0), None)
-    want = """'description'
+    want = '''\'description\'
 
 
 # Generated by sbe2 at: 2023-10-01 12:00:00
 
 
 from dataclasses import dataclass
+from typing import Any, ClassVar
 import enum
+import struct
 
 SBE_VERSION:int = 1
 SBE_SEMANTIC_VERSION:str = '1.0.0'
 SBE_BYTE_ORDER:str = 'big'
-SBE_SCHEMA_FILE:str|None = None"""
+SBE_SCHEMA_FILE:str|None = None
+
+
+class DecodingError(Exception):
+    """Raised when a buffer cannot be decoded."""
+
+
+def _enum(cls, value):
+    """
+    Returns the enum member of the value, or the value itself if it is unknown, e.g. added by a newer schema version.
+    """
+    try:
+        return cls(value)
+    except ValueError:
+        return value'''
     assert got == want
     
     
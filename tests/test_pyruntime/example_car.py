@@ -0,0 +1,43 @@
+"""
+Example schemas and an encoded Car message shared by runtime tests.
+"""
+from os import path
+import struct
+
+
+def schema_path(file_name) -> str:
+    cur_dir = path.dirname(path.dirname(__file__))
+    return path.join(cur_dir, 'test_xmlparser', 'example_schema', file_name)
+
+
+def encode_car() -> bytes:
+    block = struct.pack(
+        '<QHB1s4I6sBHB3sbB1sB',
+        1234, 2013, 1, b'A', 0, 1, 2, 3, b'abcdef', 6,
+        2000, 4, b'VTI', 35, 1, b'K', 200,
+    )
+    fuel_figures = struct.pack('<HH', 6, 2)
+    fuel_figures += struct.pack('<Hf', 30, 35.5) + struct.pack('<I', 5) + b'Urban'
+    fuel_figures += struct.pack('<Hf', 55, 49.0) + struct.pack('<I', 8) + b'Combined'
+    performance = struct.pack('<HH', 1, 1) + struct.pack('<B', 95)
+    performance += struct.pack('<HH', 6, 2) + struct.pack('<Hf', 30, 4.0) + struct.pack('<Hf', 60, 7.5)
+    datas = b''
+    for value in (b'Honda', b'Civic VTi', b'abcdef'):
+        datas += struct.pack('<I', len(value)) + value
+    body = block + fuel_figures + performance + datas
+    header = struct.pack('<HHHH', len(block), 1, 1, 0)
+    return header + body
+
+
+def old_car() -> bytes:
+    """
+    Car encoded by an older producer with a 12 bytes long root block and 2 bytes long fuel figures.
+    """
+    buf = encode_car()
+    start = buf.index(struct.pack('<HH', 6, 2))
+    fuel_figures = struct.pack('<HH', 2, 2)
+    fuel_figures += struct.pack('<H', 30) + struct.pack('<I', 5) + b'Urban'
+    fuel_figures += struct.pack('<H', 55) + struct.pack('<I', 8) + b'Combined'
+    end = start + 4 + 2 * 6 + 4 + 5 + 4 + 8
+    return struct.pack('<HHHH', 12, 1, 1, 0) + buf[8:20] + buf[8 + 45:start] + fuel_figures + buf[end:]
+
@@ -0,0 +1,235 @@
+from sbe2.xmlparser import parse_schema
+from sbe2.pyruntime import compile, DecodingError
+from sbe2.pyruntime.aio import MessageProtocol, DatagramMessageProtocol
+from example_car import schema_path, encode_car
+from pytest import raises
+import asyncio
+
+
+def compiled_car():
+    return compile(parse_schema(schema_path('example-schema.xml')))
+
+
+async def serve(protocol_factory, payload: bytes, chunk: int = 7):
+    protocols = []
+    
+    def factory():
+        protocols.append(protocol_factory())
+        return protocols[-1]
+    
+    loop = asyncio.get_running_loop()
+    server = await loop.create_server(factory, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    _, writer = await asyncio.open_connection('127.0.0.1', port)
+    for i in range(0, len(payload), chunk):
+        writer.write(payload[i:i + chunk])
+        await writer.drain()
+    writer.close()
+    await writer.wait_closed()
+    while not protocols:
+        await asyncio.sleep(0)
+    server.close()
+    return protocols[0]
+
+
+def test_stream_protocol_iterator():
+    compiled = compiled_car()
+    car = encode_car()
+    
+    async def run():
+        protocol = await serve(lambda: MessageProtocol(compiled), car * 5)
+        return [message async for message in protocol]
+    
+    messages = asyncio.run(run())
+    assert len(messages) == 5
+    for message, values in messages:
+        assert message.name == 'Car'
+        assert values['serialNumber'] == 1234
+
+
+def test_stream_protocol_callback_and_batches():
+    compiled = compiled_car()
+    car = encode_car()
+    received = []
+    
+    async def callback(message):
+        received.append(message)
+    
+    async def run():
+        protocol = await serve(lambda: MessageProtocol(compiled, decode=False, callback=callback), car * 4, chunk=len(car) * 2)
+        await protocol.join()
+    
+    asyncio.run(run())
+    assert received == [(1, car)] * 4
+
+
+def test_stream_protocol_backpressure():
+    compiled = compiled_car()
+    car = encode_car()
+    
+    class Transport:
+        paused = False
+        
+        def pause_reading(self):
+            self.paused = True
+        
+        def resume_reading(self):
+            self.paused = False
+    
+    async def run():
+        protocol = MessageProtocol(compiled, decode=False, high_water=3, low_water=1)
+        transport = Transport()
+        protocol.connection_made(transport)
+        protocol.data_received(car * 2)
+        assert not transport.paused
+        protocol.data_received(car * 2)
+        assert transport.paused
+        batches = protocol.batches()
+        assert len(await anext(batches)) == 2
+        assert transport.paused
+        assert len(await anext(batches)) == 2
+        assert not transport.paused
+        protocol.data_received(car[:10])
+        protocol.connection_lost(None)
+        with raises(DecodingError):
+            await anext(batches)
+    
+    asyncio.run(run())
+
+
+class ClosingTransport:
+    closed = False
+    
+    def close(self):
+        self.closed = True
+
+
+def failing_decode(compiled, fail_at: int):
+    """
+    Makes the n-th decoded message fail like a message with an undecodable string.
+    """
+    decode = compiled.decode
+    calls = []
+    
+    def fail(buf, offset=0):
+        calls.append(offset)
+        if len(calls) == fail_at:
+            raise UnicodeDecodeError('utf-8', b'\xff', 0, 1, 'invalid start byte')
+        return decode(buf, offset)
+    
+    compiled.decode = fail
+
+
+def test_stream_protocol_decoding_error():
+    compiled = compiled_car()
+    failing_decode(compiled, 2)
+    car = encode_car()
+    
+    async def run():
+        protocol = MessageProtocol(compiled)
+        transport = ClosingTransport()
+        protocol.connection_made(transport)
+        protocol.data_received(car * 3)
+        assert transport.closed
+        batches = protocol.batches()
+        assert len(await anext(batches)) == 1
+        with raises(UnicodeDecodeError):
+            await anext(batches)
+    
+    asyncio.run(run())
+
+
+def test_callback_error_closes_transport():
+    compiled = compiled_car()
+    car = encode_car()
+    
+    def callback(message):
+        raise ValueError('broken callback')
+    
+    async def run():
+        protocol = MessageProtocol(compiled, callback=callback)
+        transport = ClosingTransport()
+        protocol.connection_made(transport)
+        protocol.data_received(car)
+        with raises(ValueError):
+            await protocol.join()
+        assert transport.closed
+    
+    asyncio.run(run())
+
+
+def test_datagram_protocol():
+    compiled = compiled_car()
+    car = encode_car()
+    
+    async def run():
+        loop = asyncio.get_running_loop()
+        transport, protocol = await loop.create_datagram_endpoint(
+            lambda: DatagramMessageProtocol(compiled, max_queued=100), local_addr=('127.0.0.1', 0))
+        addr = transport.get_extra_info('sockname')
+        sender, _ = await loop.create_datagram_endpoint(asyncio.DatagramProtocol, remote_addr=addr)
+        sender.sendto(car * 2)
+        sender.sendto(car[:20])
+        sender.sendto(car)
+        batches = protocol.batches()
+        first = await anext(batches)
+        second = await anext(batches)
+        sender.close()
+        transport.close()
+        return protocol, first, second
+    
+    protocol, first, second = asyncio.run(run())
+    assert len(first) == 2
+    assert len(second) == 1
+    (message, values), addr = second[0]
+    assert message.name == 'Car'
+    assert values['modelYear'] == 2013
+    assert protocol.dropped == 1
+
+
+def test_stream_protocol_views():
+    compiled = compiled_car()
+    car = encode_car()
+    
+    async def run():
+        protocol = await serve(lambda: MessageProtocol(compiled, views=True), car * 3, chunk=len(car) + 5)
+        return [message async for message in protocol]
+    
+    views = asyncio.run(run())
+    assert len(views) == 3
+    assert len({id(view) for view in views}) == 3  # every queued message has its own view
+    assert [(type(view).__name__, view.serialNumber, view.manufacturer) for view in views] == [('CarView', 1234, 'Honda')] * 3
+    assert all(view.sbe_end - view.sbe_offset == len(car) - compiled.header.size for view in views)
+
+
+def test_single_consumer():
+    compiled = compiled_car()
+    car = encode_car()
+    
+    async def run():
+        protocol = MessageProtocol(compiled, decode=False)
+        first = asyncio.ensure_future(anext(protocol.batches()))
+        await asyncio.sleep(0)
+        with raises(RuntimeError):
+            await anext(protocol.batches())
+        protocol.data_received(car)
+        (template_id, message), = await first
+        assert template_id == 1 and isinstance(message, memoryview) and message == car
+        # a consumer may wait again once the previous one is done
+        second = asyncio.ensure_future(anext(protocol.batches()))
+        await asyncio.sleep(0)
+        protocol.data_received(car)
+        assert len(await second) == 1
+    
+    asyncio.run(run())
+
+
+def test_datagram_protocol_decoding_error():
+    compiled = compiled_car()
+    failing_decode(compiled, 2)
+    car = encode_car()
+    protocol = DatagramMessageProtocol(compiled)
+    protocol.datagram_received(car * 2, ('127.0.0.1', 1))
+    protocol.datagram_received(car, ('127.0.0.1', 1))
+    assert protocol.dropped == 1
+    assert protocol.queued == 1
@@ -0,0 +1,147 @@
+from sbe2.xmlparser import parse_schema
+from sbe2.pyruntime import compile
+from sbe2.pyruntime.arrow import arrow_schema, RecordBatchBuilder, record_batches, write_parquet
+from sbe2.pyruntime.errors import DecodingError
+from example_car import schema_path, encode_car
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pytest import raises
+import io
+
+
+def test_arrow_schema_car():
+    schema = parse_schema(schema_path('example-schema.xml'))
+    arrow = arrow_schema(schema.messages['Car'])
+    assert arrow.metadata == {b'sbe.message': b'Car', b'sbe.template_id': b'1'}
+    assert arrow.field('serialNumber').type == pa.uint64()
+    assert arrow.field('available').type == pa.dictionary(pa.int8(), pa.string())
+    assert arrow.field('someNumbers').type == pa.list_(pa.uint32(), 4)
+    assert arrow.field('vehicleCode').type == pa.string()
+    assert arrow.field('engine.manufacturerCode').type == pa.binary(3)
+    assert arrow.field('extras').type == pa.uint8()
+    assert arrow.field('engine.capacity').type == pa.uint16()
+    assert arrow.field('engine.fuel').type == pa.string()
+    assert arrow.field('engine.booster.BoostType').type == pa.dictionary(pa.int8(), pa.string())
+    assert 'engine' not in arrow.names
+    assert arrow.field('fuelFigures').type == pa.list_(pa.struct([
+        ('speed', pa.uint16()), ('mpg', pa.float32()), ('usageDescription', pa.string()),
+    ]))
+    assert arrow.field('manufacturer').type == pa.string()
+
+
+def test_record_batch_builder():
+    schema = parse_schema(schema_path('example-schema.xml'))
+    compiled = compile(schema)
+    builder = RecordBatchBuilder(schema.layout['Car'])
+    _, car = compiled.decode(encode_car())
+    builder.append(car)
+    builder.append(dict(car, code=b'\0', serialNumber=5))
+    assert len(builder) == 2
+    batch = builder.flush()
+    assert len(builder) == 0
+    assert batch.schema == builder.schema
+    rows = batch.to_pylist()
+    assert rows[0]['code'] == 'A'
+    assert rows[1]['code'] is None  # null enum values become nulls
+    assert rows[1]['serialNumber'] == 5
+    assert rows[0]['engine.booster.horsePower'] == 200
+    assert rows[0]['performanceFigures'] == [{'octaneRating': 95, 'acceleration': [{'mph': 30, 'seconds': 4.0}, {'mph': 60, 'seconds': 7.5}]}]
+    # the dictionary contains all valid values, so it is the same for every batch
+    assert batch.column('code').dictionary.to_pylist() == ['A', 'B', 'C']
+
+    builder.append(dict(car, code=b'Z'))
+    with raises(DecodingError, match="Unknown value b'Z' of enum column 'code'"):
+        builder.flush()
+
+
+def test_record_batches_bounded():
+    schema = parse_schema(schema_path('example-schema.xml'))
+    batches = list(record_batches(schema, encode_car() * 5, batch_size=2))
+    assert [(template_id, batch.num_rows) for template_id, batch in batches] == [(1, 2), (1, 2), (1, 1)]
+
+
+def test_record_batches_match_decoded():
+    schema = parse_schema(schema_path('example-schema.xml'))
+    compiled = compile(schema)
+    builder = RecordBatchBuilder(schema.layout['Car'])
+    builder.append(compiled.decode(encode_car())[1])
+    (template_id, batch), = record_batches(compiled, encode_car())
+    assert template_id == 1
+    assert batch.to_pylist() == builder.flush().to_pylist()
+    assert batch.to_pylist()[0]['fuelFigures'][1] == {'speed': 55, 'mpg': 49.0, 'usageDescription': 'Combined'}
+
+    car = bytearray(encode_car())
+    car[19:20] = b'Z'  # code
+    with raises(DecodingError, match="Unknown value b'Z'"):
+        list(record_batches(compiled, bytes(car)))
+
+
+def test_write_parquet(tmp_path):
+    schema = parse_schema(schema_path('example-schema.xml'))
+    paths = write_parquet(schema, io.BytesIO(encode_car() * 5), str(tmp_path), batch_size=2, compression='zstd')
+    assert paths == {1: str(tmp_path / 'Car.parquet')}
+    table = pq.read_table(paths[1])
+    assert table.num_rows == 5
+    assert table.column('serialNumber').to_pylist() == [1234] * 5
+    assert table.column('model').to_pylist() == ['Civic VTi'] * 5
+
+
+CONSTANTS_SCHEMA = """<sbe:messageSchema xmlns:sbe="http://fixprotocol.io/2016/sbe" package="p" id="3" version="0" byteOrder="littleEndian">
+    <types>
+        <composite name="messageHeader">
+            <type name="blockLength" primitiveType="uint16"/>
+            <type name="templateId" primitiveType="uint16"/>
+            <type name="schemaId" primitiveType="uint16"/>
+            <type name="version" primitiveType="uint16"/>
+        </composite>
+        <type name="OptionalPrice" primitiveType="int32" presence="optional"/>
+        <enum name="Side" encodingType="uint8">
+            <validValue name="Buy">1</validValue>
+            <validValue name="Sell">2</validValue>
+        </enum>
+    </types>
+    <sbe:message name="Order" id="1">
+        <field name="a" id="1" type="uint32"/>
+        <field name="k" id="2" type="uint16" presence="constant">7</field>
+        <field name="b" id="3" type="uint32"/>
+        <field name="price" id="4" type="OptionalPrice"/>
+        <field name="side" id="5" type="Side"/>
+        <field name="fixedSide" id="6" type="Side" presence="constant" valueRef="Side.Sell"/>
+        <field name="last" id="7" type="int8" presence="constant">-3</field>
+    </sbe:message>
+</sbe:messageSchema>
+"""
+
+
+def test_record_batches_constant_optional_and_enum_columns():
+    schema = parse_schema(text=CONSTANTS_SCHEMA)
+    compiled = compile(schema)
+    buf = bytearray(64)
+    size = compiled.encode_into('Order', {'a': 1, 'b': 2, 'price': 100, 'side': 'Buy'}, buf)
+    first = bytes(buf[:size])
+    size = compiled.encode_into('Order', {'a': 3, 'b': 4, 'price': None, 'side': 'Sell'}, buf)
+    second = bytes(buf[:size])
+    (_, batch), = record_batches(compiled, first + second)
+    assert batch.to_pydict() == {
+        'a': [1, 3],
+        'k': [7, 7],
+        'b': [2, 4],
+        'price': [100, None],
+        'side': ['Buy', 'Sell'],
+        'fixedSide': ['Sell', 'Sell'],
+        'last': [-3, -3],
+    }
+    # the same columns are built from decoded messages
+    builder = RecordBatchBuilder(schema.layout['Order'])
+    for message in (first, second):
+        builder.append(compiled.decode(message)[1])
+    assert builder.flush().to_pydict() == batch.to_pydict()
+
+    # the null value of the enum encoding type becomes a null, other unknown values raise
+    null_side = bytearray(first)
+    null_side[8 + 12] = 255
+    (_, batch), = record_batches(compiled, bytes(null_side))
+    assert batch.column('side').to_pylist() == [None]
+    null_side[8 + 12] = 9
+    with raises(DecodingError):
+        list(record_batches(compiled, bytes(null_side)))
@@ -0,0 +1,126 @@
+from sbe2.xmlparser import parse_schema
+from sbe2.schema import Message, Field, ByteOrder, Presence, Type, builtin, primitive_type
+from sbe2.schema.layout import resolve_message
+from sbe2.pyruntime import compile, DecodingError
+from sbe2.pyruntime.batch import block_dtype, message_dtype, decode_batch, decode_group_batch
+from example_car import schema_path, encode_car
+from pytest import raises
+import numpy as np
+import struct
+
+
+def quote_message() -> Message:
+    return Message(name='Quote', description='', id=7, package='p', groups=[], datas=[], fields=[
+        Field(name='price', description='', id=1, type=builtin.int64),
+        Field(name='size', description='', id=2, type=builtin.uint16, offset=10),
+        Field(name='symbol', description='', id=3, type=Type(name='Symbol', description='', presence=Presence.REQUIRED, primitive_type=primitive_type.char, length=4)),
+        Field(name='levels', description='', id=4, type=Type(name='Levels', description='', presence=Presence.REQUIRED, primitive_type=primitive_type.int16, length=2)),
+    ])
+
+
+def test_block_dtype_car():
+    schema = parse_schema(schema_path('example-schema.xml'))
+    layout = schema.layout['Car']
+    dtype = block_dtype(layout.fields, layout.block_length, schema.byte_order)
+    assert dtype.itemsize == 45
+    assert 'discountedModel' not in dtype.names
+    assert dtype['someNumbers'].shape == (4,)
+    assert dtype['engine']['booster']['horsePower'] == np.dtype('u1')
+    
+    buf = encode_car()
+    car = np.frombuffer(buf, dtype=dtype, count=1, offset=8)[0]
+    assert car['serialNumber'] == 1234
+    assert car['modelYear'] == 2013
+    assert car['code'] == b'A'
+    assert list(car['someNumbers']) == [0, 1, 2, 3]
+    assert car['vehicleCode'] == b'abcdef'
+    assert car['engine']['capacity'] == 2000
+    assert car['engine']['manufacturerCode'] == b'VTI'
+    assert car['engine']['booster']['horsePower'] == 200
+
+
+def test_message_dtype_byte_order_and_padding():
+    dtype = message_dtype(quote_message(), ByteOrder.BIG_ENDIAN)
+    assert dtype.itemsize == 20
+    assert dtype.fields['size'][1] == 10
+    assert dtype['price'] == np.dtype('>i8')
+    assert dtype['levels'].base == np.dtype('>i2')
+
+
+def test_decode_batch():
+    message = quote_message()
+    buf = b''.join(struct.pack('>q2xH4s2h', i * 100, i, b'AB', i, -i) for i in range(5))
+    quotes = decode_batch(buf, message, ByteOrder.BIG_ENDIAN)
+    assert len(quotes) == 5
+    assert list(quotes['price']) == [0, 100, 200, 300, 400]
+    assert list(quotes['size']) == [0, 1, 2, 3, 4]
+    assert quotes['symbol'][3] == b'AB'
+    assert list(quotes['levels'][4]) == [4, -4]
+    assert len(decode_batch(buf, message, ByteOrder.BIG_ENDIAN, offset=20, count=2)) == 2
+    
+    with raises(DecodingError):
+        decode_batch(buf[:-1], message, ByteOrder.BIG_ENDIAN)
+    with raises(DecodingError):
+        decode_batch(buf, message, ByteOrder.BIG_ENDIAN, count=6)
+
+
+def test_decode_batch_with_header():
+    schema = parse_schema(schema_path('example-schema.xml'))
+    message = quote_message()
+    layout = resolve_message(message)
+    buf = b''.join(struct.pack('<HHHHq2xH4s2h', 20, 7, 1, 0, i, i, b'ABCD', 0, 0) for i in range(3))
+    quotes = decode_batch(buf, layout, schema.byte_order, schema.header_type)
+    assert list(quotes['price']) == [0, 1, 2]
+    assert list(quotes['messageHeader']['templateId']) == [7, 7, 7]
+    
+    other = bytearray(buf)
+    other[2] = 8
+    with raises(DecodingError):
+        decode_batch(other, layout, schema.byte_order, schema.header_type)
+
+
+def test_decode_batch_errors():
+    schema = parse_schema(schema_path('example-schema.xml'))
+    with raises(ValueError):
+        decode_batch(encode_car(), schema.messages['Car'])
+    compiled = compile(schema)
+    with raises(ValueError):
+        compiled.decode_batch('Car', encode_car())
+
+
+def test_decode_group_batch():
+    schema = parse_schema(schema_path('example-schema.xml'))
+    compiled = compile(schema)
+    buf = encode_car()
+    view = compiled.view('Car').sbe_wrap(buf, compiled.header.size)
+    performance = schema.layout['Car'].groups[1]
+    entry = next(iter(view.performanceFigures))
+    acceleration = entry.acceleration
+    
+    array, end = decode_group_batch(buf, performance.groups[0], schema.byte_order, acceleration.sbe_offset)
+    assert array.dtype.names == ('mph', 'seconds')
+    assert array['mph'].tolist() == [30, 60]
+    assert array['seconds'].tolist() == [4.0, 7.5]
+    assert end == acceleration.sbe_end
+    assert acceleration.sbe_to_array().tolist() == array.tolist()
+    
+    with raises(ValueError):
+        decode_group_batch(buf, performance, schema.byte_order, view.performanceFigures.sbe_offset)
+    with raises(DecodingError):
+        decode_group_batch(buf[:acceleration.sbe_offset + 8], performance.groups[0], schema.byte_order, acceleration.sbe_offset)
+
+
+def test_decode_group_batch_block_length():
+    schema = parse_schema(schema_path('example-schema.xml'))
+    acceleration = schema.layout['Car'].groups[1].groups[0]
+    # entries of a newer schema version with 2 extra bytes are strided by the block length of the dimension
+    newer = struct.pack('<HH', 8, 2) + struct.pack('<Hf', 30, 4.0) + b'\xff\xff' + struct.pack('<Hf', 60, 7.5) + b'\xff\xff'
+    array, end = decode_group_batch(newer, acceleration)
+    assert array['seconds'].tolist() == [4.0, 7.5]
+    assert end == len(newer)
+    # fields beyond the block length of an older schema version are omitted
+    older = struct.pack('<HH', 2, 3) + struct.pack('<HHH', 1, 2, 3)
+    array, end = decode_group_batch(older, acceleration)
+    assert array.dtype.names == ('mph',)
+    assert array['mph'].tolist() == [1, 2, 3]
+    assert end == len(older)
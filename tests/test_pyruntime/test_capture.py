@@ -0,0 +1,145 @@
+from sbe2.xmlparser import parse_schema
+from sbe2.pyruntime import compile, CaptureFile, CaptureIndex
+from example_car import schema_path, encode_car
+from pytest import raises
+import os
+
+
+def car_with_serial(serial: int) -> bytes:
+    car = bytearray(encode_car())
+    car[8:16] = serial.to_bytes(8, 'little')
+    return bytes(car)
+
+
+def test_capture_file(tmp_path):
+    compiled = compile(parse_schema(schema_path('example-schema.xml')))
+    path = str(tmp_path / 'capture.sbe')
+    with open(path, 'wb') as file:
+        for serial in range(10):
+            file.write(car_with_serial(serial))
+        # incomplete message at the end of the file is not indexed
+        file.write(encode_car()[:30])
+    
+    with CaptureFile(compiled, path) as capture:
+        assert len(capture) == 10
+        assert os.path.exists(path + '.idx')
+        template_id, view = capture[3]
+        assert template_id == 1
+        assert view == car_with_serial(3)
+        assert capture.decode(-1)[1]['serialNumber'] == 9
+        assert [view.nbytes for _, view in capture] == [len(encode_car())] * 10
+        assert list(capture.positions(1)) == list(range(10))
+        assert len(list(capture.iter_template(1))) == 10
+        assert list(capture.iter_template(42)) == []
+        with raises(IndexError):
+            capture[10]
+        del view
+    
+    index = CaptureIndex.load(path + '.idx')
+    assert len(index) == 10
+    assert index.file_size == os.path.getsize(path)
+    assert {tid: list(positions) for tid, positions in index.positions.items()} == {1: list(range(10))}
+
+
+def test_capture_index_is_extended(tmp_path):
+    compiled = compile(parse_schema(schema_path('example-schema.xml')))
+    path = str(tmp_path / 'capture.sbe')
+    car = encode_car()
+    with open(path, 'wb') as file:
+        file.write(car * 2 + car[:30])
+    with CaptureFile(compiled, path) as capture:
+        assert len(capture) == 2
+    
+    with open(path, 'ab') as file:
+        file.write(car[30:] + car)
+    with CaptureFile(compiled, path) as capture:
+        assert len(capture) == 4
+        assert capture[2][1] == car
+    assert list(CaptureIndex.load(path + '.idx').positions[1]) == [0, 1, 2, 3]
+    
+    # a broken index is rebuilt
+    with open(path + '.idx', 'wb') as file:
+        file.write(b'garbage')
+    with CaptureFile(compiled, path) as capture:
+        assert capture[0][0] == 1
+
+
+def test_capture_index_is_validated(tmp_path, monkeypatch):
+    schema = parse_schema(schema_path('example-schema.xml'))
+    compiled = compile(schema)
+    path = str(tmp_path / 'capture.sbe')
+    with open(path, 'wb') as file:
+        file.write(car_with_serial(1) + car_with_serial(2))
+    with CaptureFile(compiled, path) as capture:
+        assert len(capture) == 2
+    index = CaptureIndex.load(path + '.idx')
+    assert (index.schema_id, index.version) == (schema.id, schema.version)
+    assert index.mtime_ns == os.stat(path).st_mtime_ns
+
+    extended = []
+    original_extend = CaptureFile._extend
+    monkeypatch.setattr(CaptureFile, '_extend', lambda self, index, size: extended.append(index.end) or original_extend(self, index, size))
+    # an unchanged file is not rescanned
+    with CaptureFile(compiled, path) as capture:
+        assert len(capture) == 2
+    assert extended == []
+
+    # a file modified in place with the same size is indexed again
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    with CaptureFile(compiled, path) as capture:
+        assert len(capture) == 2
+    assert extended == [0]
+
+    # an index of another schema version is not used
+    with open(path, 'wb') as file:
+        file.write(car_with_serial(4))
+    with CaptureFile(compiled, path) as capture:
+        assert len(capture) == 1
+    index = CaptureIndex.load(path + '.idx')
+    index.version += 1
+    index.save(path + '.idx')
+    extended.clear()
+    with CaptureFile(compiled, path) as capture:
+        assert capture.decode(0)[1]['serialNumber'] == 4
+    assert extended == [0]
+
+    # a grown file with a different leading chunk is indexed again
+    with open(path, 'wb') as file:
+        file.write(car_with_serial(5) + car_with_serial(6))
+    extended.clear()
+    with CaptureFile(compiled, path) as capture:
+        assert [capture.decode(n)[1]['serialNumber'] for n in range(len(capture))] == [5, 6]
+    assert extended == [0]
+
+
+def test_capture_file_is_closed_on_failure(tmp_path, monkeypatch):
+    compiled = compile(parse_schema(schema_path('example-schema.xml')))
+    path = str(tmp_path / 'capture.sbe')
+    with open(path, 'wb') as file:
+        file.write(encode_car())
+    closed = []
+    original_close = CaptureFile.close
+    monkeypatch.setattr(CaptureFile, 'close', lambda self: original_close(self) or closed.append(self._file.closed))
+
+    # the index cannot be saved
+    with raises(OSError):
+        CaptureFile(compiled, path, index_path=str(tmp_path / 'missing' / 'capture.idx'))
+    assert closed == [True]
+    assert os.listdir(tmp_path) == ['capture.sbe']
+
+    def broken_extend(self, index, size):
+        raise RuntimeError('broken')
+    monkeypatch.setattr(CaptureFile, '_extend', broken_extend)
+    with raises(RuntimeError):
+        CaptureFile(compiled, path)
+    assert closed == [True, True]
+
+
+def test_empty_capture_file(tmp_path):
+    compiled = compile(parse_schema(schema_path('example-schema.xml')))
+    path = tmp_path / 'empty.sbe'
+    path.write_bytes(b'')
+    with CaptureFile(compiled, str(path), save_index=False) as capture:
+        assert len(capture) == 0
+        assert list(capture) == []
@@ -0,0 +1,77 @@
+from sbe2.xmlparser import parse_schema
+from sbe2.pyruntime import compile, DecodingError, MessageHeader
+from example_car import schema_path, encode_car, old_car
+from pytest import raises
+import struct
+
+
+def test_decode_car():
+    schema = parse_schema(schema_path('example-schema.xml'))
+    compiled = compile(schema)
+    assert len(compiled) == 1
+    decoder = compiled['Car']
+    assert compiled[1] is decoder
+    assert compiled.get('Nothing') is None
+    assert decoder.block_length == 45
+    
+    buf = encode_car()
+    assert compiled.decode_header(buf) == MessageHeader(block_length=45, template_id=1, schema_id=1, version=0)
+    message, car, end = compiled.decode_from(buf)
+    assert message is schema.messages['Car']
+    assert end == len(buf)
+    assert car['serialNumber'] == 1234
+    assert car['modelYear'] == 2013
+    assert car['available'] == 'T'
+    assert car['code'] == 'A'
+    assert car['someNumbers'] == [0, 1, 2, 3]
+    assert car['vehicleCode'] == 'abcdef'
+    assert car['extras'] == 6
+    assert car['discountedModel'] == 'C'
+    assert car['engine'] == {
+        'capacity': 2000,
+        'numCylinders': 4,
+        'maxRpm': 9000,
+        'manufacturerCode': b'VTI',
+        'fuel': 'Petrol',
+        'efficiency': 35,
+        'boosterEnabled': 'T',
+        'booster': {'BoostType': 'KERS', 'horsePower': 200},
+    }
+    assert car['fuelFigures'] == [
+        {'speed': 30, 'mpg': 35.5, 'usageDescription': 'Urban'},
+        {'speed': 55, 'mpg': 49.0, 'usageDescription': 'Combined'},
+    ]
+    assert car['performanceFigures'] == [
+        {'octaneRating': 95, 'acceleration': [{'mph': 30, 'seconds': 4.0}, {'mph': 60, 'seconds': 7.5}]},
+    ]
+    assert car['manufacturer'] == 'Honda'
+    assert car['model'] == 'Civic VTi'
+    assert car['activationCode'] == 'abcdef'
+    
+    
+def test_decode_errors():
+    compiled = compile(parse_schema(schema_path('example-schema.xml')))
+    buf = encode_car()
+    with raises(DecodingError):
+        compiled.decode(b'\x00\x00')
+    with raises(DecodingError):
+        compiled.decode(struct.pack('<HHHH', 45, 99, 1, 0) + buf[8:])
+    with raises(DecodingError):
+        compiled.decode(buf[:-3])
+
+
+def test_decode_short_blocks():
+    compiled = compile(parse_schema(schema_path('example-schema.xml')))
+    message, car, end = compiled.decode_from(old_car())
+    assert end == len(old_car())
+    assert (car['serialNumber'], car['modelYear'], car['available'], car['code']) == (1234, 2013, 'T', 'A')
+    # fields past the end of the block are null, constants are still known
+    assert car['someNumbers'] is None
+    assert car['engine'] is None
+    assert car['discountedModel'] == 'C'
+    assert list(car) == list(compiled['Car'].decode(encode_car(), 8))
+    assert car['fuelFigures'] == [
+        {'speed': 30, 'mpg': None, 'usageDescription': 'Urban'},
+        {'speed': 55, 'mpg': None, 'usageDescription': 'Combined'},
+    ]
+    assert car['manufacturer'] == 'Honda'
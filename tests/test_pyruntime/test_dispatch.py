@@ -0,0 +1,79 @@
+from sbe2.xmlparser import parse_schema
+from sbe2.pyruntime import Dispatcher, DecodingError, MessageHeader, compile
+from example_car import schema_path, encode_car
+from pytest import raises
+
+
+def test_dispatch():
+    dispatcher = Dispatcher(parse_schema(schema_path('example-schema.xml')))
+    car = encode_car()
+    
+    values, end = dispatcher.dispatch(car)
+    assert end == len(car)
+    assert values['serialNumber'] == 1234
+    
+    @dispatcher.register('Car')
+    def on_car(values):
+        return 'car', values['modelYear']
+    
+    assert dispatcher.dispatch(car) == (('car', 2013), len(car))
+    assert list(dispatcher.dispatch_all(car * 3)) == [('car', 2013)] * 3
+    
+    dispatcher.register(1, lambda values: values['vehicleCode'])
+    assert dispatcher.dispatch(car)[0] == 'abcdef'
+    
+    dispatcher.unregister('Car')
+    assert isinstance(dispatcher.dispatch(car)[0], dict)
+    
+    with raises(KeyError):
+        dispatcher.register('Boat', on_car)
+
+
+def test_dispatch_unknown_template():
+    schema = parse_schema(schema_path('example-schema.xml'))
+    unknown = bytearray(encode_car())
+    unknown[2] = 77
+    
+    with raises(DecodingError):
+        Dispatcher(schema).dispatch(unknown)
+    with raises(DecodingError):
+        Dispatcher(schema).dispatch(b'\x00')
+    
+    def fallback(header: MessageHeader, buf, offset: int):
+        return header.template_id, len(buf)
+    
+    assert Dispatcher(schema, fallback).dispatch(unknown) == (77, len(unknown))
+
+
+SPARSE_SCHEMA = """<sbe:messageSchema xmlns:sbe="http://fixprotocol.io/2016/sbe" package="p" id="3" version="0" byteOrder="littleEndian">
+    <types>
+        <composite name="messageHeader">
+            <type name="blockLength" primitiveType="uint16"/>
+            <type name="templateId" primitiveType="uint16"/>
+            <type name="schemaId" primitiveType="uint16"/>
+            <type name="version" primitiveType="uint16"/>
+        </composite>
+    </types>
+    <sbe:message name="Low" id="1">
+        <field name="a" id="1" type="uint32"/>
+    </sbe:message>
+    <sbe:message name="High" id="60000">
+        <field name="b" id="1" type="uint8"/>
+    </sbe:message>
+</sbe:messageSchema>
+"""
+
+
+def test_dispatch_sparse_template_ids():
+    compiled = compile(parse_schema(text=SPARSE_SCHEMA))
+    dispatcher = Dispatcher(compiled)
+    assert isinstance(dispatcher._table, dict)
+    buf = bytearray(32)
+    size = compiled.encode_into('High', {'b': 7}, buf)
+    size += compiled.encode_into('Low', {'a': 5}, buf, size)
+    dispatcher.register('Low', lambda values: values['a'])
+    assert list(dispatcher.dispatch_all(buf[:size])) == [{'b': 7}, 5]
+    unknown = bytearray(buf[:size])
+    unknown[2:4] = (59999).to_bytes(2, 'little')
+    with raises(DecodingError):
+        dispatcher.dispatch(unknown)
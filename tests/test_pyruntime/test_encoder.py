@@ -0,0 +1,45 @@
+from sbe2.xmlparser import parse_schema
+from sbe2.schema import Message, Field, ByteOrder, builtin
+from sbe2.schema.layout import resolve_message
+from sbe2.pyruntime import compile, EncodingError, MessageEncoder
+from example_car import schema_path, encode_car
+from pytest import raises
+
+
+def test_encode_car_round_trip():
+    compiled = compile(parse_schema(schema_path('example-schema.xml')))
+    expected = encode_car()
+    _, car = compiled.decode(expected)
+    
+    buf = bytearray(1024)
+    written = compiled.encode_into('Car', car, buf, 10)
+    assert written == len(expected)
+    assert buf[10:10 + written] == expected
+    
+    view = memoryview(bytearray(len(expected)))
+    assert compiled.encode_into(1, car, view) == len(expected)
+    assert view.tobytes() == expected
+    assert compiled.encoder('Car').block_length == 45
+    
+    
+def test_encode_errors():
+    compiled = compile(parse_schema(schema_path('example-schema.xml')))
+    _, car = compiled.decode(encode_car())
+    with raises(EncodingError):
+        compiled.encode_into('Car', car, bytearray(20))
+    with raises(EncodingError):
+        compiled.encode_into('Car', car, bytearray(len(encode_car()) - 2))
+    del car['modelYear']
+    with raises(EncodingError):
+        compiled.encode_into('Car', car, bytearray(1024))
+        
+        
+def test_encode_body_only():
+    message = Message(name='Msg', description='', id=1, package='p', groups=[], datas=[], fields=[
+        Field(name='a', description='', id=1, type=builtin.uint32),
+        Field(name='b', description='', id=2, type=builtin.int16, offset=6),
+    ])
+    encoder = MessageEncoder(resolve_message(message), ByteOrder.BIG_ENDIAN)
+    buf = bytearray(b'\xaa' * 8)
+    assert encoder.encode_into(buf, 0, {'a': 7, 'b': -2}) == 8
+    assert buf == b'\x00\x00\x00\x07\x00\x00\xff\xfe'
@@ -0,0 +1,85 @@
+from sbe2.schema import Type, Enum, ValidValue, Set, Composite, Presence, ByteOrder, builtin, primitive_type
+from sbe2.pyruntime.formats import byte_order_prefix, element_format, composite_indexes
+from pytest import raises
+import struct
+
+
+def decode(element, data: bytes):
+    fmt = element_format(element)
+    values = struct.unpack('<' + fmt.fmt, data)
+    assert len(values) == fmt.count
+    assert struct.calcsize('<' + fmt.fmt) == fmt.size
+    return values[0] if fmt.decode is None else fmt.decode(values, 0)
+
+
+def test_byte_order_prefix():
+    assert byte_order_prefix(ByteOrder.LITTLE_ENDIAN) == '<'
+    assert byte_order_prefix(ByteOrder.BIG_ENDIAN) == '>'
+
+
+def test_type_format():
+    t = Type(name='t', description='', presence=Presence.REQUIRED, primitive_type=primitive_type.int32)
+    assert decode(t, struct.pack('<i', -5)) == -5
+    arr = Type(name='t', description='', presence=Presence.REQUIRED, primitive_type=primitive_type.uint16, length=3)
+    assert decode(arr, struct.pack('<3H', 1, 2, 3)) == [1, 2, 3]
+    raw = Type(name='t', description='', presence=Presence.REQUIRED, primitive_type=primitive_type.uint8, length=3)
+    assert decode(raw, b'abc') == b'abc'
+    text = Type(name='t', description='', presence=Presence.REQUIRED, primitive_type=primitive_type.char, length=6, character_encoding='ASCII')
+    assert decode(text, b'abc\0\0\0') == 'abc'
+    # character arrays without an encoding are raw bytes, like Engine.manufacturerCode
+    chars = Type(name='t', description='', presence=Presence.REQUIRED, primitive_type=primitive_type.char, length=3)
+    assert decode(chars, b'VT\0') == b'VT\0'
+    const = Type(name='t', description='', presence=Presence.CONSTANT, primitive_type=primitive_type.int32, const_val=7)
+    assert element_format(const).size == 0
+    assert element_format(const).decode((), 0) == 7
+
+
+def test_type_format_optional():
+    t = Type(name='t', description='', presence=Presence.OPTIONAL, primitive_type=primitive_type.uint8)
+    assert decode(t, b'\xff') is None
+    assert decode(t, b'\x05') == 5
+    f = Type(name='t', description='', presence=Presence.OPTIONAL, primitive_type=primitive_type.double)
+    assert decode(f, struct.pack('<d', float('nan'))) is None
+    assert decode(f, struct.pack('<d', 1.5)) == 1.5
+
+
+def test_enum_and_set_format():
+    e = Enum(name='e', description='', encoding_type_name='char', encoding_type=builtin.char, valid_values=[
+        ValidValue(name='A', description='', value=b'A'),
+    ])
+    assert decode(e, b'A') == 'A'
+    assert decode(e, b'Z') == b'Z'
+    s = Set(name='s', description='', encoding_type_name='uint16', encoding_type=builtin.uint16, choices=[])
+    assert decode(s, struct.pack('<H', 5)) == 5
+
+
+def test_composite_format():
+    c = Composite(name='c', description='', elements=[
+        Type(name='a', description='', presence=Presence.REQUIRED, primitive_type=primitive_type.uint8),
+        Type(name='b', description='', presence=Presence.REQUIRED, primitive_type=primitive_type.uint16, offset=2),
+    ])
+    assert element_format(c).size == 4
+    assert decode(c, struct.pack('<BxH', 1, 2)) == {'a': 1, 'b': 2}
+    assert composite_indexes(c) == {'a': 0, 'b': 1}
+    
+    c.elements[1].offset = 0
+    with raises(ValueError):
+        element_format(c)
+    
+    
+def test_encode():
+    t = Type(name='t', description='', presence=Presence.OPTIONAL, primitive_type=primitive_type.uint8)
+    assert element_format(t).encode(None) == (255,)
+    assert element_format(t).encode(5) == (5,)
+    text = Type(name='t', description='', presence=Presence.REQUIRED, primitive_type=primitive_type.char, length=6, character_encoding='ASCII')
+    assert element_format(text).encode('abc') == (b'abc',)
+    e = Enum(name='e', description='', encoding_type_name='uint8', encoding_type=builtin.uint8, valid_values=[
+        ValidValue(name='A', description='', value=1),
+    ])
+    assert element_format(e).encode('A') == (1,)
+    c = Composite(name='c', description='', elements=[
+        Type(name='a', description='', presence=Presence.REQUIRED, primitive_type=primitive_type.uint16, length=2),
+        Type(name='b', description='', presence=Presence.CONSTANT, primitive_type=primitive_type.uint8, const_val=3),
+        e,
+    ])
+    assert element_format(c).encode({'a': [1, 2], 'e': 'A'}) == [1, 2, 1]
@@ -0,0 +1,88 @@
+from sbe2.xmlparser import parse_schema
+from sbe2.pyruntime import compile, DecodingError
+from sbe2.pyruntime.frames import to_dataframes
+from example_car import schema_path, encode_car
+from pytest import raises
+import math
+import pandas as pd
+
+
+PRICES = """<sbe:messageSchema xmlns:sbe="http://fixprotocol.io/2016/sbe" package="prices" id="3" version="0" byteOrder="bigEndian">
+    <types>
+        <composite name="messageHeader">
+            <type name="blockLength" primitiveType="uint16"/>
+            <type name="templateId" primitiveType="uint16"/>
+            <type name="schemaId" primitiveType="uint16"/>
+            <type name="version" primitiveType="uint16"/>
+        </composite>
+        <composite name="Decimal">
+            <type name="mantissa" primitiveType="int64" presence="optional"/>
+            <type name="exponent" primitiveType="int8" presence="constant">-2</type>
+        </composite>
+        <enum name="Side" encodingType="uint8">
+            <validValue name="Buy">1</validValue>
+            <validValue name="Sell">2</validValue>
+        </enum>
+        <type name="Qty" primitiveType="uint32" presence="optional"/>
+    </types>
+    <sbe:message name="Trade" id="1">
+        <field name="price" id="1" type="Decimal"/>
+        <field name="side" id="2" type="Side"/>
+        <field name="qty" id="3" type="Qty"/>
+    </sbe:message>
+    <sbe:message name="Cancel" id="2">
+        <field name="side" id="1" type="Side"/>
+    </sbe:message>
+</sbe:messageSchema>
+"""
+
+
+def encode_prices(compiled) -> bytes:
+    buf = bytearray(1024)
+    size = 0
+    trades = [(12345, 'Buy', 10), (None, 'Sell', None), (-50, 'Sell', 7)]
+    for mantissa, side, qty in trades:
+        size += compiled.encode_into('Trade', {'price': {'mantissa': mantissa, 'exponent': -2}, 'side': side, 'qty': qty}, buf, size)
+        size += compiled.encode_into('Cancel', {'side': side}, buf, size)
+    return bytes(buf[:size])
+
+
+def test_to_dataframes():
+    compiled = compile(parse_schema(text=PRICES))
+    frames = to_dataframes(encode_prices(compiled), compiled)
+    assert sorted(frames) == [1, 2]
+    trades = frames[1]
+    assert list(trades.columns) == ['price.mantissa', 'side', 'qty']
+    assert trades['price.mantissa'].tolist()[0] == 12345
+    assert isinstance(trades['side'].dtype, pd.CategoricalDtype)
+    assert list(trades['side'].cat.categories) == ['Buy', 'Sell']
+    assert trades['side'].tolist() == ['Buy', 'Sell', 'Sell']
+    assert str(trades['qty'].dtype) == 'UInt32'
+    assert trades['qty'].isna().tolist() == [False, True, False]
+    assert frames[2]['side'].tolist() == ['Buy', 'Sell', 'Sell']
+
+
+def test_to_dataframes_decimals(tmp_path):
+    compiled = compile(parse_schema(text=PRICES))
+    path = tmp_path / 'prices.sbe'
+    path.write_bytes(encode_prices(compiled))
+    trades = to_dataframes(str(path), compiled, decimals=True)[1]
+    assert list(trades.columns) == ['price', 'side', 'qty']
+    price = trades['price'].tolist()
+    assert price[0] == 123.45
+    assert math.isnan(price[1])
+    assert price[2] == -0.5
+
+
+def test_to_dataframes_car():
+    schema = parse_schema(schema_path('example-schema.xml'))
+    frames = to_dataframes(encode_car() * 3, schema)
+    car = frames[1]
+    assert len(car) == 3
+    assert car['serialNumber'].tolist() == [1234] * 3
+    assert car['available'].tolist() == ['T'] * 3
+    assert car['vehicleCode'].tolist() == ['abcdef'] * 3
+    assert car['engine.booster.BoostType'].tolist() == ['KERS'] * 3
+    assert [list(numbers) for numbers in car['someNumbers']] == [[0, 1, 2, 3]] * 3
+    with raises(DecodingError):
+        to_dataframes(encode_car()[:-1], schema)
@@ -0,0 +1,76 @@
+from sbe2.xmlparser import parse_schema
+from sbe2.pyruntime import decode_file_parallel, CaptureFile
+from sbe2.pyruntime.compiler import compile
+from sbe2.pyruntime.errors import DecodingError
+from sbe2.pyruntime.parallel import is_boundary, resync
+from example_car import schema_path, encode_car
+from pytest import raises
+import numpy as np
+
+
+def write_cars(path, count: int) -> bytes:
+    cars = []
+    for serial in range(count):
+        car = bytearray(encode_car())
+        car[8:16] = serial.to_bytes(8, 'little')
+        cars.append(bytes(car))
+    data = b''.join(cars)
+    path.write_bytes(data)
+    return data
+
+
+def test_resync(tmp_path):
+    schema = parse_schema(schema_path('example-schema.xml'))
+    compiled = compile(schema)
+    data = write_cars(tmp_path / 'capture.sbe', 10)
+    size = len(encode_car())
+    assert is_boundary(compiled, data, 0)
+    assert is_boundary(compiled, data, 9 * size)
+    assert is_boundary(compiled, data, len(data))
+    assert not is_boundary(compiled, data, 1)
+    assert resync(compiled, data, 1, len(data)) == size
+    assert resync(compiled, data, 3 * size + 1, 4 * size) is None
+    # a false header is rejected as following messages do not chain up
+    assert not is_boundary(compiled, data[:size] + data[:8] + data[size:], 0)
+
+
+def test_decode_file_parallel(tmp_path):
+    schema = parse_schema(schema_path('example-schema.xml'))
+    path = tmp_path / 'capture.sbe'
+    write_cars(path, 50)
+    result = decode_file_parallel(str(path), schema, workers=2, chunk_size=500, root_only=True)
+    assert list(result) == [1]
+    assert len(result[1]) > 1  # one array per chunk
+    cars = np.concatenate(result[1])
+    assert len(cars) == 50
+    assert list(cars['serialNumber']) == list(range(50))
+    assert set(cars['modelYear']) == {2013}
+    assert cars['engine']['booster']['horsePower'][7] == 200
+
+
+def test_decode_file_parallel_errors(tmp_path):
+    schema = parse_schema(schema_path('example-schema.xml'))
+    path = tmp_path / 'capture.sbe'
+    data = write_cars(path, 10)
+    # Car has groups and data, which are not decoded
+    with raises(ValueError):
+        decode_file_parallel(str(path), schema, workers=2, chunk_size=500)
+    path.write_bytes(data[:-3])
+    with raises(DecodingError):
+        decode_file_parallel(str(path), schema, workers=2, chunk_size=500, root_only=True)
+    path.write_bytes(b'')
+    assert decode_file_parallel(str(path), schema, workers=2, root_only=True) == {}
+    assert not list(tmp_path.glob('*.idx'))
+
+
+def test_decode_file_parallel_to_files(tmp_path):
+    schema = parse_schema(schema_path('example-schema.xml'))
+    path = tmp_path / 'capture.sbe'
+    data = write_cars(path, 20)
+    out_dir = tmp_path / 'out'
+    result = decode_file_parallel(str(path), schema, workers=2, out_dir=str(out_dir), chunk_size=300)
+    assert result == {1: str(out_dir / 'Car.sbe')}
+    assert (out_dir / 'Car.sbe').read_bytes() == data
+    assert sorted(p.name for p in out_dir.iterdir()) == ['Car.sbe']
+    with CaptureFile(schema, result[1], save_index=False) as capture:
+        assert capture.decode(19)[1]['serialNumber'] == 19
@@ -0,0 +1,63 @@
+from sbe2.xmlparser import parse_schema
+from sbe2.pyruntime import compile, MessageReader, DecodingError
+from example_car import schema_path, encode_car
+from pytest import raises
+import io
+import socket
+
+
+def compiled_car():
+    return compile(parse_schema(schema_path('example-schema.xml')))
+
+
+def test_read_buffer():
+    compiled = compiled_car()
+    car = encode_car()
+    buf = car * 3
+    messages = list(MessageReader(compiled, buf))
+    assert len(messages) == 3
+    for template_id, view in messages:
+        assert template_id == 1
+        assert isinstance(view, memoryview)
+        assert view.obj is buf
+        assert view == car
+    assert compiled.decode(messages[1][1])[1]['manufacturer'] == 'Honda'
+    
+    with raises(DecodingError):
+        list(MessageReader(compiled, buf[:-1]))
+
+
+def test_read_file_with_small_buffer():
+    compiled = compiled_car()
+    car = encode_car()
+    # the buffer is smaller than a single message and has to grow
+    reader = MessageReader(compiled, io.BytesIO(car * 5), buffer_size=16)
+    count = 0
+    for template_id, view in reader:
+        assert template_id == 1
+        assert bytes(view) == car
+        count += 1
+    assert count == 5
+
+
+def test_read_socket():
+    compiled = compiled_car()
+    car = encode_car()
+    left, right = socket.socketpair()
+    with left, right:
+        left.sendall(car * 2)
+        left.shutdown(socket.SHUT_WR)
+        assert [bytes(view) for _, view in MessageReader(compiled, right, buffer_size=100)] == [car, car]
+
+
+def test_read_errors():
+    compiled = compiled_car()
+    car = encode_car()
+    with raises(DecodingError):
+        list(MessageReader(compiled, io.BytesIO(car + car[:20])))
+    unknown = bytearray(car)
+    unknown[2] = 99
+    with raises(DecodingError):
+        list(MessageReader(compiled, bytes(unknown)))
+    with raises(TypeError):
+        MessageReader(compiled, 42)
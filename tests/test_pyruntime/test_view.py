@@ -0,0 +1,120 @@
+from sbe2.xmlparser import parse_schema
+from sbe2.schema import Message, Field, ByteOrder, builtin
+from sbe2.schema.layout import resolve_message
+from sbe2.pyruntime import compile, view_class, MessageView
+from example_car import schema_path, encode_car, old_car
+from pytest import raises
+import struct
+
+
+def test_view_car():
+    compiled = compile(parse_schema(schema_path('example-schema.xml')))
+    view = compiled.view('Car')
+    assert isinstance(view, MessageView)
+    assert type(view).__name__ == 'CarView'
+    assert view.sbe_block_length == 45
+    
+    buf = memoryview(encode_car())
+    header = compiled.decode_header(buf)
+    assert view.sbe_wrap(buf, compiled.header.size) is view
+    assert view.sbe_offset == compiled.header.size
+    assert view.serialNumber == 1234
+    assert view.available == 'T'
+    assert view.someNumbers == [0, 1, 2, 3]
+    assert view.discountedModel == 'C'
+    assert view.engine['booster'] == {'BoostType': 'KERS', 'horsePower': 200}
+    
+    expected = compiled['Car'].decode(buf, compiled.header.size, header.block_length)
+    assert view.sbe_to_dict() == {name: expected[name] for name in view.sbe_field_names}
+    
+    other = bytearray(buf)
+    other[compiled.header.size:compiled.header.size + 8] = (99).to_bytes(8, 'little')
+    assert view.sbe_wrap(other, compiled.header.size).serialNumber == 99
+    
+    
+def test_view_slots():
+    message = Message(name='Msg', description='', id=1, package='p', groups=[], datas=[], fields=[
+        Field(name='a', description='', id=1, type=builtin.uint32),
+        Field(name='b', description='', id=2, type=builtin.int16, offset=6),
+    ])
+    cls = view_class(resolve_message(message), ByteOrder.BIG_ENDIAN)
+    view = cls(b'\x00\x00\x00\x07\x00\x00\xff\xfe')
+    assert view.a == 7
+    assert view.b == -2
+    with raises(AttributeError):
+        view.c = 5
+        
+        
+def test_view_name_clash():
+    # names of view attributes are prefixed, so they can be used by schema elements
+    names = ('wrap', 'offset', 'end', 'to_dict', 'block_length')
+    message = Message(name='Msg', description='', id=1, package='p', groups=[], datas=[], fields=[
+        Field(name=name, description='', id=n + 1, type=builtin.uint8, offset=n) for n, name in enumerate(names)
+    ])
+    view = view_class(resolve_message(message), ByteOrder.LITTLE_ENDIAN)(bytes(range(1, 6)))
+    assert [getattr(view, name) for name in names] == [1, 2, 3, 4, 5]
+    assert view.sbe_offset == 0
+    assert view.sbe_to_dict() == dict(zip(names, [1, 2, 3, 4, 5]))
+
+    message = Message(name='Msg', description='', id=1, package='p', groups=[], datas=[], fields=[
+        Field(name='sbe_wrap', description='', id=1, type=builtin.uint32),
+    ])
+    with raises(ValueError):
+        view_class(resolve_message(message), ByteOrder.LITTLE_ENDIAN)
+
+
+def test_view_groups():
+    compiled = compile(parse_schema(schema_path('example-schema.xml')))
+    view = compiled.view('Car')
+    buf = memoryview(encode_car())
+    view.sbe_wrap(buf, compiled.header.size)
+    
+    fuel_figures = view.fuelFigures
+    assert len(fuel_figures) == 2
+    assert fuel_figures.sbe_entry_block_length == 6
+    entries = [(entry.speed, entry.mpg, entry.usageDescription) for entry in fuel_figures]
+    assert entries == [(30, 35.5, 'Urban'), (55, 49.0, 'Combined')]
+    # the same flyweight is yielded for every entry
+    assert len({id(entry) for entry in fuel_figures}) == 1
+    
+    performance = [
+        (entry.octaneRating, [(a.mph, a.seconds) for a in entry.acceleration])
+        for entry in view.performanceFigures
+    ]
+    assert performance == [(95, [(30, 4.0), (60, 7.5)])]
+    assert (view.manufacturer, view.model, view.activationCode) == ('Honda', 'Civic VTi', 'abcdef')
+    assert view.sbe_end == len(buf)
+    assert view.fuelFigures.sbe_end == view.performanceFigures.sbe_offset
+    
+
+def test_view_group_block_length():
+    compiled = compile(parse_schema(schema_path('example-schema.xml')))
+    buf = encode_car()
+    # entries encoded by a newer producer with 2 extra bytes per entry
+    start = buf.index(struct.pack('<HH', 6, 2))
+    old = struct.pack('<Hf', 30, 35.5) + struct.pack('<I', 5) + b'Urban'
+    old += struct.pack('<Hf', 55, 49.0) + struct.pack('<I', 8) + b'Combined'
+    new = struct.pack('<HH', 8, 2)
+    new += struct.pack('<Hf', 30, 35.5) + b'\xff\xff' + struct.pack('<I', 5) + b'Urban'
+    new += struct.pack('<Hf', 55, 49.0) + b'\xff\xff' + struct.pack('<I', 8) + b'Combined'
+    buf = buf[:start] + new + buf[start + 4 + len(old):]
+    
+    view = compiled.view('Car').sbe_wrap(buf, compiled.header.size)
+    assert view.fuelFigures.sbe_entry_block_length == 8
+    assert [(entry.speed, entry.usageDescription) for entry in view.fuelFigures] == [(30, 'Urban'), (55, 'Combined')]
+    assert view.manufacturer == 'Honda'
+    assert view.sbe_end == len(buf)
+
+
+def test_view_short_blocks():
+    compiled = compile(parse_schema(schema_path('example-schema.xml')))
+    buf = old_car()
+    view = compiled.view('Car').sbe_wrap(buf, compiled.header.size, 12)
+    assert (view.serialNumber, view.code) == (1234, 'A')
+    # fields past the end of the block are null, constants are still known
+    assert view.someNumbers is None
+    assert view.engine is None
+    assert view.discountedModel == 'C'
+    assert [(entry.speed, entry.mpg, entry.usageDescription) for entry in view.fuelFigures] == [(30, None, 'Urban'), (55, None, 'Combined')]
+    assert view.manufacturer == 'Honda'
+    assert view.sbe_end == len(buf)
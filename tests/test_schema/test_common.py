@@ -1,5 +1,7 @@
-from sbe2.schema import ByteOrder, Presence
+from sbe2.schema import ByteOrder, Presence, Type, Composite
+from sbe2.schema.primitive_type import uint16, uint32
 from pytest import raises
+import pickle
 
 def test_parse_byte_order():
     assert ByteOrder("bigEndian") == ByteOrder.BIG_ENDIAN
@@ -12,4 +14,27 @@ def test_parse_presence():
     assert Presence("optional") == Presence.OPTIONAL
     assert Presence("constant") == Presence.CONSTANT
     with raises(ValueError):
-        Presence("invalidPresence")
\ No newline at end of file
+        Presence("invalidPresence")
+
+
+def test_cached_slots():
+    type_ = Type(name="T", description="", primitive_type=uint32, presence=Presence.OPTIONAL)
+    assert not hasattr(type_, '__dict__')
+    with raises(AttributeError):
+        type_.unknown = 1
+    assert type_.effective_null_value == 2**32 - 1
+    assert type_.total_length == 4
+    assert 'total_length' not in repr(type_)
+    
+    composite = Composite(name="C", description="", elements=[type_])
+    assert composite.total_length == 4
+    composite.elements.append(Type(name="U", description="", primitive_type=uint16, presence=Presence.REQUIRED))
+    assert composite.total_length == 4  # computed once
+    del composite.total_length
+    assert composite.total_length == 6
+    
+    copy = pickle.loads(pickle.dumps(composite))
+    assert repr(copy) == repr(composite)
+    assert copy.total_length == 6
+    with raises(AttributeError):
+        copy.unknown
@@ -1,5 +1,7 @@
 from unittest.mock import MagicMock
-from sbe2.schema import Composite
+from sbe2.schema import Composite, Type, Presence
+from sbe2.schema.primitive_type import uint8, uint32
+from pytest import raises
 
 def test_composite_lazy_bind():
     mock_type1 = MagicMock()
@@ -23,6 +25,8 @@ def test_composite_total_length():
     mock_type2 = MagicMock()
     mock_type1.total_length = 4  # Simulating an int type
     mock_type2.total_length = 8  # Simulating a double type
+    mock_type1.offset = None
+    mock_type2.offset = None
     composite = Composite(
         name="TestComposite",
         description="",
@@ -31,4 +35,27 @@ def test_composite_total_length():
             mock_type2,
         ]
     )
-    assert composite.total_length == 12  # int (4) + double (8) = 12 bytes
\ No newline at end of file
+    assert composite.total_length == 12  # int (4) + double (8) = 12 bytes
+    
+    
+def test_composite_total_length_offsets():
+    composite = Composite(
+        name="TestComposite",
+        description="",
+        elements=[
+            Type(name="a", description="", presence=Presence.REQUIRED, primitive_type=uint8),
+            Type(name="b", description="", presence=Presence.REQUIRED, primitive_type=uint32, offset=4, length=2),
+        ]
+    )
+    assert composite.total_length == 12
+    
+    composite = Composite(
+        name="TestComposite",
+        description="",
+        elements=[
+            Type(name="a", description="", presence=Presence.REQUIRED, primitive_type=uint32),
+            Type(name="b", description="", presence=Presence.REQUIRED, primitive_type=uint8, offset=2),
+        ]
+    )
+    with raises(ValueError):
+        _ = composite.total_length
@@ -12,4 +12,15 @@ def test_enum_lazy_bind():
     
 def test_enum_total_length():
     enum = Enum(name="TestEnum", encoding_type_name="int", description="", valid_values=[], encoding_type=builtin.int_)
-    assert enum.total_length == builtin.int_.total_length
\ No newline at end of file
+    assert enum.total_length == builtin.int_.total_length
+
+def test_enum_valid_value():
+    from sbe2.schema import ValidValue
+    from pytest import raises
+    a = ValidValue(name="A", description="", value=1)
+    b = ValidValue(name="B", description="", value=2)
+    enum = Enum(name="TestEnum", encoding_type_name="int", description="", valid_values=[a, b])
+    assert enum.valid_value("B") is b
+    assert enum.valid_values_by_name == {"A": a, "B": b}
+    with raises(ValueError):
+        enum.valid_value("C")
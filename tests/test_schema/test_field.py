@@ -1,4 +1,4 @@
-from sbe2.schema import Field, builtin
+from sbe2.schema import Field, Presence, builtin
 
 def test_field_total_length():
     field = Field(
@@ -7,4 +7,15 @@ def test_field_total_length():
         id=1,
         type=builtin.int_,
     )
-    assert field.total_length == builtin.int_.total_length
\ No newline at end of file
+    assert field.total_length == builtin.int_.total_length    
+    
+def test_constant_field_total_length():
+    field = Field(
+        name="TestField",
+        description="",
+        id=1,
+        type=builtin.int_,
+        presence=Presence.CONSTANT,
+        constant_value=5,
+    )
+    assert field.total_length == 0
@@ -0,0 +1,59 @@
+from sbe2.schema import Message, Group, Field, Presence, MessageSchema, builtin
+from sbe2.schema.layout import align, resolve_fields, resolve_message
+from pytest import raises
+
+
+def field(name: str, type_=builtin.uint32, **kwargs) -> Field:
+    return Field(name=name, description='', id=1, type=type_, **kwargs)
+
+
+def test_align():
+    assert align(5, None) == 5
+    assert align(5, 0) == 5
+    assert align(5, 4) == 8
+    assert align(8, 4) == 8
+    
+    
+def test_resolve_fields():
+    fields, block_length = resolve_fields([
+        field('a', builtin.uint8),
+        field('b', builtin.uint32, alignment=4),
+        field('c', builtin.uint16, offset=10),
+        field('d', builtin.uint64, presence=Presence.CONSTANT, constant_value=1),
+        field('e', builtin.uint8),
+    ])
+    assert [(f.name, f.offset, f.length) for f in fields] == [('a', 0, 1), ('b', 4, 4), ('c', 10, 2), ('d', 12, 0), ('e', 12, 1)]
+    assert block_length == 13
+    
+    _, block_length = resolve_fields([field('a', builtin.uint8)], block_length=8)
+    assert block_length == 8
+    _, block_length = resolve_fields([field('a', builtin.uint8)], alignment=8)
+    assert block_length == 8
+    
+    with raises(ValueError):
+        resolve_fields([field('a'), field('b', offset=2)])
+    with raises(ValueError):
+        resolve_fields([field('a')], block_length=2)
+        
+        
+def test_resolve_message():
+    inner = Group(name='inner', description='', id=3, fields=[field('x', builtin.double)], groups=[], datas=[], dimension_type=builtin.decimal)
+    outer = Group(name='outer', description='', id=2, fields=[field('y')], groups=[inner], datas=[], dimension_type=builtin.decimal, block_length=16)
+    message = Message(name='Msg', description='', id=7, package='p', fields=[field('a'), field('b', builtin.int64)], groups=[outer], datas=[])
+    layout = resolve_message(message)
+    assert layout.name == 'Msg'
+    assert layout.block_length == 12
+    assert [f.offset for f in layout.fields] == [0, 4]
+    assert layout.groups[0].name == 'outer'
+    assert layout.groups[0].block_length == 16
+    assert layout.groups[0].dimension_length == 9
+    assert layout.groups[0].groups[0].block_length == 8
+    
+    schema = MessageSchema(package='p', version=0, id=1)
+    schema.messages.add(message)
+    assert schema.layout[7] is schema.layout['Msg']
+    assert schema.layout['Msg'].block_length == 12
+    assert schema.layout is schema.layout
+    assert len(schema.layout) == 1
+    with raises(KeyError):
+        schema.layout[7.0]
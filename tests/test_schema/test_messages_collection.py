@@ -36,4 +36,79 @@ def test_get_invalid_key():
     msg = Message(name="TestMessage", description='', id=5, fields=[], groups=[], datas=[], package='package')
     m.add(msg)
     with raises(KeyError):
-        _ = m[5.0]  # Invalid key type
\ No newline at end of file
+        _ = m[5.0]  # Invalid key type
+
+def test_dense_table():
+    m = Messages()
+    assert m.dense_table() == []
+    msg1 = Message(name="First", description='', id=1, fields=[], groups=[], datas=[], package='package')
+    msg4 = Message(name="Fourth", description='', id=4, fields=[], groups=[], datas=[], package='package')
+    m.add(msg4)
+    m.add(msg1)
+    table = m.dense_table()
+    assert len(table) == 5
+    assert table[1] is msg1
+    assert table[4] is msg4
+    assert table[0] is None and table[2] is None and table[3] is None
+    # sparse IDs do not fit into a list
+    m.add(Message(name="Far", description='', id=100000, fields=[], groups=[], datas=[], package='package'))
+    assert m.dense_table() is None
+
+
+def test_add_lazy():
+    m = Messages()
+    loads = []
+    def load(id_, name):
+        loads.append(name)
+        return Message(name=name, description='', id=id_, fields=[], groups=[], datas=[], package='package')
+    m.add(Message(name="First", description='', id=1, fields=[], groups=[], datas=[], package='package'))
+    m.add_lazy(2, "Second", lambda: load(2, "Second"))
+    m.add_lazy(3, "Third", lambda: load(3, "Third"))
+    assert len(m) == 3
+    assert not m.is_loaded("Second")
+    with raises(ValueError):
+        m.add_lazy(2, "Duplicate", lambda: load(2, "Duplicate"))
+
+    second = m["Second"]
+    assert second.id == 2 and loads == ["Second"]
+    assert m.is_loaded(2)
+    assert m.get(2) is second and m[2] is second
+    assert not m.is_loaded("Third")
+    m.add_lazy(6, "Sixth", lambda: load(6, "Sixth"))
+    assert m.get(7) is None
+    assert [msg.name for msg in m] == ["First", "Second", "Third", "Sixth"]
+    assert loads == ["Second", "Third", "Sixth"]
+    assert m.is_loaded("Sixth")
+
+
+def test_add_lazy_mismatch():
+    m = Messages()
+    m.add_lazy(4, "Wrong", lambda: Message(name="Wrong", description='', id=5, fields=[], groups=[], datas=[], package='package'))
+    with raises(ValueError):
+        m.get(4)  # loaded message does not match
+    with raises(ValueError):
+        list(m)
+    assert not m.is_loaded(4)
+
+
+def test_secondary_indexes():
+    from sbe2.schema import Field, Group, Data, builtin, Presence
+    m = Messages()
+    dimension = builtin.decimal
+    price = Field(name="price", description='', id=1, type=builtin.int64, semantic_type="Price")
+    qty = Field(name="qty", description='', id=2, type=builtin.uint32, semantic_type="Qty")
+    nested = Group(name="legs", description='', id=3, fields=[price], groups=[], datas=[], dimension_type=dimension)
+    note = Data(name="note", id=4, type_=builtin.decimal, semantic_type="Text")
+    order = Message(name="Order", description='', id=1, fields=[qty], groups=[nested], datas=[note], package='package')
+    m.add(order)
+    assert m.users("int64") == [order]
+    assert m.users("decimal") == [order]  # used twice, listed once
+    assert m.users("uint64") == []
+    assert m.by_semantic_type("Price") == [(order, price)]
+    assert m.by_semantic_type("Text") == [(order, note)]
+    assert m.dimension_types() == [dimension]
+
+    cancel = Message(name="Cancel", description='', id=2, fields=[Field(name="qty", description='', id=1, type=builtin.uint32, semantic_type="Qty")], groups=[], datas=[], package='package')
+    m.add_lazy(2, "Cancel", lambda: cancel)
+    assert m.users("uint32") == [order, cancel]
+    assert [msg for msg, _ in m.by_semantic_type("Qty")] == [order, cancel]
@@ -0,0 +1,57 @@
+from sbe2.xmlparser import parse_schema
+from sbe2.schema import to_snapshot, from_snapshot, builtin, Enum, Presence
+from sbe2.schema.snapshot import SNAPSHOT_MAGIC
+from pytest import raises
+from os import path
+import pickle
+
+
+def example_schema(file_name: str):
+    return parse_schema(path.join(path.dirname(path.dirname(__file__)), 'test_xmlparser', 'example_schema', file_name))
+
+
+def assert_same_schema(restored, schema):
+    assert restored.package == schema.package
+    assert restored.byte_order is schema.byte_order
+    assert repr(restored.header_type) == repr(schema.header_type)
+    assert repr(list(restored.types)) == repr(list(schema.types))
+    assert repr(list(restored.messages)) == repr(list(schema.messages))
+
+
+def test_snapshot_round_trip():
+    for name in ('example-schema.xml', 'example-extension-schema.xml', 'complete.xml'):
+        schema = example_schema(name)
+        data = to_snapshot(schema)
+        assert data.startswith(SNAPSHOT_MAGIC)
+        restored = from_snapshot(data)
+        assert_same_schema(restored, schema)
+        assert repr(list(restored.layout)) == repr(list(schema.layout))
+
+
+def test_snapshot_references():
+    schema = example_schema('example-schema.xml')
+    restored = from_snapshot(to_snapshot(schema))
+    model = restored.types['Model']
+    assert isinstance(model, Enum)
+    # back references point to the restored objects, built-in types are shared
+    assert all(vv.enum is model for vv in model.valid_values)
+    assert restored.types['uint32'] is builtin.uint32
+    car = restored.messages['Car']
+    assert car.fields[0].presence is schema.messages['Car'].fields[0].presence
+    assert restored.types['Engine'].elements[2].presence is Presence.CONSTANT
+    assert restored.types['Engine'].total_length == schema.types['Engine'].total_length
+
+
+def test_snapshot_pickle():
+    schema = example_schema('example-schema.xml')
+    data = pickle.dumps(schema)
+    assert SNAPSHOT_MAGIC in data
+    assert_same_schema(pickle.loads(data), schema)
+
+
+def test_snapshot_invalid():
+    data = to_snapshot(example_schema('example-schema.xml'))
+    with raises(ValueError):
+        from_snapshot(b'not a snapshot')
+    with raises(ValueError):
+        from_snapshot(data[:len(data) // 2])
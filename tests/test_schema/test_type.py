@@ -11,6 +11,9 @@ def test_type_total_length():
     type_ = Type(name="TestType", description="", primitive_type=double, presence=Presence.CONSTANT)
     assert type_.total_length == 0
     
+    type_ = Type(name="TestType", description="", primitive_type=double, presence=Presence.REQUIRED, length=3)
+    assert type_.total_length == 24
+    
     
 def test_type_lazy_bind_const():
     type_ = Type(name="TestType", description="", primitive_type=double, presence=Presence.CONSTANT, value='1.5')
@@ -56,4 +56,64 @@ def test_get_type():
     assert types.get('decimal') is not None
     with raises(ValueError):
         assert types.get_type('decimal')
-    types.get_type('int') is not None
\ No newline at end of file
+    types.get_type('int') is not None
+
+def test_bind():
+    from sbe2.schema import Composite, Ref, Type, Presence, ValidValue
+    from sbe2.schema import builtin
+    types = Types()
+    # refers to types declared later
+    outer = Composite(name="Outer", description="", elements=[Ref(name="inner", description="", type_name="Inner")])
+    const = Type(name="Const", description="", presence=Presence.CONSTANT, primitive_type=builtin.int_.primitive_type, value_ref="Side.SELL")
+    side = Enum(name="Side", encoding_type_name="int", description="", valid_values=[ValidValue(name="SELL", description="", value=2)])
+    inner = Composite(name="Inner", description="", elements=[Ref(name="side", description="", type_name="Side"), Ref(name="c", description="", type_name="Const")])
+    for type_ in (outer, const, side, inner):
+        types.add(type_)
+    assert outer.references() == ["Inner"]
+    assert const.references() == ["Side"]
+    types.bind()
+    assert outer.elements[0].type_ is inner
+    assert inner.elements[0].type_ is side
+    assert side.encoding_type is builtin.int_
+    assert const.const_val == 2
+    assert outer.total_length == builtin.int_.total_length
+
+
+def test_bind_cycle():
+    from sbe2.schema import Composite, Ref
+    types = Types()
+    types.add(Composite(name="A", description="", elements=[Ref(name="b", description="", type_name="B")]))
+    types.add(Composite(name="B", description="", elements=[Ref(name="a", description="", type_name="A")]))
+    with raises(ValueError, match="A -> B -> A"):
+        types.bind()
+
+    types = Types()
+    self_ref = Composite(name="C", description="", elements=[Ref(name="c", description="", type_name="C")])
+    types.add(self_ref)
+    with raises(ValueError, match="C -> C"):
+        types.bind([self_ref])
+    types.add(Composite(name="D", description="", elements=[Ref(name="x", description="", type_name="Missing")]))
+    with raises(KeyError):
+        types.bind([types['D']])
+
+
+def test_secondary_indexes():
+    from sbe2.schema import Composite, Ref, Set, TypeKind
+    types = Types()
+    enum = Enum(name="Side", encoding_type_name="uint8", description="", valid_values=[])
+    types.add(enum)
+    assert types.by_kind(TypeKind.ENUM) == [enum]
+    assert types.by_kind(TypeKind.SET) == []
+    assert types.users("Side") == []
+    # indexes are rebuilt after types are added
+    composite = Composite(name="Order", description="", elements=[
+        Ref(name="side", description="", type_name="Side"),
+        Ref(name="otherSide", description="", type_name="Side"),
+    ])
+    flags = Set(name="Flags", encoding_type_name="uint8", description="", choices=[])
+    types.add(composite)
+    types.add(flags)
+    assert types.by_kind(TypeKind.SET) == [flags]
+    assert types.by_kind(TypeKind.COMPOSITE)[-1] is composite
+    assert types.users("Side") == [composite]
+    assert types.users("uint8") == [enum, flags]
@@ -0,0 +1,63 @@
+from os import path
+from sbe2.xmlparser import parse_schema, parse_schemas, IncludeCache
+from sbe2.xmlparser.types import parse_schema_fd
+from lxml import ElementInclude
+import shutil
+
+EXAMPLE_SCHEMAS = ('example-schema.xml', 'example-extension-schema.xml', 'complete.xml')
+
+
+def schema_path(file_name) -> str:
+    return path.join(path.dirname(__file__), 'example_schema', file_name)
+
+
+def assert_same_schema(schema, expected):
+    assert schema.package == expected.package
+    assert repr(list(schema.types)) == repr(list(expected.types))
+    assert repr(list(schema.messages)) == repr(list(expected.messages))
+
+
+def test_parse_schemas():
+    paths = [schema_path(name) for name in EXAMPLE_SCHEMAS]
+    expected = [parse_schema(p) for p in paths]
+    for workers in (1, 2):
+        schemas = parse_schemas(paths, workers=workers)
+        assert len(schemas) == len(expected)
+        for schema, exp in zip(schemas, expected):
+            assert_same_schema(schema, exp)
+    assert parse_schemas([]) == []
+
+
+def test_include_cache(tmp_path):
+    for name in ('example-schema.xml', 'common-types.xml'):
+        shutil.copy(schema_path(name), tmp_path / name)
+    # a copy of the included file under another path has the same content
+    (tmp_path / 'other').mkdir()
+    for name in ('example-schema.xml', 'common-types.xml'):
+        shutil.copy(schema_path(name), tmp_path / 'other' / name)
+
+    cache = IncludeCache()
+    paths = [tmp_path / 'example-schema.xml', tmp_path / 'other' / 'example-schema.xml', schema_path('complete.xml')]
+    for p in paths:
+        with open(p, 'rb') as file:
+            assert_same_schema(parse_schema_fd(file, loader=cache), parse_schema(str(p)))
+    assert cache.loads == 1
+
+    # cached elements are copied, so including does not modify them
+    with open(paths[0], 'rb') as file:
+        parse_schema_fd(file, loader=cache)
+    assert cache.loads == 1
+
+    common = tmp_path / 'common-types.xml'
+    common.write_text(common.read_text().replace('Variable length UTF-8 String.', 'Changed.'))
+    with open(paths[0], 'rb') as file:
+        schema = parse_schema_fd(file, loader=cache)
+    assert cache.loads == 2
+    assert schema.types['varStringEncoding'].description == 'Changed.'
+
+
+def test_include_cache_default_loader_compatible():
+    cache = IncludeCache()
+    text_path = schema_path('common-types.xml')
+    assert cache(text_path, 'text') == ElementInclude.default_loader(text_path, 'text')
+    assert cache(text_path, 'xml').tag == 'types'
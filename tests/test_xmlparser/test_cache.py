@@ -0,0 +1,100 @@
+from os import path
+from sbe2.xmlparser import parse_schema, parse_schema_cached, schema_hash, schema_files
+from sbe2.xmlparser import cache
+from sbe2.schema.snapshot import from_snapshot
+from pytest import raises
+import pickle
+import shutil
+
+
+def example_dir() -> str:
+    return path.join(path.dirname(__file__), 'example_schema')
+
+
+def copy_schema(tmp_path) -> str:
+    for name in ('example-schema.xml', 'common-types.xml'):
+        shutil.copy(path.join(example_dir(), name), tmp_path / name)
+    return str(tmp_path / 'example-schema.xml')
+
+
+def test_schema_files(tmp_path):
+    schema_path = copy_schema(tmp_path)
+    assert schema_files(schema_path) == [schema_path, str(tmp_path / 'common-types.xml')]
+
+
+def test_parse_schema_cached(tmp_path):
+    schema_path = copy_schema(tmp_path)
+    cache_dir = tmp_path / 'cache'
+    first = parse_schema(schema_path, cache_dir=str(cache_dir))
+    entries = list(cache_dir.glob('*.pickle'))
+    assert [entry.name for entry in entries] == [f'{schema_hash(schema_path)}.pickle']
+    
+    second = parse_schema_cached(schema_path, str(cache_dir))
+    assert second is not first
+    assert repr(second.messages['Car']) == repr(first.messages['Car'])
+    assert second.layout['Car'].block_length == 45
+
+
+def test_cache_invalidated_by_included_file(tmp_path):
+    schema_path = copy_schema(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    before = schema_hash(schema_path)
+    parse_schema_cached(schema_path, cache_dir)
+    
+    common = tmp_path / 'common-types.xml'
+    common.write_text(common.read_text().replace('Variable length binary blob.', 'Binary blob.'))
+    assert schema_hash(schema_path) != before
+    schema = parse_schema_cached(schema_path, cache_dir)
+    assert schema.types['varDataEncoding'].description == 'Binary blob.'
+    assert len(list((tmp_path / 'cache').glob('*.pickle'))) == 2
+
+
+def test_corrupted_cache_entry(tmp_path):
+    schema_path = copy_schema(tmp_path)
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    (cache_dir / f'{schema_hash(schema_path)}.pickle').write_bytes(b'garbage')
+    assert parse_schema_cached(schema_path, str(cache_dir)).messages['Car'].id == 1
+
+
+class OutdatedEntry:
+    def __reduce__(self):
+        return from_snapshot, (b'SBE2SNAP',)
+
+
+def test_outdated_cache_entry(tmp_path):
+    schema_path = copy_schema(tmp_path)
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    (cache_dir / f'{schema_hash(schema_path)}.pickle').write_bytes(pickle.dumps(OutdatedEntry()))
+    assert parse_schema_cached(schema_path, str(cache_dir)).messages['Car'].id == 1
+
+
+def test_cache_skips_finding_included_files(tmp_path, monkeypatch):
+    schema_path = copy_schema(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    parse_schema_cached(schema_path, cache_dir)
+    calls = []
+    schema_files_ = cache.schema_files
+    monkeypatch.setattr(cache, 'schema_files', lambda path: calls.append(path) or schema_files_(path))
+    assert parse_schema_cached(schema_path, cache_dir).messages['Car'].id == 1
+    assert calls == []
+
+    # a changed file may include other files, so they are found again
+    common = tmp_path / 'common-types.xml'
+    common.write_text(common.read_text().replace('Variable length binary blob.', 'Binary blob.'))
+    assert parse_schema_cached(schema_path, cache_dir).types['varDataEncoding'].description == 'Binary blob.'
+    assert calls == [schema_path]
+
+
+def test_cache_requires_path():
+    with raises(ValueError):
+        parse_schema(text='<xml/>', cache_dir='cache')
+
+
+def test_cache_unsupported_options(tmp_path):
+    schema_path = copy_schema(tmp_path)
+    with raises(ValueError):
+        parse_schema(schema_path, cache_dir=str(tmp_path / 'cache'), lazy=True)
+    with raises(ValueError):
+        parse_schema(schema_path, cache_dir=str(tmp_path / 'cache'), streaming=True)
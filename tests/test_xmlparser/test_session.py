@@ -0,0 +1,74 @@
+from os import path
+from sbe2.xmlparser import parse_schema, SchemaSession
+from pytest import raises
+import shutil
+
+PING = """    <sbe:message name="Ping" id="2">
+        <field name="seq" id="1" type="uint32"/>
+    </sbe:message>
+</sbe:messageSchema>"""
+
+
+def write_schema(tmp_path, replace=None) -> str:
+    example_dir = path.join(path.dirname(__file__), 'example_schema')
+    shutil.copy(path.join(example_dir, 'common-types.xml'), tmp_path / 'common-types.xml')
+    with open(path.join(example_dir, 'example-schema.xml')) as file:
+        text = file.read().replace('</sbe:messageSchema>', PING)
+    if replace:
+        text = text.replace(*replace)
+    (tmp_path / 'example-schema.xml').write_text(text)
+    return str(tmp_path / 'example-schema.xml')
+
+
+def assert_same_schema(schema, expected):
+    assert repr(schema.header_type) == repr(expected.header_type)
+    assert repr(list(schema.types)) == repr(list(expected.types))
+    assert repr(list(schema.messages)) == repr(list(expected.messages))
+    assert repr(list(schema.layout)) == repr(list(expected.layout))
+
+
+def test_session_reuses_unchanged(tmp_path):
+    session = SchemaSession()
+    schema_path = write_schema(tmp_path)
+    first = session.parse(schema_path)
+    assert_same_schema(first, parse_schema(schema_path))
+    assert {'Engine', 'messageHeader'} <= session.changed_types
+    assert session.changed_messages == {'Car', 'Ping'}
+
+    second = session.parse(schema_path)
+    assert second is not first
+    assert session.changed_types == set() and session.changed_messages == set()
+    assert second.types['Engine'] is first.types['Engine']
+    assert second.messages['Car'] is first.messages['Car']
+    assert second.header_type is first.header_type
+
+
+def test_session_reparses_dependents(tmp_path):
+    session = SchemaSession()
+    first = session.parse(write_schema(tmp_path))
+    schema_path = write_schema(tmp_path, ('minValue="0" maxValue="100"', 'minValue="0" maxValue="99"'))
+    second = session.parse(schema_path)
+    assert_same_schema(second, parse_schema(schema_path))
+    # Engine refers to Percentage, Car refers to Engine
+    assert session.changed_types == {'Percentage', 'Engine'}
+    assert session.changed_messages == {'Car'}
+    assert second.types['Percentage'].max_value == 99
+    assert second.types['Booster'] is first.types['Booster']
+    assert second.messages['Ping'] is first.messages['Ping']
+    assert first.types['Percentage'].max_value == 100  # previous schema is not modified
+
+
+def test_session_error_keeps_state(tmp_path):
+    session = SchemaSession()
+    first = session.parse(write_schema(tmp_path))
+    with raises(KeyError):
+        session.parse(write_schema(tmp_path, ('type="Percentage"', 'type="Missing"')))
+    second = session.parse(write_schema(tmp_path))
+    assert session.changed_types == set()
+    assert second.messages['Car'] is first.messages['Car']
+
+    # removing a type makes types referring to it fail even if their XML did not change
+    with raises(KeyError):
+        session.parse(write_schema(tmp_path, ('<type name="Percentage" primitiveType="int8" minValue="0" maxValue="100"/>', '')))
+    with raises(ValueError):
+        session.parse()
@@ -0,0 +1,60 @@
+from os import path
+from io import BytesIO
+from sbe2.xmlparser import parse_schema, parse_schema_stream
+from sbe2.xmlparser.errors import SchemaParsingError
+from pytest import raises
+
+EXAMPLE_SCHEMAS = ('example-schema.xml', 'example-extension-schema.xml', 'complete.xml')
+
+SCHEMA = """<sbe:messageSchema xmlns:sbe="http://fixprotocol.io/2016/sbe" package="stream" id="3" version="0" byteOrder="littleEndian">
+    <types>
+        <composite name="messageHeader">
+            <type name="blockLength" primitiveType="uint16"/>
+            <type name="templateId" primitiveType="uint16"/>
+            <type name="schemaId" primitiveType="uint16"/>
+            <type name="version" primitiveType="uint16"/>
+        </composite>
+    </types>
+    <sbe:message name="Ping" id="1">
+        <field name="seq" id="1" type="uint32"/>
+    </sbe:message>
+    <types>
+        <type name="Late" primitiveType="uint8"/>
+    </types>
+</sbe:messageSchema>
+"""
+
+
+def schema_path(file_name) -> str:
+    return path.join(path.dirname(__file__), 'example_schema', file_name)
+
+
+def test_parse_schema_stream_matches_tree_parser():
+    for name in EXAMPLE_SCHEMAS:
+        expected = parse_schema(schema_path(name))
+        with open(schema_path(name), 'rb') as file:
+            schema = parse_schema(fd=file, streaming=True)
+        assert schema.package == expected.package
+        assert schema.byte_order is expected.byte_order
+        assert repr(schema.header_type) == repr(expected.header_type)
+        assert repr(list(schema.types)) == repr(list(expected.types))
+        assert repr(list(schema.messages)) == repr(list(expected.messages))
+        assert repr(list(schema.layout)) == repr(list(expected.layout))
+
+
+def test_parse_schema_stream_sources():
+    expected = parse_schema(schema_path('example-schema.xml'))
+    schema = parse_schema_stream(schema_path('example-schema.xml'))
+    assert repr(schema.messages['Car']) == repr(expected.messages['Car'])
+
+    text = SCHEMA.replace('<types>\n        <type name="Late" primitiveType="uint8"/>\n    </types>\n', '')
+    schema = parse_schema(text=text, streaming=True)
+    assert [message.name for message in schema.messages] == ['Ping']
+    assert schema.header_type.name == 'messageHeader'
+
+
+def test_parse_schema_stream_errors():
+    with raises(SchemaParsingError):
+        parse_schema_stream(BytesIO(SCHEMA.encode()))  # types after messages
+    with raises(SchemaParsingError):
+        parse_schema_stream(BytesIO(b'<sbe:messageSchema xmlns:sbe="http://fixprotocol.io/2016/sbe"'))
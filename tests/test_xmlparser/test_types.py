@@ -272,7 +272,7 @@ def test_parse_type():
     assert type_.length == 3
     assert type_.const_val is None
     assert type_.value_ref is None
-    assert type_.total_length == 4
+    assert type_.total_length == 12
     
     
     with raises(SchemaParsingError):
@@ -408,7 +408,7 @@ def test_parse_field():
         
     node = xml(
         """
-    <field id="1" name="TestField" description="This is a test field" type="int" offset="0" alignment="4" presence="required" sinceVersion="1" deprecated="2" />
+    <field id="1" name="TestField" description="This is a test field" type="int" offset="0" alignment="4" presence="required" sinceVersion="1" deprecated="2" semanticType="Price" />
     """
     )
     ctx = ParsingContext()
@@ -419,6 +419,7 @@ def test_parse_field():
     assert field.type == builtin.int_
     assert field.offset == 0
     assert field.alignment == 4
+    assert field.semantic_type == "Price"
     assert field.presence == Presence.REQUIRED
     assert field.since_version == 1
     assert field.deprecated == 2
@@ -563,4 +564,37 @@ def test_parse_schema_empty():
     assert len(schema.messages) == 0
     
     schema2 = parse_schema(fd=StringIO(node))
-   
\ No newline at end of file
+   
+
+def test_parse_schema_lazy():
+    node = """
+        <sbe:messageSchema xmlns:sbe="http://fixprotocol.io/2016/sbe" package="lazy" id="1" version="0" byteOrder="littleEndian">
+            <types>
+                <composite name="messageHeader">
+                    <type name="blockLength" primitiveType="uint16"/>
+                    <type name="templateId" primitiveType="uint16"/>
+                    <type name="schemaId" primitiveType="uint16"/>
+                    <type name="version" primitiveType="uint16"/>
+                </composite>
+            </types>
+            <sbe:message name="Used" id="1">
+                <field name="a" id="1" type="uint32"/>
+            </sbe:message>
+            <sbe:message name="Broken" id="2">
+                <field name="b" id="1" type="Missing"/>
+            </sbe:message>
+        </sbe:messageSchema>
+    """
+    schema = parse_schema(text=node, lazy=True)
+    assert len(schema.messages) == 2
+    assert not schema.messages.is_loaded('Used')
+    used = schema.messages['Used']
+    assert used.fields[0].type is builtin.uint32
+    assert schema.messages.get(1) is used
+    assert not schema.messages.is_loaded(2)
+    with raises(KeyError):  # unknown type is reported only when the message is used
+        schema.messages['Broken']
+    with raises(KeyError):
+        parse_schema(text=node)
+    with raises(ValueError):
+        parse_schema(text=node, lazy=True, streaming=True)